@@ -1,10 +1,16 @@
 from apis import (
     auth,
+    autocompletado,
     autor,
+    busqueda,
     categoria,
+    deduplicacion,
     editorial,
+    importacion,
+    inventario,
     item,
     libro,
+    material,
     multa,
     periodico,
     prestamo,
@@ -14,11 +20,17 @@ from apis import (
 
 __all__ = [
     "auth",
+    "autocompletado",
     "autor",
+    "busqueda",
     "categoria",
+    "deduplicacion",
     "editorial",
+    "importacion",
+    "inventario",
     "item",
     "libro",
+    "material",
     "multa",
     "periodico",
     "prestamo",
@@ -0,0 +1,31 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Query
+from schemas import SugerenciaAutocompletado
+from utils.autocompletado import FUENTES, autocompletado
+from utils.error_handler import APIErrorHandler
+
+router = APIRouter(prefix="/autocomplete", tags=["autocompletado"])
+
+TIPOS_SUGERIDOS = [tipo for tipo, _, _ in FUENTES.values()]
+
+
+@router.get("/", response_model=List[SugerenciaAutocompletado])
+async def autocompletar(
+    q: str = Query(..., min_length=1, max_length=100),
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+):
+    """
+    Sugerir títulos, autores, editoriales y categorías para un prefijo.
+
+    Se resuelve en memoria, sin consultar la base de datos.
+    """
+    if tipo and tipo not in TIPOS_SUGERIDOS:
+        raise APIErrorHandler.validation_error(
+            f"Tipo inválido. Debe ser uno de: {', '.join(TIPOS_SUGERIDOS)}"
+        )
+    try:
+        return autocompletado.sugerir(q, limite=limit, tipos=[tipo] if tipo else None)
+    except Exception as e:
+        raise APIErrorHandler.server_error("autocompletar", str(e))
@@ -1,11 +1,21 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from crud.autor_crud import AutorCRUD
+from crud.material_crud import MaterialCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import AutorCreate, AutorResponse, AutorUpdate, RespuestaAPI
+from schemas import (
+    AutorCreate,
+    AutorResponse,
+    AutorUpdate,
+    IdsLote,
+    MaterialesResponse,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/autores", tags=["autores"])
@@ -41,6 +51,51 @@ async def obtener_autor(autor_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener autor", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[AutorResponse])
+async def obtener_autores_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 autores por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        autor_crud = AutorCRUD(db)
+        encontrados = autor_crud.obtener_autores_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener autores", str(e))
+
+
+@router.get("/{autor_id}/obras", response_model=MaterialesResponse)
+async def obtener_obras_autor(
+    autor_id: UUID,
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Listar los libros, revistas y periódicos de un autor en una sola consulta,
+    con los ejemplares totales, disponibles y prestados de cada uno.
+    """
+    try:
+        autor_crud = AutorCRUD(db)
+        if not autor_crud.obtener_autor(autor_id):
+            raise APIErrorHandler.not_found_error("Autor", str(autor_id))
+        material_crud = MaterialCRUD(db)
+        obras, siguiente = material_crud.obtener_materiales(
+            tipo=tipo, limit=limit, cursor=cursor, id_autor=autor_id
+        )
+        return MaterialesResponse(materiales=obras, siguiente_cursor=siguiente)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener obras", str(e))
+
+
 @router.post("/", response_model=AutorResponse, status_code=status.HTTP_201_CREATED)
 async def crear_autor(autor_data: AutorCreate, db: Session = Depends(get_db)):
     """Crear un nuevo autor."""
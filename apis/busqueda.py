@@ -0,0 +1,61 @@
+from typing import List, Optional
+
+from crud.busqueda_crud import BusquedaCRUD
+from database.config import get_db
+from fastapi import APIRouter, Depends, Query
+from schemas import BusquedaResponse, CoincidenciaAproximada
+from sqlalchemy.orm import Session
+from utils.error_handler import APIErrorHandler
+from utils.indice_trigramas import FUENTES, indice
+
+router = APIRouter(prefix="/buscar", tags=["búsqueda"])
+
+TIPOS_INDEXADOS = [tipo for tipo, _ in FUENTES.values()]
+
+
+@router.get("/", response_model=BusquedaResponse)
+async def buscar_materiales(
+    q: str = Query(..., min_length=1, max_length=200),
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Buscar libros, revistas y periódicos por título o autor.
+
+    Acepta la sintaxis de búsqueda web ("frase exacta", -excluir, OR). Para
+    la página siguiente se envía el siguiente_cursor de la respuesta.
+    """
+    try:
+        busqueda_crud = BusquedaCRUD(db)
+        resultados, siguiente = busqueda_crud.buscar(
+            q, tipo=tipo, limit=limit, cursor=cursor
+        )
+        return BusquedaResponse(resultados=resultados, siguiente_cursor=siguiente)
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("buscar materiales", str(e))
+
+
+@router.get("/aproximada", response_model=List[CoincidenciaAproximada])
+async def buscar_aproximada(
+    q: str = Query(..., min_length=1, max_length=200),
+    tipo: Optional[str] = Query(None),
+    k: int = Query(10, ge=1, le=50),
+    umbral: float = Query(0.3, ge=0, le=1),
+):
+    """
+    Buscar títulos y autores tolerando erratas ("garcia marques").
+
+    Se resuelve con el índice de trigramas en memoria, sin consultar la BD.
+    """
+    if tipo and tipo not in TIPOS_INDEXADOS:
+        raise APIErrorHandler.validation_error(
+            f"Tipo inválido. Debe ser uno de: {', '.join(TIPOS_INDEXADOS)}"
+        )
+    try:
+        return indice.buscar(q, k=k, tipos=[tipo] if tipo else None, umbral=umbral)
+    except Exception as e:
+        raise APIErrorHandler.server_error("buscar materiales", str(e))
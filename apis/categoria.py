@@ -2,14 +2,24 @@
 API de Categorías - Endpoints para gestión de categorías
 """
 
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from crud.categoria_crud import CategoriaCRUD
+from crud.material_crud import MaterialCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import CategoriaCreate, CategoriaResponse, CategoriaUpdate, RespuestaAPI
+from schemas import (
+    CategoriaCreate,
+    CategoriaResponse,
+    CategoriaUpdate,
+    IdsLote,
+    MaterialesResponse,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 
 router = APIRouter(prefix="/categorias", tags=["categorias"])
 
@@ -52,6 +62,59 @@ async def obtener_categoria(categoria_id: UUID, db: Session = Depends(get_db)):
         )
 
 
+@router.post("/batch-get", response_model=ResultadosLote[CategoriaResponse])
+async def obtener_categorias_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 categorías por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        categoria_crud = CategoriaCRUD(db)
+        encontrados = categoria_crud.obtener_categorias_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener categorías: {str(e)}",
+        )
+
+
+@router.get("/{categoria_id}/obras", response_model=MaterialesResponse)
+async def obtener_obras_categoria(
+    categoria_id: UUID,
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Listar los libros, revistas y periódicos de una categoría en una sola
+    consulta, con los ejemplares totales, disponibles y prestados de cada uno.
+    """
+    try:
+        categoria_crud = CategoriaCRUD(db)
+        if not categoria_crud.obtener_categoria(categoria_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Categoría no encontrada"
+            )
+        material_crud = MaterialCRUD(db)
+        obras, siguiente = material_crud.obtener_materiales(
+            tipo=tipo, limit=limit, cursor=cursor, id_categoria=categoria_id
+        )
+        return MaterialesResponse(materiales=obras, siguiente_cursor=siguiente)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener obras: {str(e)}",
+        )
+
+
 @router.get("/nombre/{nombre}", response_model=CategoriaResponse)
 async def obtener_categoria_por_nombre(nombre: str, db: Session = Depends(get_db)):
     """Obtener una categoría por nombre."""
@@ -0,0 +1,31 @@
+from crud.deduplicacion_crud import DeduplicacionCRUD
+from database.config import get_db
+from fastapi import APIRouter, Depends
+from schemas import FusionRequest, FusionResponse
+from sqlalchemy.orm import Session
+from utils.error_handler import APIErrorHandler
+
+router = APIRouter(prefix="/deduplicacion", tags=["deduplicacion"])
+
+
+@router.post("/fusionar", response_model=FusionResponse)
+async def fusionar_duplicados(datos: FusionRequest, db: Session = Depends(get_db)):
+    """
+    Fusionar libros, autores o editoriales duplicados en el registro destino.
+
+    Los grupos candidatos los genera el job jobs.deduplicacion; todas las
+    referencias de los registros de origen pasan al destino y los de origen
+    se eliminan.
+    """
+    try:
+        deduplicacion_crud = DeduplicacionCRUD(db)
+        return deduplicacion_crud.fusionar(
+            tipo=datos.tipo,
+            id_destino=datos.id_destino,
+            ids_origen=datos.ids_origen,
+            id_usuario_edicion=datos.id_usuario_edicion,
+        )
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("fusionar duplicados", str(e))
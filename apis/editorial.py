@@ -1,11 +1,21 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from crud.editorial_crud import EditorialCRUD
+from crud.material_crud import MaterialCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import EditorialCreate, EditorialResponse, EditorialUpdate, RespuestaAPI
+from schemas import (
+    EditorialCreate,
+    EditorialResponse,
+    EditorialUpdate,
+    IdsLote,
+    MaterialesResponse,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/editoriales", tags=["editoriales"])
@@ -41,6 +51,51 @@ async def obtener_editorial(editorial_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener editorial", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[EditorialResponse])
+async def obtener_editoriales_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 editoriales por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        editorial_crud = EditorialCRUD(db)
+        encontrados = editorial_crud.obtener_editoriales_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener editoriales", str(e))
+
+
+@router.get("/{editorial_id}/obras", response_model=MaterialesResponse)
+async def obtener_obras_editorial(
+    editorial_id: UUID,
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Listar los libros, revistas y periódicos de una editorial en una sola consulta,
+    con los ejemplares totales, disponibles y prestados de cada uno.
+    """
+    try:
+        editorial_crud = EditorialCRUD(db)
+        if not editorial_crud.obtener_editorial(editorial_id):
+            raise APIErrorHandler.not_found_error("Editorial", str(editorial_id))
+        material_crud = MaterialCRUD(db)
+        obras, siguiente = material_crud.obtener_materiales(
+            tipo=tipo, limit=limit, cursor=cursor, id_editorial=editorial_id
+        )
+        return MaterialesResponse(materiales=obras, siguiente_cursor=siguiente)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener obras", str(e))
+
+
 @router.post("/", response_model=EditorialResponse, status_code=status.HTTP_201_CREATED)
 async def crear_editorial(
     editorial_data: EditorialCreate, db: Session = Depends(get_db)
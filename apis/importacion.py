@@ -0,0 +1,90 @@
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from uuid import UUID
+
+from crud.importacion_crud import (
+    ImportacionCRUD,
+    ProgresoImportacion,
+    nueva_importacion,
+    obtener_importacion,
+)
+from database.config import SessionLocal
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    File,
+    Form,
+    UploadFile,
+    status,
+)
+from schemas import ImportacionResponse
+from utils.error_handler import APIErrorHandler
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/importacion", tags=["importacion"])
+
+
+def _procesar_archivo(
+    ruta: str, id_usuario_creacion: UUID, progreso: ProgresoImportacion
+) -> None:
+    """Ejecutar la importación en segundo plano con su propia sesión."""
+    db = SessionLocal()
+    try:
+        with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+            ImportacionCRUD(db).importar_libros(archivo, id_usuario_creacion, progreso)
+    except Exception as e:
+        logger.exception(f"Error en la importación {progreso.id}")
+        progreso.estado = "fallida"
+        progreso.mensaje = str(e)
+        progreso.fecha_fin = datetime.now(timezone.utc)
+    finally:
+        db.close()
+        os.remove(ruta)
+
+
+@router.post(
+    "/libros",
+    response_model=ImportacionResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def importar_libros(
+    background_tasks: BackgroundTasks,
+    archivo: UploadFile = File(...),
+    id_usuario_creacion: UUID = Form(...),
+):
+    """
+    Importar libros desde un CSV con columnas titulo, autor, editorial y,
+    opcionalmente, isbn, numero_paginas, categoria y nacionalidad.
+
+    Los autores, editoriales y categorías se buscan por nombre y se crean
+    si no existen. El archivo se procesa en segundo plano; el progreso se
+    consulta con GET /importacion/{id}.
+    """
+    if archivo.filename and not archivo.filename.lower().endswith(".csv"):
+        raise APIErrorHandler.validation_error(
+            "El archivo debe ser un CSV", "archivo", archivo.filename
+        )
+    try:
+        # El UploadFile se cierra al responder: se guarda una copia propia
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".csv") as destino:
+            shutil.copyfileobj(archivo.file, destino)
+        progreso = nueva_importacion()
+        background_tasks.add_task(
+            _procesar_archivo, destino.name, id_usuario_creacion, progreso
+        )
+        return obtener_importacion(progreso.id)
+    except Exception as e:
+        raise APIErrorHandler.server_error("iniciar la importación", str(e))
+
+
+@router.get("/{importacion_id}", response_model=ImportacionResponse)
+async def obtener_progreso(importacion_id: str):
+    """Consultar el progreso o el resultado de una importación."""
+    progreso = obtener_importacion(importacion_id)
+    if not progreso:
+        raise APIErrorHandler.not_found_error("Importación", importacion_id)
+    return progreso
@@ -0,0 +1,49 @@
+from typing import Iterator, Optional
+from uuid import UUID
+
+from crud.inventario_crud import InventarioCRUD
+from database.config import get_db
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from schemas import ConciliacionResponse
+from sqlalchemy.orm import Session
+from utils.error_handler import APIErrorHandler
+
+router = APIRouter(prefix="/inventario", tags=["inventario"])
+
+
+def _lineas(archivo: UploadFile) -> Iterator[str]:
+    """Líneas del archivo subido, leídas de una en una."""
+    for linea in archivo.file:
+        yield linea.decode("utf-8-sig")
+
+
+@router.post("/conciliar", response_model=ConciliacionResponse)
+async def conciliar_inventario(
+    archivo: UploadFile = File(...),
+    ubicacion: str = Form(...),
+    aplicar: bool = Form(False),
+    id_usuario_edicion: Optional[UUID] = Form(None),
+    limite: int = Form(1000),
+    db: Session = Depends(get_db),
+):
+    """
+    Conciliar los códigos de barras escaneados en una ubicación (un código
+    por línea) con los items registrados en ella.
+
+    Devuelve los totales de correctos, faltantes, mal ubicados e
+    inesperados y hasta `limite` filas de detalle de cada categoría. Con
+    `aplicar` los items mal ubicados se mueven a la ubicación escaneada.
+    """
+    try:
+        inventario_crud = InventarioCRUD(db)
+        return inventario_crud.conciliar(
+            ubicacion=ubicacion,
+            lineas=_lineas(archivo),
+            aplicar=aplicar,
+            id_usuario_edicion=id_usuario_edicion,
+            limite=limite,
+        )
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("conciliar inventario", str(e))
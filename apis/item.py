@@ -1,16 +1,80 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from crud.item_crud import ItemCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import ItemCreate, ItemResponse, ItemUpdate, RespuestaAPI
+from schemas import (
+    CodigosBarrasReserva,
+    CodigosBarrasResponse,
+    ConteoUbicacionResponse,
+    IdsLote,
+    ItemCreate,
+    ItemResponse,
+    ItemsLoteCreate,
+    ItemsLoteResponse,
+    ItemsLoteUpdate,
+    ItemsLoteUpdateResponse,
+    ItemsUbicacionResponse,
+    ItemUpdate,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
+from utils.ubicacion import ruta_de_ubicacion
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
+def _material_info(item) -> Optional[dict]:
+    """Información del material asociado, leyendo solo la relación de su tipo."""
+    tipo = item.tipo_item
+    if tipo == "libro" and item.libro:
+        return {
+            "id": item.libro.id,
+            "titulo": item.libro.titulo,
+            "isbn": item.libro.isbn,
+            "tipo": "libro",
+        }
+    elif tipo == "revista" and item.revista:
+        return {
+            "id": item.revista.id,
+            "titulo": item.revista.titulo,
+            "numero_publicacion": item.revista.numero_publicacion,
+            "tipo": "revista",
+        }
+    elif tipo == "periodico" and item.periodico:
+        return {
+            "id": item.periodico.id,
+            "titulo": item.periodico.titulo,
+            "fecha_publicacion": item.periodico.fecha_publicacion,
+            "tipo": "periodico",
+        }
+    return None
+
+
+def _serializar_item(item) -> dict:
+    """Convertir un item en el diccionario de respuesta con su material."""
+    return {
+        "id": item.id,
+        "id_libro": item.id_libro,
+        "id_revista": item.id_revista,
+        "id_periodico": item.id_periodico,
+        "tipo_item": item.tipo_item or "desconocido",
+        "codigo_barras": item.codigo_barras,
+        "ubicacion": item.ubicacion,
+        "ubicacion_ruta": item.ubicacion_ruta,
+        "estado_fisico": item.estado_fisico or "bueno",
+        "disponible": item.disponible if item.disponible is not None else True,
+        "observaciones": item.observaciones,
+        "fecha_creacion": item.fecha_creacion,
+        "fecha_actualizacion": item.fecha_actualizacion,
+        "material": _material_info(item),
+    }
+
+
 @router.get("/", response_model=List[ItemResponse])
 async def obtener_items(
     skip: int = Query(0, ge=0),
@@ -19,6 +83,9 @@ async def obtener_items(
     id_libro: UUID = Query(None, description="Filtrar por libro"),
     id_revista: UUID = Query(None, description="Filtrar por revista"),
     id_periodico: UUID = Query(None, description="Filtrar por periódico"),
+    tipo: Optional[str] = Query(
+        None, description="Filtrar por tipo: libro, revista o periodico"
+    ),
     db: Session = Depends(get_db),
 ):
     """Obtener todos los items (ejemplares físicos)."""
@@ -31,6 +98,7 @@ async def obtener_items(
             id_libro=id_libro,
             id_revista=id_revista,
             id_periodico=id_periodico,
+            tipo=tipo,
         )
 
         if not items or len(items) == 0:
@@ -39,77 +107,59 @@ async def obtener_items(
         items_response = []
         for item in items:
             try:
-                material_info = None
-                tipo_item = "desconocido"
-                if item.id_libro:
-                    tipo_item = "libro"
-                    try:
-                        if hasattr(item, "libro") and item.libro is not None:
-                            libro = item.libro
-                            material_info = {
-                                "id": str(libro.id),
-                                "titulo": libro.titulo,
-                                "isbn": getattr(libro, "isbn", None),
-                                "tipo": "libro",
-                            }
-                    except (AttributeError, Exception):
-                        material_info = None
-                elif item.id_revista:
-                    tipo_item = "revista"
-                    try:
-                        if hasattr(item, "revista") and item.revista is not None:
-                            revista = item.revista
-                            material_info = {
-                                "id": str(revista.id),
-                                "titulo": revista.titulo,
-                                "numero_publicacion": getattr(
-                                    revista, "numero_publicacion", None
-                                ),
-                                "tipo": "revista",
-                            }
-                    except (AttributeError, Exception):
-                        material_info = None
-                elif item.id_periodico:
-                    tipo_item = "periodico"
-                    try:
-                        if hasattr(item, "periodico") and item.periodico is not None:
-                            periodico = item.periodico
-                            fecha_pub = getattr(periodico, "fecha_publicacion", None)
-                            material_info = {
-                                "id": str(periodico.id),
-                                "titulo": periodico.titulo,
-                                "fecha_publicacion": fecha_pub.isoformat()
-                                if fecha_pub
-                                else None,
-                                "tipo": "periodico",
-                            }
-                    except (AttributeError, Exception):
-                        material_info = None
-
-                item_response = ItemResponse(
-                    id=item.id,
-                    id_libro=item.id_libro,
-                    id_revista=item.id_revista,
-                    id_periodico=item.id_periodico,
-                    tipo_item=tipo_item,
-                    codigo_barras=item.codigo_barras,
-                    ubicacion=item.ubicacion,
-                    estado_fisico=item.estado_fisico or "bueno",
-                    disponible=item.disponible if item.disponible is not None else True,
-                    observaciones=item.observaciones,
-                    fecha_creacion=item.fecha_creacion,
-                    fecha_actualizacion=item.fecha_actualizacion,
-                    material=material_info,
-                )
-                items_response.append(item_response)
+                items_response.append(_serializar_item(item))
             except Exception:
                 continue
 
         return items_response
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("obtener items", str(e))
 
 
+@router.get("/ubicacion", response_model=ItemsUbicacionResponse)
+async def obtener_items_por_ubicacion(
+    ruta: Optional[str] = Query(
+        None, description="Nodo de ubicación: 'piso 2' o 'edificio-central/piso-2'"
+    ),
+    solo_disponibles: bool = Query(False, description="Solo items disponibles"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="siguiente_cursor anterior"),
+    db: Session = Depends(get_db),
+):
+    """Listar los items de una ubicación y de todas las que cuelgan de ella."""
+    try:
+        item_crud = ItemCRUD(db)
+        items, siguiente = item_crud.obtener_items_por_ubicacion(
+            ruta=ruta, limit=limit, cursor=cursor, solo_disponibles=solo_disponibles
+        )
+        return {
+            "ruta": ruta_de_ubicacion(ruta) or "",
+            "items": [_serializar_item(item) for item in items],
+            "siguiente_cursor": siguiente,
+        }
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener items por ubicación", str(e))
+
+
+@router.get("/ubicacion/conteo", response_model=ConteoUbicacionResponse)
+async def contar_items_por_ubicacion(
+    ruta: Optional[str] = Query(None, description="Nodo de ubicación"),
+    db: Session = Depends(get_db),
+):
+    """Contar los items bajo una ubicación, desglosados por sus sububicaciones."""
+    try:
+        item_crud = ItemCRUD(db)
+        return item_crud.contar_por_ubicacion(ruta)
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("contar items por ubicación", str(e))
+
+
 @router.get("/{item_id}", response_model=ItemResponse)
 async def obtener_item(item_id: UUID, db: Session = Depends(get_db)):
     """Obtener un item por ID."""
@@ -119,51 +169,33 @@ async def obtener_item(item_id: UUID, db: Session = Depends(get_db)):
         if not item:
             raise APIErrorHandler.not_found_error("Item", str(item_id))
 
-        # Enriquecer con información del material
-        material_info = None
-        if item.id_libro and item.libro:
-            material_info = {
-                "id": item.libro.id,
-                "titulo": item.libro.titulo,
-                "isbn": item.libro.isbn,
-                "tipo": "libro",
-            }
-        elif item.id_revista and item.revista:
-            material_info = {
-                "id": item.revista.id,
-                "titulo": item.revista.titulo,
-                "numero_publicacion": item.revista.numero_publicacion,
-                "tipo": "revista",
-            }
-        elif item.id_periodico and item.periodico:
-            material_info = {
-                "id": item.periodico.id,
-                "titulo": item.periodico.titulo,
-                "fecha_publicacion": item.periodico.fecha_publicacion,
-                "tipo": "periodico",
-            }
-
-        return {
-            "id": item.id,
-            "id_libro": item.id_libro,
-            "id_revista": item.id_revista,
-            "id_periodico": item.id_periodico,
-            "tipo_item": item.tipo_item,
-            "codigo_barras": item.codigo_barras,
-            "ubicacion": item.ubicacion,
-            "estado_fisico": item.estado_fisico,
-            "disponible": item.disponible,
-            "observaciones": item.observaciones,
-            "fecha_creacion": item.fecha_creacion,
-            "fecha_actualizacion": item.fecha_actualizacion,
-            "material": material_info,
-        }
+        return _serializar_item(item)
     except HTTPException:
         raise
     except Exception as e:
         raise APIErrorHandler.server_error("obtener item", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[ItemResponse])
+async def obtener_items_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 items por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        item_crud = ItemCRUD(db)
+        encontrados = item_crud.obtener_items_por_ids(lote.ids)
+        return {
+            "resultados": resultados_en_orden(
+                lote.ids, encontrados, serializar=_serializar_item
+            )
+        }
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener items", str(e))
+
+
 @router.post("/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
 async def crear_item(item_data: ItemCreate, db: Session = Depends(get_db)):
     """Crear un nuevo item (ejemplar físico)."""
@@ -181,49 +213,80 @@ async def crear_item(item_data: ItemCreate, db: Session = Depends(get_db)):
             id_usuario_creacion=item_data.id_usuario_creacion,
         )
 
-        # Enriquecer con información del material
-        material_info = None
-        if item.id_libro and item.libro:
-            material_info = {
-                "id": item.libro.id,
-                "titulo": item.libro.titulo,
-                "isbn": item.libro.isbn,
-                "tipo": "libro",
-            }
-        elif item.id_revista and item.revista:
-            material_info = {
-                "id": item.revista.id,
-                "titulo": item.revista.titulo,
-                "numero_publicacion": item.revista.numero_publicacion,
-                "tipo": "revista",
-            }
-        elif item.id_periodico and item.periodico:
-            material_info = {
-                "id": item.periodico.id,
-                "titulo": item.periodico.titulo,
-                "fecha_publicacion": item.periodico.fecha_publicacion,
-                "tipo": "periodico",
-            }
+        return _serializar_item(item)
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("crear item", str(e))
+
+
+@router.post("/bulk", response_model=ItemsLoteResponse)
+async def crear_items_lote(lote: ItemsLoteCreate, db: Session = Depends(get_db)):
+    """
+    Crear hasta 1000 items en una sola transacción.
 
+    Las filas inválidas (material inexistente, código de barras repetido en
+    el lote o ya registrado...) se devuelven en `errores` con su posición;
+    las demás se crean igualmente.
+    """
+    try:
+        item_crud = ItemCRUD(db)
+        creados, errores = item_crud.crear_items(
+            [item.dict() for item in lote.items],
+            id_usuario_creacion=lote.id_usuario_creacion,
+        )
         return {
-            "id": item.id,
-            "id_libro": item.id_libro,
-            "id_revista": item.id_revista,
-            "id_periodico": item.id_periodico,
-            "tipo_item": item.tipo_item,
-            "codigo_barras": item.codigo_barras,
-            "ubicacion": item.ubicacion,
-            "estado_fisico": item.estado_fisico,
-            "disponible": item.disponible,
-            "observaciones": item.observaciones,
-            "fecha_creacion": item.fecha_creacion,
-            "fecha_actualizacion": item.fecha_actualizacion,
-            "material": material_info,
+            "creados": [_serializar_item(item) for item in creados],
+            "errores": errores,
         }
     except ValueError as e:
         raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
-        raise APIErrorHandler.server_error("crear item", str(e))
+        raise APIErrorHandler.server_error("crear items", str(e))
+
+
+@router.patch("/bulk", response_model=ItemsLoteUpdateResponse)
+async def actualizar_items_lote(lote: ItemsLoteUpdate, db: Session = Depends(get_db)):
+    """
+    Cambiar la ubicación, el estado físico o las observaciones de muchos
+    items a la vez.
+
+    El filtro elige los items por ids, por códigos de barras (hasta 1000) o
+    por ruta de ubicación, que incluye todo lo que cuelga del nodo. Solo se
+    cambian los campos enviados en `cambios`.
+    """
+    try:
+        item_crud = ItemCRUD(db)
+        ids = item_crud.actualizar_items(
+            lote.id_usuario_edicion,
+            lote.cambios.dict(exclude_unset=True),
+            **lote.filtro.dict(),
+        )
+        return {"actualizados": len(ids), "ids": ids}
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("actualizar items", str(e))
+
+
+@router.post("/codigos-barras", response_model=CodigosBarrasResponse)
+async def reservar_codigos_barras(
+    reserva: CodigosBarrasReserva, db: Session = Depends(get_db)
+):
+    """
+    Reservar códigos de barras consecutivos para imprimir etiquetas antes de
+    dar de alta los items.
+
+    Los items creados sin código reciben uno automáticamente; esta reserva
+    sirve cuando las etiquetas se pegan antes de catalogar.
+    """
+    try:
+        item_crud = ItemCRUD(db)
+        return {"codigos": item_crud.reservar_codigos_barras(reserva.cantidad)}
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("reservar códigos de barras", str(e))
 
 
 @router.put("/{item_id}", response_model=ItemResponse)
@@ -250,45 +313,7 @@ async def actualizar_item(
         if not item_actualizado:
             raise APIErrorHandler.not_found_error("Item", str(item_id))
 
-        # Enriquecer con información del material
-        material_info = None
-        if item_actualizado.id_libro and item_actualizado.libro:
-            material_info = {
-                "id": item_actualizado.libro.id,
-                "titulo": item_actualizado.libro.titulo,
-                "isbn": item_actualizado.libro.isbn,
-                "tipo": "libro",
-            }
-        elif item_actualizado.id_revista and item_actualizado.revista:
-            material_info = {
-                "id": item_actualizado.revista.id,
-                "titulo": item_actualizado.revista.titulo,
-                "numero_publicacion": item_actualizado.revista.numero_publicacion,
-                "tipo": "revista",
-            }
-        elif item_actualizado.id_periodico and item_actualizado.periodico:
-            material_info = {
-                "id": item_actualizado.periodico.id,
-                "titulo": item_actualizado.periodico.titulo,
-                "fecha_publicacion": item_actualizado.periodico.fecha_publicacion,
-                "tipo": "periodico",
-            }
-
-        return {
-            "id": item_actualizado.id,
-            "id_libro": item_actualizado.id_libro,
-            "id_revista": item_actualizado.id_revista,
-            "id_periodico": item_actualizado.id_periodico,
-            "tipo_item": item_actualizado.tipo_item,
-            "codigo_barras": item_actualizado.codigo_barras,
-            "ubicacion": item_actualizado.ubicacion,
-            "estado_fisico": item_actualizado.estado_fisico,
-            "disponible": item_actualizado.disponible,
-            "observaciones": item_actualizado.observaciones,
-            "fecha_creacion": item_actualizado.fecha_creacion,
-            "fecha_actualizacion": item_actualizado.fecha_actualizacion,
-            "material": material_info,
-        }
+        return _serializar_item(item_actualizado)
     except HTTPException:
         raise
     except ValueError as e:
@@ -336,48 +361,7 @@ async def obtener_items_por_material(
             tipo=tipo, material_id=material_id, solo_disponibles=solo_disponibles
         )
 
-        # Enriquecer con información del material
-        items_response = []
-        for item in items:
-            material_info = None
-            if item.id_libro and item.libro:
-                material_info = {
-                    "id": item.libro.id,
-                    "titulo": item.libro.titulo,
-                    "isbn": item.libro.isbn,
-                    "tipo": "libro",
-                }
-            elif item.id_revista and item.revista:
-                material_info = {
-                    "id": item.revista.id,
-                    "titulo": item.revista.titulo,
-                    "numero_publicacion": item.revista.numero_publicacion,
-                    "tipo": "revista",
-                }
-            elif item.id_periodico and item.periodico:
-                material_info = {
-                    "id": item.periodico.id,
-                    "titulo": item.periodico.titulo,
-                    "fecha_publicacion": item.periodico.fecha_publicacion,
-                    "tipo": "periodico",
-                }
-
-            item_dict = {
-                "id": item.id,
-                "id_libro": item.id_libro,
-                "id_revista": item.id_revista,
-                "id_periodico": item.id_periodico,
-                "tipo_item": item.tipo_item,
-                "codigo_barras": item.codigo_barras,
-                "ubicacion": item.ubicacion,
-                "estado_fisico": item.estado_fisico,
-                "disponible": item.disponible,
-                "observaciones": item.observaciones,
-                "fecha_creacion": item.fecha_creacion,
-                "fecha_actualizacion": item.fecha_actualizacion,
-                "material": material_info,
-            }
-            items_response.append(item_dict)
+        items_response = [_serializar_item(item) for item in items]
 
         return items_response
     except ValueError as e:
@@ -1,12 +1,21 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from crud.item_crud import ItemCRUD
 from crud.libro_crud import LibroCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import ItemResponse, LibroCreate, LibroResponse, LibroUpdate, RespuestaAPI
+from schemas import (
+    IdsLote,
+    ItemResponse,
+    LibroCreate,
+    LibroResponse,
+    LibroUpdate,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/libros", tags=["libros"])
@@ -16,17 +25,41 @@ router = APIRouter(prefix="/libros", tags=["libros"])
 async def obtener_libros(
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=1000),
+    paginas_min: Optional[int] = Query(None, ge=1),
+    paginas_max: Optional[int] = Query(None, ge=1),
     db: Session = Depends(get_db),
 ):
-    """Obtener todos los libros."""
+    """
+    Obtener todos los libros, o los que tienen entre paginas_min y
+    paginas_max páginas (ambos incluidos).
+    """
     try:
         libro_crud = LibroCRUD(db)
-        libros = libro_crud.obtener_libros(skip=skip, limit=limit)
+        libros = libro_crud.obtener_libros(
+            skip=skip, limit=limit, paginas_min=paginas_min, paginas_max=paginas_max
+        )
         return libros
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("obtener libros", str(e))
 
 
+@router.get("/isbn/{isbn}", response_model=LibroResponse)
+async def obtener_libro_por_isbn(isbn: str, db: Session = Depends(get_db)):
+    """Obtener un libro por ISBN-10 o ISBN-13, con o sin guiones."""
+    try:
+        libro_crud = LibroCRUD(db)
+        libro = libro_crud.obtener_libro_por_isbn(isbn)
+        if not libro:
+            raise APIErrorHandler.not_found_error("Libro", isbn)
+        return libro
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener libro por ISBN", str(e))
+
+
 @router.get("/{libro_id}", response_model=LibroResponse)
 async def obtener_libro(libro_id: UUID, db: Session = Depends(get_db)):
     """Obtener un libro por ID."""
@@ -42,6 +75,22 @@ async def obtener_libro(libro_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener libro", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[LibroResponse])
+async def obtener_libros_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 libros por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        libro_crud = LibroCRUD(db)
+        encontrados = libro_crud.obtener_libros_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener libros", str(e))
+
+
 @router.post("/", response_model=LibroResponse, status_code=status.HTTP_201_CREATED)
 async def crear_libro(libro_data: LibroCreate, db: Session = Depends(get_db)):
     """Crear un nuevo libro."""
@@ -96,23 +145,16 @@ async def actualizar_libro(
     "/{libro_id}", response_model=RespuestaAPI, status_code=status.HTTP_200_OK
 )
 async def eliminar_libro(libro_id: UUID, db: Session = Depends(get_db)):
-    """Eliminar un libro."""
+    """Eliminar un libro y sus ejemplares; no se permite si alguno tiene préstamos."""
     try:
         libro_crud = LibroCRUD(db)
-        libro_existente = libro_crud.obtener_libro(libro_id)
-        if not libro_existente:
+        if not libro_crud.eliminar_libro(libro_id):
             raise APIErrorHandler.not_found_error("Libro", str(libro_id))
-
-        eliminado = libro_crud.eliminar_libro(libro_id)
-        if eliminado:
-            return RespuestaAPI(mensaje="Libro eliminado exitosamente", success=True)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al eliminar libro",
-            )
+        return RespuestaAPI(mensaje="Libro eliminado exitosamente", success=True)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("eliminar libro", str(e))
 
@@ -0,0 +1,87 @@
+from typing import Optional
+from uuid import UUID
+
+from crud.material_crud import MaterialCRUD
+from database.config import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from schemas import DisponibilidadResponse, FacetasResponse, MaterialesResponse
+from sqlalchemy.orm import Session
+from utils.error_handler import APIErrorHandler
+
+router = APIRouter(prefix="/materiales", tags=["materiales"])
+
+
+@router.get("/", response_model=MaterialesResponse)
+async def obtener_materiales(
+    tipo: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    id_autor: Optional[UUID] = Query(None),
+    id_editorial: Optional[UUID] = Query(None),
+    id_categoria: Optional[UUID] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Listar libros, revistas y periódicos ordenados por título, con el
+    número de ejemplares totales y disponibles de cada uno.
+
+    Para la página siguiente se envía el siguiente_cursor de la respuesta.
+    """
+    try:
+        material_crud = MaterialCRUD(db)
+        materiales, siguiente = material_crud.obtener_materiales(
+            tipo=tipo,
+            limit=limit,
+            cursor=cursor,
+            id_autor=id_autor,
+            id_editorial=id_editorial,
+            id_categoria=id_categoria,
+        )
+        return MaterialesResponse(materiales=materiales, siguiente_cursor=siguiente)
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener materiales", str(e))
+
+
+@router.get("/facetas", response_model=FacetasResponse)
+async def obtener_facetas(
+    tipo: Optional[str] = Query(None),
+    id_autor: Optional[UUID] = Query(None),
+    id_editorial: Optional[UUID] = Query(None),
+    id_categoria: Optional[UUID] = Query(None),
+    limite_valores: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """
+    Contar los materiales que cumplen los filtros por tipo, autor, editorial
+    y categoría, con los mismos filtros que el listado de materiales.
+    """
+    try:
+        material_crud = MaterialCRUD(db)
+        return material_crud.obtener_facetas(
+            tipo=tipo,
+            id_autor=id_autor,
+            id_editorial=id_editorial,
+            id_categoria=id_categoria,
+            limite_valores=limite_valores,
+        )
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener facetas", str(e))
+
+
+@router.get("/{id_material}/disponibilidad", response_model=DisponibilidadResponse)
+async def obtener_disponibilidad(id_material: UUID, db: Session = Depends(get_db)):
+    """Obtener cuántos ejemplares de un material hay, disponibles y prestados."""
+    try:
+        material_crud = MaterialCRUD(db)
+        disponibilidad = material_crud.obtener_disponibilidad(id_material)
+        if not disponibilidad:
+            raise APIErrorHandler.not_found_error("Material", str(id_material))
+        return disponibilidad
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener disponibilidad", str(e))
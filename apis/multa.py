@@ -5,8 +5,17 @@ from uuid import UUID
 from crud.multa_crud import MultaCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import MultaCreate, MultaPagar, MultaResponse, MultaUpdate, RespuestaAPI
+from schemas import (
+    IdsLote,
+    MultaCreate,
+    MultaPagar,
+    MultaResponse,
+    MultaUpdate,
+    RespuestaAPI,
+    ResultadosLote,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/multas", tags=["multas"])
@@ -27,6 +36,8 @@ async def obtener_multas(
             skip=skip, limit=limit, estado=estado, id_usuario=id_usuario
         )
         return multas
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("obtener multas", str(e))
 
@@ -46,6 +57,22 @@ async def obtener_multa(multa_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener multa", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[MultaResponse])
+async def obtener_multas_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 multas por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        multa_crud = MultaCRUD(db)
+        encontrados = multa_crud.obtener_multas_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener multas", str(e))
+
+
 @router.post("/", response_model=MultaResponse, status_code=status.HTTP_201_CREATED)
 async def crear_multa(multa_data: MultaCreate, db: Session = Depends(get_db)):
     """Crear una nueva multa."""
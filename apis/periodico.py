@@ -1,4 +1,5 @@
-from typing import List
+from datetime import date
+from typing import List, Optional
 from uuid import UUID
 
 from crud.item_crud import ItemCRUD
@@ -6,13 +7,16 @@ from crud.periodico_crud import PeriodicoCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from schemas import (
+    IdsLote,
     ItemResponse,
     PeriodicoCreate,
     PeriodicoResponse,
     PeriodicoUpdate,
     RespuestaAPI,
+    ResultadosLote,
 )
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/periodicos", tags=["periodicos"])
@@ -22,13 +26,22 @@ router = APIRouter(prefix="/periodicos", tags=["periodicos"])
 async def obtener_periodicos(
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=1000),
+    desde: Optional[date] = Query(None),
+    hasta: Optional[date] = Query(None),
     db: Session = Depends(get_db),
 ):
-    """Obtener todos los periódicos."""
+    """
+    Obtener todos los periódicos, o los publicados entre `desde` y `hasta`
+    (fechas AAAA-MM-DD, ambas incluidas).
+    """
     try:
         periodico_crud = PeriodicoCRUD(db)
-        periodicos = periodico_crud.obtener_periodicos(skip=skip, limit=limit)
+        periodicos = periodico_crud.obtener_periodicos(
+            skip=skip, limit=limit, desde=desde, hasta=hasta
+        )
         return periodicos
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("obtener periódicos", str(e))
 
@@ -48,6 +61,22 @@ async def obtener_periodico(periodico_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener periódico", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[PeriodicoResponse])
+async def obtener_periodicos_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 periódicos por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        periodico_crud = PeriodicoCRUD(db)
+        encontrados = periodico_crud.obtener_periodicos_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener periódicos", str(e))
+
+
 @router.post("/", response_model=PeriodicoResponse, status_code=status.HTTP_201_CREATED)
 async def crear_periodico(
     periodico_data: PeriodicoCreate, db: Session = Depends(get_db)
@@ -103,25 +132,16 @@ async def actualizar_periodico(
     "/{periodico_id}", response_model=RespuestaAPI, status_code=status.HTTP_200_OK
 )
 async def eliminar_periodico(periodico_id: UUID, db: Session = Depends(get_db)):
-    """Eliminar un periódico."""
+    """Eliminar un periódico y sus ejemplares; no se permite si alguno tiene préstamos."""
     try:
         periodico_crud = PeriodicoCRUD(db)
-        periodico_existente = periodico_crud.obtener_periodico(periodico_id)
-        if not periodico_existente:
+        if not periodico_crud.eliminar_periodico(periodico_id):
             raise APIErrorHandler.not_found_error("Periódico", str(periodico_id))
-
-        eliminado = periodico_crud.eliminar_periodico(periodico_id)
-        if eliminado:
-            return RespuestaAPI(
-                mensaje="Periódico eliminado exitosamente", success=True
-            )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al eliminar periódico",
-            )
+        return RespuestaAPI(mensaje="Periódico eliminado exitosamente", success=True)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("eliminar periódico", str(e))
 
@@ -1,17 +1,23 @@
+import json
 from typing import List, Optional
 from uuid import UUID
 
 from crud.prestamo_crud import PrestamoCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from schemas import (
+    IdsLote,
     PrestamoCreate,
     PrestamoDevolver,
     PrestamoResponse,
     PrestamoUpdate,
     RespuestaAPI,
+    ResultadosLote,
 )
 from sqlalchemy.orm import Session
+from utils.archivo_historial import leer_historial
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/prestamos", tags=["prestamos"])
@@ -32,10 +38,30 @@ async def obtener_prestamos(
             skip=skip, limit=limit, estado=estado, id_usuario=id_usuario
         )
         return prestamos
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("obtener préstamos", str(e))
 
 
+@router.get("/archivo")
+async def obtener_historial_archivado(
+    id_usuario: Optional[UUID] = Query(None, description="Filtrar por usuario"),
+    id_item: Optional[UUID] = Query(None, description="Filtrar por item"),
+):
+    """Transmitir en NDJSON los préstamos archivados de un usuario o item."""
+    if not id_usuario and not id_item:
+        raise APIErrorHandler.validation_error(
+            "Debe especificar id_usuario o id_item", field="id_usuario"
+        )
+
+    def generar_lineas():
+        for registro in leer_historial(id_usuario=id_usuario, id_item=id_item):
+            yield json.dumps(registro, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(generar_lineas(), media_type="application/x-ndjson")
+
+
 @router.get("/{prestamo_id}", response_model=PrestamoResponse)
 async def obtener_prestamo(prestamo_id: UUID, db: Session = Depends(get_db)):
     """Obtener un préstamo por ID."""
@@ -51,6 +77,22 @@ async def obtener_prestamo(prestamo_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener préstamo", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[PrestamoResponse])
+async def obtener_prestamos_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 préstamos por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        prestamo_crud = PrestamoCRUD(db)
+        encontrados = prestamo_crud.obtener_prestamos_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener préstamos", str(e))
+
+
 @router.post("/", response_model=PrestamoResponse, status_code=status.HTTP_201_CREATED)
 async def crear_prestamo(prestamo_data: PrestamoCreate, db: Session = Depends(get_db)):
     """Crear un nuevo préstamo."""
@@ -6,13 +6,16 @@ from crud.revista_crud import RevistaCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from schemas import (
+    IdsLote,
     ItemResponse,
     RespuestaAPI,
+    ResultadosLote,
     RevistaCreate,
     RevistaResponse,
     RevistaUpdate,
 )
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/revistas", tags=["revistas"])
@@ -48,6 +51,22 @@ async def obtener_revista(revista_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener revista", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[RevistaResponse])
+async def obtener_revistas_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 revistas por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        revista_crud = RevistaCRUD(db)
+        encontrados = revista_crud.obtener_revistas_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener revistas", str(e))
+
+
 @router.post("/", response_model=RevistaResponse, status_code=status.HTTP_201_CREATED)
 async def crear_revista(revista_data: RevistaCreate, db: Session = Depends(get_db)):
     """Crear una nueva revista."""
@@ -101,23 +120,16 @@ async def actualizar_revista(
     "/{revista_id}", response_model=RespuestaAPI, status_code=status.HTTP_200_OK
 )
 async def eliminar_revista(revista_id: UUID, db: Session = Depends(get_db)):
-    """Eliminar una revista."""
+    """Eliminar una revista y sus ejemplares; no se permite si alguno tiene préstamos."""
     try:
         revista_crud = RevistaCRUD(db)
-        revista_existente = revista_crud.obtener_revista(revista_id)
-        if not revista_existente:
+        if not revista_crud.eliminar_revista(revista_id):
             raise APIErrorHandler.not_found_error("Revista", str(revista_id))
-
-        eliminada = revista_crud.eliminar_revista(revista_id)
-        if eliminada:
-            return RespuestaAPI(mensaje="Revista eliminada exitosamente", success=True)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Error al eliminar revista",
-            )
+        return RespuestaAPI(mensaje="Revista eliminada exitosamente", success=True)
     except HTTPException:
         raise
+    except ValueError as e:
+        raise APIErrorHandler.validation_error(str(e))
     except Exception as e:
         raise APIErrorHandler.server_error("eliminar revista", str(e))
 
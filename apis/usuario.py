@@ -4,8 +4,16 @@ from uuid import UUID
 from crud.usuario_crud import UsuarioCRUD
 from database.config import get_db
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from schemas import RespuestaAPI, UsuarioCreate, UsuarioResponse, UsuarioUpdate
+from schemas import (
+    IdsLote,
+    RespuestaAPI,
+    ResultadosLote,
+    UsuarioCreate,
+    UsuarioResponse,
+    UsuarioUpdate,
+)
 from sqlalchemy.orm import Session
+from utils.consultas import resultados_en_orden
 from utils.error_handler import APIErrorHandler
 
 router = APIRouter(prefix="/usuarios", tags=["usuarios"])
@@ -49,6 +57,22 @@ async def obtener_usuario(usuario_id: UUID, db: Session = Depends(get_db)):
         raise APIErrorHandler.server_error("obtener usuario", str(e))
 
 
+@router.post("/batch-get", response_model=ResultadosLote[UsuarioResponse])
+async def obtener_usuarios_lote(lote: IdsLote, db: Session = Depends(get_db)):
+    """
+    Obtener hasta 1000 usuarios por ID en una sola consulta.
+
+    Los resultados siguen el orden de `ids`; los que no existen vuelven con
+    `encontrado: false`.
+    """
+    try:
+        usuario_crud = UsuarioCRUD(db)
+        encontrados = usuario_crud.obtener_usuarios_por_ids(lote.ids)
+        return {"resultados": resultados_en_orden(lote.ids, encontrados)}
+    except Exception as e:
+        raise APIErrorHandler.server_error("obtener usuarios", str(e))
+
+
 @router.post("/", response_model=UsuarioResponse, status_code=status.HTTP_201_CREATED)
 async def crear_usuario(usuario_data: UsuarioCreate, db: Session = Depends(get_db)):
     """Crear un nuevo usuario."""
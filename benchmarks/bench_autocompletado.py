@@ -0,0 +1,80 @@
+"""
+Benchmark de latencia del autocompletado en memoria.
+
+Carga N entradas sintéticas (títulos y nombres de 1 a 5 palabras) en el
+arreglo ordenado de utils.autocompletado y mide la latencia de consultas
+con prefijos de 1 a 8 caracteres y de altas incrementales.
+
+Uso:
+    python -m benchmarks.bench_autocompletado [entradas] [consultas]
+
+No necesita base de datos.
+"""
+
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from utils.autocompletado import Autocompletado
+
+TIPOS = ("libro", "revista", "periodico", "autor", "editorial", "categoria")
+SILABAS = (
+    "ca", "sa", "ma", "ra", "de", "la", "so", "le", "ti", "em", "po", "ar",
+    "gar", "cia", "mar", "quez", "bo", "res", "cor", "ta", "zar", "ne", "ru", "da",
+)  # fmt: skip
+
+
+def palabra(azar: random.Random) -> str:
+    return "".join(azar.choice(SILABAS) for _ in range(azar.randint(1, 4)))
+
+
+def generar_documentos(entradas: int, azar: random.Random):
+    """Documentos (tipo, id, texto) hasta sumar unas `entradas` entradas."""
+    generadas = 0
+    while generadas < entradas:
+        palabras = azar.randint(1, 5)
+        generadas += palabras
+        texto = " ".join(palabra(azar) for _ in range(palabras)).title()
+        yield azar.choice(TIPOS), uuid.uuid4(), texto
+
+
+def percentil(tiempos, p: float) -> float:
+    ordenados = sorted(tiempos)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+def main():
+    entradas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    consultas = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    azar = random.Random(42)
+
+    indice = Autocompletado()
+    inicio = time.perf_counter()
+    indice.cargar(generar_documentos(entradas, azar))
+    print(f"Carga de {len(indice)} entradas: {time.perf_counter() - inicio:.1f} s")
+
+    prefijos = [palabra(azar)[: azar.randint(1, 8)] for _ in range(consultas)]
+    tiempos = []
+    for prefijo in prefijos:
+        inicio = time.perf_counter()
+        indice.sugerir(prefijo, limite=10)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+
+    altas = []
+    for tipo, id_documento, texto in generar_documentos(1000, azar):
+        inicio = time.perf_counter()
+        indice.agregar(tipo, id_documento, texto)
+        altas.append((time.perf_counter() - inicio) * 1000)
+
+    print(f"\n{'operación':<12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'máx (ms)':>10}")
+    for nombre, muestra in (("sugerir", tiempos), ("agregar", altas)):
+        print(
+            f"{nombre:<12}{statistics.median(muestra):>10.3f}"
+            f"{percentil(muestra, 0.99):>10.3f}{max(muestra):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
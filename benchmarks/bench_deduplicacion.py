@@ -0,0 +1,97 @@
+"""
+Benchmark de la detección de casi duplicados con MinHash y LSH.
+
+Genera N registros sintéticos (títulos con autor de 2 a 6 palabras de un vocabulario con
+frecuencias tipo Zipf) de los
+que una fracción son copias con erratas (una letra cambiada, quitada o
+duplicada, tildes y mayúsculas distintas) y mide cuánto tarda
+utils.minhash.agrupar_duplicados y cuántas de las copias recupera.
+
+Uso:
+    python -m benchmarks.bench_deduplicacion [registros] [fraccion_copias]
+
+No necesita base de datos.
+"""
+
+import itertools
+import random
+import sys
+import time
+
+from utils.minhash import agrupar_duplicados
+
+CONSONANTES = "bcdfgjlmnprstvz"
+VOCALES = "aeiou"
+LETRAS = "abcdefghijklmnopqrstuvwxyz"
+TILDES = {"a": "á", "e": "é", "i": "í", "o": "ó", "u": "ú"}
+
+
+def vocabulario(azar: random.Random, palabras: int = 50_000):
+    """Palabras pronunciables de 2 a 5 sílabas."""
+    return [
+        "".join(
+            azar.choice(CONSONANTES) + azar.choice(VOCALES)
+            for _ in range(azar.randint(2, 5))
+        )
+        for _ in range(palabras)
+    ]
+
+
+def con_errata(texto: str, azar: random.Random) -> str:
+    """Copia del texto con una errata de escritura manual."""
+    posicion = azar.randrange(len(texto))
+    cambio = azar.choice(("cambiar", "quitar", "duplicar", "tilde", "mayusculas"))
+    if cambio == "cambiar":
+        return texto[:posicion] + azar.choice(LETRAS) + texto[posicion + 1 :]
+    if cambio == "quitar":
+        return texto[:posicion] + texto[posicion + 1 :]
+    if cambio == "duplicar":
+        return texto[:posicion] + texto[posicion] + texto[posicion:]
+    if cambio == "tilde":
+        return "".join(TILDES.get(c, c) if azar.random() < 0.3 else c for c in texto)
+    return texto.upper()
+
+
+def main():
+    registros = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fraccion_copias = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    azar = random.Random(42)
+
+    palabras = vocabulario(azar)
+    # Frecuencias tipo Zipf: unas pocas palabras aparecen en muchos títulos
+    acumulados = list(
+        itertools.accumulate(1 / (rango + 1) for rango in range(len(palabras)))
+    )
+
+    datos = []
+    originales = {}
+    for id_registro in range(registros):
+        if datos and azar.random() < fraccion_copias:
+            original, texto = azar.choice(datos)
+            originales[id_registro] = originales.get(original, original)
+            datos.append((id_registro, con_errata(texto, azar)))
+        else:
+            texto = " ".join(
+                azar.choices(palabras, cum_weights=acumulados, k=azar.randint(2, 6))
+            )
+            datos.append((id_registro, texto.title()))
+
+    inicio = time.perf_counter()
+    grupos = agrupar_duplicados(datos)
+    segundos = time.perf_counter() - inicio
+
+    grupo_de = {
+        id_registro: n for n, grupo in enumerate(grupos) for id_registro in grupo
+    }
+    recuperadas = sum(
+        1
+        for copia, original in originales.items()
+        if copia in grupo_de and grupo_de[copia] == grupo_de.get(original)
+    )
+    print(f"Registros: {registros}  copias con erratas: {len(originales)}")
+    print(f"Tiempo: {segundos:.1f} s  grupos: {len(grupos)}")
+    print(f"Copias recuperadas: {recuperadas / max(1, len(originales)):.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark de la eliminación de un libro con muchos ejemplares.
+
+Crea libros con N ejemplares cada uno y mide LibroCRUD.eliminar_libro (un
+DELETE con la comprobación de préstamos, que deja el borrado de los items a
+la FK ON DELETE CASCADE) frente al borrado por el ORM: cargar los items del
+libro y eliminarlos uno a uno con la sesión antes que el libro.
+
+Todo se ejecuta dentro de una transacción externa que se revierte al
+final: la base de datos queda como estaba.
+
+Uso:
+    python -m benchmarks.bench_eliminacion [ejemplares] [repeticiones]
+
+Requiere BENCH_DATABASE_URL (o DATABASE_URL) apuntando a un PostgreSQL con
+las migraciones aplicadas.
+"""
+
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from crud.item_crud import ItemCRUD
+from crud.libro_crud import LibroCRUD
+from dotenv import load_dotenv
+from entities.autores import Autor
+from entities.editoriales import Editorial
+from entities.items import Item
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+
+def crear_libro_con_ejemplares(
+    db: Session, autor_id: uuid.UUID, editorial_id: uuid.UUID, ejemplares: int
+) -> uuid.UUID:
+    id_usuario = uuid.uuid4()
+    libro = LibroCRUD(db).crear_libro(
+        titulo=f"Libro de prueba {uuid.uuid4()}",
+        id_editorial=editorial_id,
+        id_autor=autor_id,
+        id_usuario_creacion=id_usuario,
+    )
+    ItemCRUD(db).crear_items(
+        [{"id_libro": libro.id} for _ in range(ejemplares)],
+        id_usuario_creacion=id_usuario,
+    )
+    libro_id = libro.id
+    db.expunge_all()
+    return libro_id
+
+
+def eliminar_con_orm(db: Session, libro_id: uuid.UUID) -> None:
+    """Borrado que el ORM haría con cascade="all, delete" en Libro.items."""
+    for item in db.query(Item).filter(Item.id_libro == libro_id).all():
+        db.delete(item)
+    db.delete(LibroCRUD(db).obtener_libro(libro_id))
+    db.commit()
+
+
+def medir(
+    db: Session, autor_id, editorial_id, ejemplares: int, repeticiones: int, borrar
+):
+    tiempos = []
+    for _ in range(repeticiones):
+        libro_id = crear_libro_con_ejemplares(db, autor_id, editorial_id, ejemplares)
+        inicio = time.perf_counter()
+        borrar(db, libro_id)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    ejemplares = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Se requiere BENCH_DATABASE_URL o DATABASE_URL")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        transaccion = conn.begin()
+        # Los commit de los CRUD liberan savepoints; el rollback final lo deshace todo
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            id_usuario = uuid.uuid4()
+            autor = Autor(
+                nombre="Autor de prueba",
+                nacionalidad="N/A",
+                id_usuario_creacion=id_usuario,
+                id_usuario_edicion=id_usuario,
+            )
+            editorial = Editorial(
+                nombre="Editorial de prueba",
+                id_usuario_creacion=id_usuario,
+                id_usuario_edicion=id_usuario,
+            )
+            db.add_all([autor, editorial])
+            db.commit()
+            autor_id, editorial_id = autor.id, editorial.id
+
+            print(f"Libro con {ejemplares} ejemplares, mediana de {repeticiones}:")
+            sql = medir(
+                db,
+                autor_id,
+                editorial_id,
+                ejemplares,
+                repeticiones,
+                lambda db, libro_id: LibroCRUD(db).eliminar_libro(libro_id),
+            )
+            print(f"  DELETE con cascada en la base de datos: {sql:.1f} ms")
+            orm = medir(
+                db, autor_id, editorial_id, ejemplares, repeticiones, eliminar_con_orm
+            )
+            print(f"  ORM (cargar y borrar cada item):        {orm:.1f} ms")
+            print(f"  Mejora: {orm / sql:.1f}x")
+        finally:
+            db.close()
+            transaccion.rollback()
+
+
+if __name__ == "__main__":
+    main()
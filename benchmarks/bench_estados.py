@@ -0,0 +1,97 @@
+"""
+Benchmark de consultas filtradas por estado: VARCHAR frente a ENUM.
+
+Crea dos tablas temporales con la misma distribución de estados (una con
+la columna como VARCHAR(20), como antes de la migración, y otra con el tipo
+ENUM estado_prestamo), construye un índice sobre el estado en ambas y
+compara tamaños y tiempos de las consultas habituales.
+
+Uso:
+    python -m benchmarks.bench_estados [filas]
+
+Requiere BENCH_DATABASE_URL (o DATABASE_URL) apuntando a un PostgreSQL con
+la migración c4e8f2a9b1d3 aplicada.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+CONSULTAS = {
+    "conteo_activos": "SELECT count(*) FROM {tabla} WHERE estado = 'activo'",
+    "pagina_vencidos": (
+        "SELECT id FROM {tabla} WHERE estado = 'vencido' ORDER BY id LIMIT 100"
+    ),
+    "agrupado": "SELECT estado, count(*) FROM {tabla} GROUP BY estado",
+}
+
+
+def preparar_tablas(conn, filas: int) -> None:
+    """Crear y poblar las tablas temporales de comparación."""
+    for tabla, tipo in (
+        ("bench_estado_texto", "VARCHAR(20)"),
+        ("bench_estado_enum", "estado_prestamo"),
+    ):
+        conn.execute(text(f"DROP TABLE IF EXISTS {tabla}"))
+        conn.execute(
+            text(f"CREATE TEMP TABLE {tabla} (id bigint PRIMARY KEY, estado {tipo})")
+        )
+        conn.execute(
+            text(
+                f"INSERT INTO {tabla} (id, estado) "
+                "SELECT g, (CASE WHEN g % 10 < 7 THEN 'devuelto' "
+                "WHEN g % 10 < 9 THEN 'activo' ELSE 'vencido' END)::" + tipo + " "
+                "FROM generate_series(1, :filas) AS g"
+            ),
+            {"filas": filas},
+        )
+        conn.execute(text(f"CREATE INDEX ix_{tabla}_estado ON {tabla} (estado)"))
+        conn.execute(text(f"ANALYZE {tabla}"))
+
+
+def medir(conn, sql: str, repeticiones: int = 20) -> float:
+    """Mediana en milisegundos de varias ejecuciones de una consulta."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        conn.execute(text(sql)).fetchall()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Se requiere BENCH_DATABASE_URL o DATABASE_URL")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        print(f"Preparando {filas} filas...")
+        preparar_tablas(conn, filas)
+
+        print(f"{'tabla':<22}{'tabla (MB)':>12}{'índice (MB)':>13}")
+        for tabla in ("bench_estado_texto", "bench_estado_enum"):
+            tam_tabla, tam_indice = conn.execute(
+                text("SELECT pg_relation_size(:t), pg_relation_size(:i)"),
+                {"t": tabla, "i": f"ix_{tabla}_estado"},
+            ).one()
+            print(
+                f"{tabla:<22}{tam_tabla / 1048576:>12.1f}{tam_indice / 1048576:>13.1f}"
+            )
+
+        print(f"\n{'consulta':<18}{'varchar (ms)':>14}{'enum (ms)':>12}")
+        for nombre, sql in CONSULTAS.items():
+            texto_ms = medir(conn, sql.format(tabla="bench_estado_texto"))
+            enum_ms = medir(conn, sql.format(tabla="bench_estado_enum"))
+            print(f"{nombre:<18}{texto_ms:>14.2f}{enum_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark de la importación de libros desde CSV.
+
+Genera un CSV sintético de N filas (unos 5.000 autores, 1.000 editoriales y
+40 categorías, la mayoría ya existentes por nombre tras las primeras filas;
+el 90 % con ISBN y un 2 % de ISBN repetidos) y mide
+ImportacionCRUD.importar_libros frente a una muestra creada fila a fila con
+LibroCRUD.crear_libro, que es lo que hace la API libro a libro.
+
+Todo se ejecuta dentro de una transacción externa que se revierte al
+final: la base de datos queda como estaba.
+
+Uso:
+    python -m benchmarks.bench_importacion [filas] [muestra_fila_a_fila]
+
+Requiere BENCH_DATABASE_URL (o DATABASE_URL) apuntando a un PostgreSQL con
+las migraciones aplicadas.
+"""
+
+import csv
+import io
+import os
+import random
+import sys
+import time
+import uuid
+
+from crud.importacion_crud import ImportacionCRUD
+from crud.libro_crud import LibroCRUD
+from dotenv import load_dotenv
+from entities.autores import Autor
+from entities.editoriales import Editorial
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+load_dotenv()
+
+AUTORES = 5000
+EDITORIALES = 1000
+CATEGORIAS = 40
+
+
+def _isbn13(rng: random.Random) -> str:
+    base = "978" + "".join(str(rng.randrange(10)) for _ in range(9))
+    suma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(base))
+    return base + str((10 - suma % 10) % 10)
+
+
+def generar_csv(filas: int, semilla: int = 42) -> str:
+    """CSV sintético con cabecera y `filas` libros."""
+    rng = random.Random(semilla)
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    escritor.writerow(
+        ["titulo", "autor", "editorial", "categoria", "isbn", "numero_paginas"]
+    )
+    isbns = []
+    for i in range(filas):
+        if isbns and rng.random() < 0.02:
+            isbn = rng.choice(isbns)
+        elif rng.random() < 0.9:
+            isbn = _isbn13(rng)
+            isbns.append(isbn)
+        else:
+            isbn = ""
+        escritor.writerow(
+            [
+                f"Libro de prueba {i}",
+                f"Autor {rng.randrange(AUTORES)}",
+                f"Editorial {rng.randrange(EDITORIALES)}",
+                f"Categoría {rng.randrange(CATEGORIAS)}",
+                isbn,
+                rng.randrange(40, 1200),
+            ]
+        )
+    return salida.getvalue()
+
+
+def medir_fila_a_fila(db: Session, contenido: str, muestra: int) -> float:
+    """Segundos de crear `muestra` libros de uno en uno, resolviendo nombres."""
+    id_usuario = uuid.uuid4()
+    lector = csv.DictReader(io.StringIO(contenido))
+    inicio = time.perf_counter()
+    for i, fila in enumerate(lector):
+        if i >= muestra:
+            break
+        # La API obliga a buscar autor y editorial antes de crear el libro
+        autor = db.query(Autor).filter(Autor.nombre == fila["autor"]).first()
+        editorial = (
+            db.query(Editorial).filter(Editorial.nombre == fila["editorial"]).first()
+        )
+        if not autor or not editorial:
+            continue
+        try:
+            LibroCRUD(db).crear_libro(
+                titulo=fila["titulo"] + " (fila a fila)",
+                id_editorial=editorial.id,
+                id_autor=autor.id,
+                id_usuario_creacion=id_usuario,
+                numero_paginas=int(fila["numero_paginas"]),
+            )
+        except ValueError:
+            pass
+    return time.perf_counter() - inicio
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    muestra = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Se requiere BENCH_DATABASE_URL o DATABASE_URL")
+
+    print(f"Generando CSV de {filas} filas...")
+    contenido = generar_csv(filas)
+    print(f"Tamaño: {len(contenido.encode()) / 1024 / 1024:.1f} MB")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        transaccion = conn.begin()
+        # Los commit de los CRUD liberan savepoints; el rollback final lo deshace todo
+        db = Session(bind=conn, join_transaction_mode="create_savepoint")
+        try:
+            inicio = time.perf_counter()
+            progreso = ImportacionCRUD(db).importar_libros(
+                io.StringIO(contenido), uuid.uuid4()
+            )
+            segundos = time.perf_counter() - inicio
+            print(
+                f"\nImportación COPY: {segundos:.2f} s "
+                f"({progreso.filas_leidas / segundos:,.0f} filas/s)"
+            )
+            print(
+                f"  libros creados: {progreso.libros_creados}, "
+                f"existentes: {progreso.libros_existentes}, "
+                f"con error: {progreso.filas_con_error}"
+            )
+            print(
+                f"  autores creados: {progreso.autores_creados}, "
+                f"editoriales: {progreso.editoriales_creadas}, "
+                f"categorías: {progreso.categorias_creadas}"
+            )
+
+            if muestra:
+                segundos_fila = medir_fila_a_fila(db, contenido, muestra)
+                por_segundo = muestra / segundos_fila
+                print(
+                    f"\nFila a fila ({muestra} libros): {segundos_fila:.2f} s "
+                    f"({por_segundo:,.0f} filas/s); {filas} filas tardarían "
+                    f"~{filas / por_segundo:.0f} s"
+                )
+        finally:
+            db.close()
+            transaccion.rollback()
+
+
+if __name__ == "__main__":
+    main()
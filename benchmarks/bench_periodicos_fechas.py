@@ -0,0 +1,130 @@
+"""
+Benchmark de consultas por rango de fecha de periódicos: BRIN frente a B-tree.
+
+Crea dos tablas temporales iguales con N números de periódico insertados
+en orden aproximado de fecha (varios por día, con algo de desorden, como
+llegan en producción). Una tiene un índice BRIN sobre fecha_publicacion y
+la otra un B-tree. Compara el tamaño y el tiempo de construcción de cada
+índice y la mediana de los rangos habituales (un día, una semana, un mes,
+un año).
+
+Uso:
+    python -m benchmarks.bench_periodicos_fechas [filas]
+
+Requiere BENCH_DATABASE_URL (o DATABASE_URL) apuntando a un PostgreSQL.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from dotenv import load_dotenv
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+TABLAS = {"bench_periodicos_brin": "brin", "bench_periodicos_btree": "btree"}
+
+# Rangos sobre la mitad del periodo generado, para no favorecer los extremos
+RANGOS = {
+    "un_dia": "1 day",
+    "una_semana": "7 days",
+    "un_mes": "1 month",
+    "un_anio": "1 year",
+}
+
+CONSULTA = (
+    "SELECT id, titulo, fecha_publicacion FROM {tabla} "
+    "WHERE fecha_publicacion >= :inicio "
+    "AND fecha_publicacion < CAST(:inicio AS timestamptz) + CAST(:rango AS interval) "
+    "ORDER BY fecha_publicacion"
+)
+
+
+def preparar_tablas(conn, filas: int) -> dict:
+    """Crear, poblar e indexar las tablas; devuelve el tiempo de cada índice."""
+    construccion = {}
+    for tabla, metodo in TABLAS.items():
+        conn.execute(text(f"DROP TABLE IF EXISTS {tabla}"))
+        conn.execute(
+            text(
+                f"CREATE TEMP TABLE {tabla} (id bigint PRIMARY KEY, "
+                "titulo varchar(255), fecha_publicacion timestamptz NOT NULL)"
+            )
+        )
+        # ~30 números al día; el ruido de hasta 6 horas desordena un poco
+        conn.execute(
+            text(
+                f"INSERT INTO {tabla} (id, titulo, fecha_publicacion) "
+                "SELECT g, 'Edición ' || g, timestamptz '2000-01-01' "
+                "+ g * interval '48 minutes' + random() * interval '6 hours' "
+                "FROM generate_series(1, :filas) AS g"
+            ),
+            {"filas": filas},
+        )
+        inicio = time.perf_counter()
+        conn.execute(
+            text(
+                f"CREATE INDEX ix_{tabla}_fecha ON {tabla} "
+                f"USING {metodo} (fecha_publicacion)"
+            )
+        )
+        construccion[tabla] = (time.perf_counter() - inicio) * 1000
+        conn.execute(text(f"ANALYZE {tabla}"))
+    return construccion
+
+
+def medir(conn, sql: str, parametros: dict, repeticiones: int = 20) -> float:
+    """Mediana en milisegundos de varias ejecuciones de una consulta."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        conn.execute(text(sql), parametros).fetchall()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    url = os.getenv("BENCH_DATABASE_URL") or os.getenv("DATABASE_URL")
+    if not url:
+        raise ValueError("Se requiere BENCH_DATABASE_URL o DATABASE_URL")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        print(f"Preparando {filas} filas...")
+        construccion = preparar_tablas(conn, filas)
+        inicio = conn.execute(
+            text(
+                "SELECT min(fecha_publicacion) + (max(fecha_publicacion) "
+                "- min(fecha_publicacion)) / 2 FROM bench_periodicos_brin"
+            )
+        ).scalar_one()
+
+        print(f"{'tabla':<24}{'índice (KB)':>13}{'creación (ms)':>15}")
+        for tabla in TABLAS:
+            tam_indice = conn.execute(
+                text("SELECT pg_relation_size(:i)"), {"i": f"ix_{tabla}_fecha"}
+            ).scalar_one()
+            print(f"{tabla:<24}{tam_indice / 1024:>13.0f}{construccion[tabla]:>15.0f}")
+
+        print(f"\n{'rango':<14}{'filas':>9}{'brin (ms)':>12}{'btree (ms)':>12}")
+        for nombre, rango in RANGOS.items():
+            parametros = {"inicio": inicio, "rango": rango}
+            devueltas = len(
+                conn.execute(
+                    text(CONSULTA.format(tabla="bench_periodicos_brin")), parametros
+                ).fetchall()
+            )
+            brin_ms = medir(
+                conn, CONSULTA.format(tabla="bench_periodicos_brin"), parametros
+            )
+            btree_ms = medir(
+                conn, CONSULTA.format(tabla="bench_periodicos_btree"), parametros
+            )
+            print(f"{nombre:<14}{devueltas:>9}{brin_ms:>12.2f}{btree_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
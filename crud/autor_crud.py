@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from entities.autores import Autor
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class AutorCRUD:
@@ -50,6 +51,10 @@ class AutorCRUD:
         """Obtener un autor por ID."""
         return self.db.query(Autor).filter(Autor.id == autor_id).first()
 
+    def obtener_autores_por_ids(self, ids: List[UUID]) -> Dict[UUID, Autor]:
+        """Obtener varios autores por ID en una consulta."""
+        return obtener_por_ids(self.db, Autor, ids)
+
     def actualizar_autor(
         self, autor_id: UUID, id_usuario_edicion: UUID, **kwargs
     ) -> Optional[Autor]:
@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from entities.autores import Autor
+from entities.libros import Libro
+from entities.periodico import Periodico
+from entities.revista import Revista
+from sqlalchemy import cast, func, literal, select, tuple_, union_all
+from sqlalchemy.dialects.postgresql import REAL
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+from utils.paginacion import codificar_cursor, decodificar_cursor
+
+MODELOS_MATERIAL = {"libro": Libro, "revista": Revista, "periodico": Periodico}
+
+CONFIGURACION_TEXTO = "spanish"
+
+
+class BusquedaCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _consulta_material(self, tipo: str, modelo, consulta):
+        """SELECT de un tipo de material que coincide con la consulta."""
+        return (
+            select(
+                literal(tipo).label("tipo"),
+                modelo.id.label("id"),
+                modelo.titulo.label("titulo"),
+                Autor.nombre.label("autor"),
+                func.ts_rank(modelo.busqueda, consulta, type_=REAL).label("rango"),
+            )
+            .join(Autor, Autor.id == modelo.id_autor)
+            .where(modelo.busqueda.op("@@")(consulta))
+        )
+
+    def buscar(
+        self,
+        texto: str,
+        tipo: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Buscar materiales por título o nombre de autor.
+
+        Los resultados se ordenan por relevancia y se paginan por clave:
+        el cursor devuelto apunta a la última fila de la página.
+
+        Returns:
+            (resultados, cursor de la página siguiente o None)
+        """
+        if not texto or len(texto.strip()) == 0:
+            raise ValueError("El texto de búsqueda es obligatorio")
+        if len(texto) > 200:
+            raise ValueError("El texto de búsqueda no puede exceder 200 caracteres")
+        if tipo and tipo not in MODELOS_MATERIAL:
+            raise ValueError(
+                f"Tipo inválido. Debe ser uno de: {', '.join(MODELOS_MATERIAL)}"
+            )
+
+        consulta = func.websearch_to_tsquery(CONFIGURACION_TEXTO, texto.strip())
+        tipos = [tipo] if tipo else list(MODELOS_MATERIAL)
+        materiales = union_all(
+            *(self._consulta_material(t, MODELOS_MATERIAL[t], consulta) for t in tipos)
+        ).subquery("materiales")
+
+        orden = (materiales.c.rango, materiales.c.tipo, materiales.c.id)
+        sentencia = select(materiales)
+        if cursor:
+            ultimo = decodificar_cursor(cursor)
+            try:
+                valores = (
+                    cast(float(ultimo["rango"]), REAL),
+                    literal(str(ultimo["tipo"])),
+                    cast(str(UUID(ultimo["id"])), PG_UUID(as_uuid=True)),
+                )
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Cursor de paginación inválido")
+            sentencia = sentencia.where(tuple_(*orden) < tuple_(*valores))
+
+        # Se pide una fila de más para saber si hay página siguiente
+        filas = (
+            self.db.execute(
+                sentencia.order_by(*(columna.desc() for columna in orden)).limit(
+                    limit + 1
+                )
+            )
+            .mappings()
+            .all()
+        )
+
+        resultados = [dict(fila) for fila in filas[:limit]]
+        siguiente = None
+        if len(filas) > limit:
+            ultima = resultados[-1]
+            siguiente = codificar_cursor(
+                {
+                    "rango": ultima["rango"],
+                    "tipo": ultima["tipo"],
+                    "id": str(ultima["id"]),
+                }
+            )
+        return resultados, siguiente
@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from entities.categoria import Categoria
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class CategoriaCRUD:
@@ -46,6 +47,10 @@ class CategoriaCRUD:
         """Obtener una categoría por ID."""
         return self.db.query(Categoria).filter(Categoria.id == categoria_id).first()
 
+    def obtener_categorias_por_ids(self, ids: List[UUID]) -> Dict[UUID, Categoria]:
+        """Obtener varios categorías por ID en una consulta."""
+        return obtener_por_ids(self.db, Categoria, ids)
+
     def obtener_categoria_por_nombre(self, nombre: str) -> Optional[Categoria]:
         """Obtener una categoría por nombre."""
         return (
@@ -0,0 +1,124 @@
+from typing import Any, Dict, List
+from uuid import UUID
+
+from crud.disponibilidad_crud import DisponibilidadCRUD
+from database.eventos import Cambio, registrar
+from entities.autores import Autor
+from entities.disponibilidad import DisponibilidadMaterial
+from entities.editoriales import Editorial
+from entities.items import Item
+from entities.libros import Libro
+from entities.periodico import Periodico
+from entities.revista import Revista
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+MODELOS_DEDUPLICABLES = {"libro": Libro, "autor": Autor, "editorial": Editorial}
+
+# Tablas cuya FK apunta al registro fusionado: tipo -> [(modelo, columna)]
+REFERENCIAS = {
+    "libro": [(Item, "id_libro")],
+    "autor": [(Libro, "id_autor"), (Revista, "id_autor"), (Periodico, "id_autor")],
+    "editorial": [
+        (Libro, "id_editorial"),
+        (Revista, "id_editorial"),
+        (Periodico, "id_editorial"),
+    ],
+}
+
+
+class DeduplicacionCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def fusionar(
+        self,
+        tipo: str,
+        id_destino: UUID,
+        ids_origen: List[UUID],
+        id_usuario_edicion: UUID,
+    ) -> Dict[str, Any]:
+        """
+        Fusionar registros duplicados en uno.
+
+        Reasigna en bloque todas las filas que apuntan a los registros de
+        origen (items de un libro; libros, revistas y periódicos de un autor
+        o una editorial) al registro destino y elimina los de origen, todo
+        en una transacción.
+
+        Returns:
+            {"fusionados": registros eliminados, "reasignados": {tabla: filas}}
+        """
+        modelo = MODELOS_DEDUPLICABLES.get(tipo)
+        if not modelo:
+            raise ValueError(
+                f"Tipo inválido. Debe ser uno de: {', '.join(MODELOS_DEDUPLICABLES)}"
+            )
+        origenes = list(dict.fromkeys(ids_origen))
+        if not origenes:
+            raise ValueError("Debe indicar al menos un registro de origen")
+        if id_destino in origenes:
+            raise ValueError("El registro destino no puede estar entre los de origen")
+        if not id_usuario_edicion:
+            raise ValueError("El id_usuario_edicion es obligatorio")
+
+        existentes = set(
+            self.db.scalars(
+                select(modelo.id).where(modelo.id.in_([id_destino, *origenes]))
+            )
+        )
+        if id_destino not in existentes:
+            raise ValueError("El registro destino no existe")
+        faltantes = [str(i) for i in origenes if i not in existentes]
+        if faltantes:
+            raise ValueError(f"No existen los registros: {', '.join(faltantes)}")
+
+        try:
+            reasignados = {}
+            cambios = []
+            for referencia, columna in REFERENCIAS[tipo]:
+                ids = self.db.scalars(
+                    update(referencia)
+                    .where(getattr(referencia, columna).in_(origenes))
+                    .values(
+                        {columna: id_destino, "id_usuario_edicion": id_usuario_edicion}
+                    )
+                    .returning(referencia.id)
+                ).all()
+                reasignados[referencia.__tablename__] = len(ids)
+                cambios.extend(
+                    Cambio(
+                        "actualizar", referencia.__tablename__, i, {columna: id_destino}
+                    )
+                    for i in ids
+                )
+
+            if tipo == "libro":
+                self._fusionar_disponibilidad(id_destino, origenes)
+
+            self.db.execute(delete(modelo).where(modelo.id.in_(origenes)))
+            cambios.extend(
+                Cambio("eliminar", modelo.__tablename__, i) for i in origenes
+            )
+            registrar(self.db, cambios)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return {"fusionados": len(origenes), "reasignados": reasignados}
+
+    def _fusionar_disponibilidad(self, id_destino: UUID, origenes: List[UUID]) -> None:
+        """Sumar los contadores de los libros de origen al destino."""
+        tabla = DisponibilidadMaterial
+        total, disponibles, en_prestamo = self.db.execute(
+            select(
+                func.coalesce(func.sum(tabla.total), 0),
+                func.coalesce(func.sum(tabla.disponibles), 0),
+                func.coalesce(func.sum(tabla.en_prestamo), 0),
+            ).where(tabla.id_material.in_(origenes))
+        ).one()
+        DisponibilidadCRUD(self.db).ajustar(
+            "libro", id_destino, int(total), int(disponibles), int(en_prestamo)
+        )
+        self.db.execute(delete(tabla).where(tabla.id_material.in_(origenes)))
@@ -0,0 +1,113 @@
+from typing import Dict, Optional, Tuple
+from uuid import UUID
+
+from entities.disponibilidad import DisponibilidadMaterial
+from entities.items import Item
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+
+def material_de_item(item: Item) -> Tuple[str, UUID]:
+    """Tipo e id del material de un item (válido también antes del flush)."""
+    if item.id_libro:
+        return "libro", item.id_libro
+    if item.id_revista:
+        return "revista", item.id_revista
+    return "periodico", item.id_periodico
+
+
+class DisponibilidadCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ajustar(
+        self,
+        tipo: str,
+        id_material: UUID,
+        total: int = 0,
+        disponibles: int = 0,
+        en_prestamo: int = 0,
+    ) -> None:
+        """
+        Sumar los deltas a los contadores de un material.
+
+        No confirma: se ejecuta dentro de la transacción del llamador, de
+        modo que el contador y el cambio que lo provoca se confirman juntos.
+        El UPSERT incrementa sobre la fila bloqueada, sin leer antes.
+        """
+        if not (total or disponibles or en_prestamo):
+            return
+        tabla = DisponibilidadMaterial.__table__
+        sentencia = insert(tabla).values(
+            id_material=id_material,
+            tipo=tipo,
+            total=total,
+            disponibles=disponibles,
+            en_prestamo=en_prestamo,
+        )
+        self.db.execute(
+            sentencia.on_conflict_do_update(
+                index_elements=[tabla.c.id_material],
+                set_={
+                    "total": tabla.c.total + total,
+                    "disponibles": tabla.c.disponibles + disponibles,
+                    "en_prestamo": tabla.c.en_prestamo + en_prestamo,
+                    "fecha_actualizacion": func.now(),
+                },
+            )
+        )
+
+    def ajustar_lote(
+        self, deltas: Dict[Tuple[str, UUID], Tuple[int, int, int]]
+    ) -> None:
+        """
+        Sumar deltas (total, disponibles, en_prestamo) a varios materiales
+        con un único UPSERT de varias filas.
+
+        Args:
+            deltas: (tipo, id_material) -> (total, disponibles, en_prestamo)
+        """
+        # Filas ordenadas por id para que dos lotes concurrentes bloqueen los
+        # contadores en el mismo orden
+        filas = [
+            {
+                "id_material": id_material,
+                "tipo": tipo,
+                "total": total,
+                "disponibles": disponibles,
+                "en_prestamo": en_prestamo,
+            }
+            for (tipo, id_material), (total, disponibles, en_prestamo) in sorted(
+                deltas.items(), key=lambda d: str(d[0][1])
+            )
+            if total or disponibles or en_prestamo
+        ]
+        if not filas:
+            return
+        tabla = DisponibilidadMaterial.__table__
+        sentencia = insert(tabla).values(filas)
+        self.db.execute(
+            sentencia.on_conflict_do_update(
+                index_elements=[tabla.c.id_material],
+                set_={
+                    "total": tabla.c.total + sentencia.excluded.total,
+                    "disponibles": tabla.c.disponibles + sentencia.excluded.disponibles,
+                    "en_prestamo": tabla.c.en_prestamo + sentencia.excluded.en_prestamo,
+                    "fecha_actualizacion": func.now(),
+                },
+            )
+        )
+
+    def ajustar_item(
+        self, item: Item, total: int = 0, disponibles: int = 0, en_prestamo: int = 0
+    ) -> None:
+        """Ajustar los contadores del material al que pertenece un item."""
+        tipo, id_material = material_de_item(item)
+        self.ajustar(tipo, id_material, total, disponibles, en_prestamo)
+
+    def obtener_disponibilidad(
+        self, id_material: UUID
+    ) -> Optional[DisponibilidadMaterial]:
+        """Obtener los contadores de un material (búsqueda por clave primaria)."""
+        return self.db.get(DisponibilidadMaterial, id_material)
@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from entities.editoriales import Editorial
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class EditorialCRUD:
@@ -48,6 +49,10 @@ class EditorialCRUD:
         """Obtener una editorial por ID."""
         return self.db.query(Editorial).filter(Editorial.id == editorial_id).first()
 
+    def obtener_editoriales_por_ids(self, ids: List[UUID]) -> Dict[UUID, Editorial]:
+        """Obtener varios editoriales por ID en una consulta."""
+        return obtener_por_ids(self.db, Editorial, ids)
+
     def actualizar_editorial(
         self, editorial_id: UUID, id_usuario_edicion: UUID, **kwargs
     ) -> Optional[Editorial]:
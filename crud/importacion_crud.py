@@ -0,0 +1,370 @@
+"""
+Importación del catálogo de libros desde CSV.
+
+El archivo se lee en streaming. Autores, editoriales y categorías se
+resuelven por nombre (sin distinguir mayúsculas ni espacios repetidos)
+contra mapas en memoria cargados con una consulta por tabla; los que no
+existen reciben un id nuevo y se insertan en bloque al final. Las filas
+válidas se copian con COPY a una tabla temporal y se fusionan con libros en
+un único INSERT ... SELECT que omite los ISBN ya existentes. Todo ocurre en
+una transacción: si algo falla no queda nada a medias.
+"""
+
+import csv
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from uuid import UUID
+
+from database.eventos import Cambio, registrar
+from entities.autores import Autor
+from entities.categoria import Categoria
+from entities.editoriales import Editorial
+from entities.libros import MAX_PAGINAS
+from sqlalchemy import String, bindparam, insert, select, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+from utils.copia import copiar_filas
+from utils.isbn import a_isbn13
+
+COLUMNAS_OBLIGATORIAS = ("titulo", "autor", "editorial")
+NACIONALIDAD_DESCONOCIDA = "Desconocida"
+MAX_ERRORES = 100
+MAX_IMPORTACIONES = 100
+LOTE_ENTIDADES = 1000
+
+TABLA_STAGING = "importacion_libros"
+COLUMNAS_STAGING = (
+    "linea",
+    "id",
+    "titulo",
+    "isbn",
+    "isbn13",
+    "numero_paginas",
+    "id_autor",
+    "id_editorial",
+    "id_categoria",
+)
+
+CREAR_STAGING = f"""
+CREATE TEMP TABLE {TABLA_STAGING} (
+    linea integer NOT NULL,
+    id uuid NOT NULL,
+    titulo varchar(255) NOT NULL,
+    isbn varchar(20),
+    isbn13 char(13),
+    numero_paginas integer,
+    id_autor uuid NOT NULL,
+    id_editorial uuid NOT NULL,
+    id_categoria uuid
+) ON COMMIT DROP
+"""
+
+# El orden por línea hace que, entre filas con el mismo ISBN, gane la primera
+FUSIONAR_LIBROS = f"""
+INSERT INTO libros (
+    id, titulo, isbn, isbn13, numero_paginas, id_autor, id_editorial,
+    id_categoria, id_usuario_creacion, id_usuario_edicion
+)
+SELECT id, titulo, isbn, isbn13, numero_paginas, id_autor, id_editorial,
+       id_categoria, :id_usuario, :id_usuario
+FROM {TABLA_STAGING}
+ORDER BY linea
+ON CONFLICT (isbn13) DO NOTHING
+RETURNING id, titulo, isbn13
+"""
+
+
+@dataclass
+class ProgresoImportacion:
+    """Estado de una importación, consultable mientras se ejecuta."""
+
+    id: str
+    estado: str = "pendiente"  # pendiente, procesando, completada o fallida
+    fase: Optional[str] = None  # leyendo, creando_entidades o fusionando
+    filas_leidas: int = 0
+    filas_validas: int = 0
+    filas_con_error: int = 0
+    libros_creados: int = 0
+    libros_existentes: int = 0
+    autores_creados: int = 0
+    editoriales_creadas: int = 0
+    categorias_creadas: int = 0
+    errores: List[Dict[str, Any]] = field(default_factory=list)
+    mensaje: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+
+    def agregar_error(self, linea: int, error: str) -> None:
+        self.filas_con_error += 1
+        if len(self.errores) < MAX_ERRORES:
+            self.errores.append({"linea": linea, "error": error})
+
+
+# Importaciones recientes del proceso, de la más antigua a la más nueva
+_importaciones: "OrderedDict[str, ProgresoImportacion]" = OrderedDict()
+_lock = Lock()
+
+
+def nueva_importacion() -> ProgresoImportacion:
+    """Registrar una importación pendiente para poder consultar su progreso."""
+    progreso = ProgresoImportacion(id=str(uuid.uuid4()))
+    with _lock:
+        _importaciones[progreso.id] = progreso
+        while len(_importaciones) > MAX_IMPORTACIONES:
+            _importaciones.popitem(last=False)
+    return progreso
+
+
+def obtener_importacion(id_importacion: str) -> Optional[Dict[str, Any]]:
+    """Copia del progreso de una importación, o None si no existe."""
+    with _lock:
+        progreso = _importaciones.get(id_importacion)
+        return asdict(progreso) if progreso else None
+
+
+def _clave(nombre: str) -> str:
+    return " ".join(nombre.split()).casefold()
+
+
+class _MapaNombres:
+    """Nombre normalizado -> id de los autores, editoriales o categorías."""
+
+    def __init__(self, db: Session, modelo):
+        self.modelo = modelo
+        self.ids: Dict[str, UUID] = {
+            _clave(nombre): id_registro
+            for id_registro, nombre in db.execute(select(modelo.id, modelo.nombre))
+        }
+        self.nuevos: Dict[str, Dict[str, Any]] = {}
+
+    def resolver(self, nombre: str, **extra) -> UUID:
+        """Id del registro con ese nombre; si no existe se reserva uno nuevo."""
+        clave = _clave(nombre)
+        id_registro = self.ids.get(clave)
+        if id_registro is None:
+            id_registro = uuid.uuid4()
+            self.ids[clave] = id_registro
+            self.nuevos[clave] = {
+                "id": id_registro,
+                "nombre": " ".join(nombre.split()),
+                **extra,
+            }
+        return id_registro
+
+    def insertar_nuevos(self, db: Session, id_usuario: UUID) -> List[Cambio]:
+        """Insertar en bloque los registros reservados por `resolver`."""
+        filas = [
+            {
+                **fila,
+                "id_usuario_creacion": id_usuario,
+                "id_usuario_edicion": id_usuario,
+            }
+            for fila in self.nuevos.values()
+        ]
+        for inicio in range(0, len(filas), LOTE_ENTIDADES):
+            db.execute(insert(self.modelo), filas[inicio : inicio + LOTE_ENTIDADES])
+        tabla = self.modelo.__tablename__
+        return [
+            Cambio("crear", tabla, fila["id"], {"nombre": fila["nombre"]})
+            for fila in filas
+        ]
+
+
+def _texto(fila: Dict[str, Optional[str]], columna: str) -> Optional[str]:
+    valor = (fila.get(columna) or "").strip()
+    return valor or None
+
+
+def _validar_nombre(valor: Optional[str], campo: str, obligatorio: bool) -> None:
+    if not valor:
+        if obligatorio:
+            raise ValueError(f"El campo {campo} es obligatorio")
+        return
+    if len(valor) > 100:
+        raise ValueError(f"El campo {campo} no puede exceder 100 caracteres")
+
+
+class ImportacionCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def importar_libros(
+        self,
+        archivo: TextIO,
+        id_usuario_creacion: UUID,
+        progreso: Optional[ProgresoImportacion] = None,
+    ) -> ProgresoImportacion:
+        """
+        Importar libros desde un CSV con cabecera.
+
+        Columnas obligatorias: titulo, autor, editorial. Opcionales: isbn,
+        numero_paginas, categoria y nacionalidad (la del autor si hay que
+        crearlo). El separador puede ser coma, punto y coma o tabulador.
+
+        Las filas inválidas se omiten y se informan en `progreso.errores`
+        (como mucho MAX_ERRORES); los libros cuyo ISBN ya existe se cuentan
+        en `libros_existentes` sin modificarlos.
+
+        Raises:
+            ValueError: Si falta el usuario o alguna columna obligatoria
+        """
+        if not id_usuario_creacion:
+            raise ValueError("El id_usuario_creacion es obligatorio")
+        progreso = progreso or ProgresoImportacion(id=str(uuid.uuid4()))
+        progreso.estado = "procesando"
+        progreso.fecha_inicio = datetime.now(timezone.utc)
+
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        lector = csv.DictReader(archivo, dialect=dialecto)
+        cabecera = {(c or "").strip().lower() for c in lector.fieldnames or []}
+        faltantes = [c for c in COLUMNAS_OBLIGATORIAS if c not in cabecera]
+        if faltantes:
+            raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+        lector.fieldnames = [(c or "").strip().lower() for c in lector.fieldnames]
+
+        autores = _MapaNombres(self.db, Autor)
+        editoriales = _MapaNombres(self.db, Editorial)
+        categorias = _MapaNombres(self.db, Categoria)
+
+        try:
+            progreso.fase = "leyendo"
+            self.db.execute(text(CREAR_STAGING))
+            copiar_filas(
+                self.db,
+                TABLA_STAGING,
+                COLUMNAS_STAGING,
+                self._filas_staging(lector, autores, editoriales, categorias, progreso),
+            )
+
+            progreso.fase = "creando_entidades"
+            cambios = []
+            for mapa in (autores, editoriales, categorias):
+                cambios.extend(mapa.insertar_nuevos(self.db, id_usuario_creacion))
+            progreso.autores_creados = len(autores.nuevos)
+            progreso.editoriales_creadas = len(editoriales.nuevos)
+            progreso.categorias_creadas = len(categorias.nuevos)
+
+            progreso.fase = "fusionando"
+            fusionar = (
+                text(FUSIONAR_LIBROS)
+                .bindparams(
+                    bindparam(
+                        "id_usuario",
+                        id_usuario_creacion,
+                        type_=PG_UUID(as_uuid=True),
+                    )
+                )
+                .columns(id=PG_UUID(as_uuid=True), titulo=String, isbn13=String)
+            )
+            creados = self.db.execute(fusionar).all()
+            cambios.extend(
+                Cambio(
+                    "crear", "libros", id_libro, {"titulo": titulo, "isbn13": isbn13}
+                )
+                for id_libro, titulo, isbn13 in creados
+            )
+            registrar(self.db, cambios)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        progreso.libros_creados = len(creados)
+        progreso.libros_existentes = progreso.filas_validas - len(creados)
+        progreso.estado = "completada"
+        progreso.fase = None
+        progreso.fecha_fin = datetime.now(timezone.utc)
+        return progreso
+
+    def _filas_staging(
+        self,
+        lector: csv.DictReader,
+        autores: _MapaNombres,
+        editoriales: _MapaNombres,
+        categorias: _MapaNombres,
+        progreso: ProgresoImportacion,
+    ) -> Iterator[Tuple]:
+        """Validar cada fila del CSV y convertirla en una fila de staging."""
+        for fila in lector:
+            progreso.filas_leidas += 1
+            try:
+                datos = self._validar_fila(fila)
+            except ValueError as e:
+                progreso.agregar_error(lector.line_num, str(e))
+                continue
+
+            id_autor = autores.resolver(
+                datos["autor"],
+                nacionalidad=datos["nacionalidad"] or NACIONALIDAD_DESCONOCIDA,
+            )
+            id_editorial = editoriales.resolver(datos["editorial"])
+            id_categoria = (
+                categorias.resolver(datos["categoria"]) if datos["categoria"] else None
+            )
+            progreso.filas_validas += 1
+            yield (
+                lector.line_num,
+                uuid.uuid4(),
+                datos["titulo"],
+                datos["isbn"],
+                datos["isbn13"],
+                datos["numero_paginas"],
+                id_autor,
+                id_editorial,
+                id_categoria,
+            )
+
+    def _validar_fila(self, fila: Dict[str, Optional[str]]) -> Dict[str, Any]:
+        """Las mismas validaciones que LibroCRUD.crear_libro, sin consultas."""
+        titulo = _texto(fila, "titulo")
+        if not titulo:
+            raise ValueError("El título es obligatorio")
+        if len(titulo) > 255:
+            raise ValueError("El título no puede exceder 255 caracteres")
+
+        autor = _texto(fila, "autor")
+        editorial = _texto(fila, "editorial")
+        categoria = _texto(fila, "categoria")
+        _validar_nombre(autor, "autor", obligatorio=True)
+        _validar_nombre(editorial, "editorial", obligatorio=True)
+        _validar_nombre(categoria, "categoria", obligatorio=False)
+        nacionalidad = _texto(fila, "nacionalidad")
+        if nacionalidad and len(nacionalidad) > 50:
+            raise ValueError("La nacionalidad no puede exceder 50 caracteres")
+
+        isbn = _texto(fila, "isbn")
+        isbn13 = None
+        if isbn:
+            if len(isbn) > 20:
+                raise ValueError("El ISBN no puede exceder 20 caracteres")
+            isbn13 = a_isbn13(isbn)
+
+        numero_paginas = _texto(fila, "numero_paginas")
+        if numero_paginas is not None:
+            if not numero_paginas.isdigit():
+                raise ValueError("El número de páginas debe ser un entero")
+            numero_paginas = int(numero_paginas)
+            if not 1 <= numero_paginas <= MAX_PAGINAS:
+                raise ValueError(
+                    f"El número de páginas debe estar entre 1 y {MAX_PAGINAS}"
+                )
+
+        return {
+            "titulo": titulo,
+            "autor": autor,
+            "editorial": editorial,
+            "categoria": categoria,
+            "nacionalidad": nacionalidad,
+            "isbn": isbn,
+            "isbn13": isbn13,
+            "numero_paginas": numero_paginas,
+        }
@@ -0,0 +1,220 @@
+"""
+Conciliación de inventario: códigos escaneados frente a una ubicación.
+
+Los códigos se copian con COPY a una tabla temporal (en bloques, sin
+cargarlos todos en memoria) y se comparan con items mediante joins en la
+base de datos. De Python solo salen los totales y, por categoría, como
+mucho `limite` filas de detalle.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from database.eventos import Cambio, registrar
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+from utils.copia import copiar_filas
+from utils.ubicacion import ruta_de_ubicacion
+
+MAX_LIMITE_DETALLE = 10000
+
+CREAR_ESCANEOS = """
+CREATE TEMP TABLE inventario_escaneos (
+    codigo_barras varchar(50) NOT NULL
+) ON COMMIT DROP
+"""
+
+# Un código escaneado varias veces cuenta una sola vez
+CREAR_CODIGOS = """
+CREATE TEMP TABLE inventario_codigos ON COMMIT DROP AS
+SELECT DISTINCT codigo_barras FROM inventario_escaneos
+"""
+
+CONTAR_ESCANEADOS = """
+SELECT
+    count(*) FILTER (WHERE i.id IS NULL) AS inesperados,
+    count(*) FILTER (WHERE i.ubicacion_ruta = :ruta) AS correctos,
+    count(*) FILTER (
+        WHERE i.id IS NOT NULL AND i.ubicacion_ruta IS DISTINCT FROM :ruta
+    ) AS mal_ubicados
+FROM inventario_codigos e
+LEFT JOIN items i ON i.codigo_barras = e.codigo_barras
+"""
+
+# Los items no disponibles (prestados, en reparación) no se esperan en el estante
+CONTAR_FALTANTES = """
+SELECT
+    count(*) FILTER (WHERE i.disponible IS NOT FALSE) AS faltantes,
+    count(*) FILTER (WHERE i.disponible IS FALSE) AS no_disponibles
+FROM items i
+WHERE i.ubicacion_ruta = :ruta
+  AND NOT EXISTS (
+      SELECT 1 FROM inventario_codigos e WHERE e.codigo_barras = i.codigo_barras
+  )
+"""
+
+DETALLE_FALTANTES = """
+SELECT i.id, i.codigo_barras, i.ubicacion
+FROM items i
+WHERE i.ubicacion_ruta = :ruta
+  AND i.disponible IS NOT FALSE
+  AND NOT EXISTS (
+      SELECT 1 FROM inventario_codigos e WHERE e.codigo_barras = i.codigo_barras
+  )
+ORDER BY i.codigo_barras NULLS LAST, i.id
+LIMIT :limite
+"""
+
+DETALLE_MAL_UBICADOS = """
+SELECT i.id, i.codigo_barras, i.ubicacion
+FROM inventario_codigos e
+JOIN items i ON i.codigo_barras = e.codigo_barras
+WHERE i.ubicacion_ruta IS DISTINCT FROM :ruta
+ORDER BY i.codigo_barras
+LIMIT :limite
+"""
+
+DETALLE_INESPERADOS = """
+SELECT NULL AS id, e.codigo_barras, NULL AS ubicacion
+FROM inventario_codigos e
+WHERE NOT EXISTS (SELECT 1 FROM items i WHERE i.codigo_barras = e.codigo_barras)
+ORDER BY e.codigo_barras
+LIMIT :limite
+"""
+
+CORREGIR_UBICACIONES = """
+UPDATE items i
+SET ubicacion = :ubicacion,
+    ubicacion_ruta = :ruta,
+    id_usuario_edicion = :id_usuario,
+    fecha_actualizacion = now()
+FROM inventario_codigos e
+WHERE i.codigo_barras = e.codigo_barras
+  AND i.ubicacion_ruta IS DISTINCT FROM :ruta
+RETURNING i.id
+"""
+
+
+def _codigos(lineas: Iterable[str]) -> Iterator[tuple]:
+    """Un código por línea; se ignoran las vacías y el resto de columnas."""
+    for linea in lineas:
+        codigo = linea.split(",", 1)[0].strip()
+        if codigo:
+            if len(codigo) > 50:
+                raise ValueError(
+                    f"El código de barras '{codigo[:50]}...' excede 50 caracteres"
+                )
+            yield (codigo,)
+
+
+class InventarioCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def conciliar(
+        self,
+        ubicacion: str,
+        lineas: Iterable[str],
+        aplicar: bool = False,
+        id_usuario_edicion: Optional[UUID] = None,
+        limite: int = 1000,
+    ) -> Dict[str, Any]:
+        """
+        Comparar los códigos escaneados en una ubicación con los items que
+        la base de datos tiene registrados en ella.
+
+        Las ubicaciones se comparan por su ruta normalizada (ubicacion_ruta,
+        indexada), así que "Piso 2 / Estante 4" y "piso 2/estante 4" son la
+        misma ubicación.
+
+        - faltantes: items disponibles de la ubicación que no se escanearon
+        - mal_ubicados: escaneados aquí pero registrados en otra ubicación
+        - inesperados: códigos que no corresponden a ningún item
+
+        Con `aplicar` los items mal ubicados pasan a `ubicacion` en un único
+        UPDATE; los faltantes no se modifican.
+
+        Args:
+            lineas: Líneas del archivo de escaneos (un código por línea)
+            limite: Filas de detalle devueltas como máximo por categoría
+        """
+        ubicacion = (ubicacion or "").strip()
+        if not ubicacion:
+            raise ValueError("La ubicación es obligatoria")
+        if len(ubicacion) > 100:
+            raise ValueError("La ubicación no puede exceder 100 caracteres")
+        ruta = ruta_de_ubicacion(ubicacion)
+        if not ruta:
+            raise ValueError("La ubicación no es válida")
+        if aplicar and not id_usuario_edicion:
+            raise ValueError("El id_usuario_edicion es obligatorio para aplicar")
+        if not 0 <= limite <= MAX_LIMITE_DETALLE:
+            raise ValueError(f"El límite debe estar entre 0 y {MAX_LIMITE_DETALLE}")
+
+        try:
+            self.db.execute(text(CREAR_ESCANEOS))
+            escaneados = copiar_filas(
+                self.db, "inventario_escaneos", ["codigo_barras"], _codigos(lineas)
+            )
+            self.db.execute(text(CREAR_CODIGOS))
+            self.db.execute(
+                text("ALTER TABLE inventario_codigos ADD PRIMARY KEY (codigo_barras)")
+            )
+            self.db.execute(text("ANALYZE inventario_codigos"))
+
+            parametros = {"ruta": ruta, "limite": limite}
+            conteo = self.db.execute(text(CONTAR_ESCANEADOS), parametros).one()
+            ausentes = self.db.execute(text(CONTAR_FALTANTES), parametros).one()
+            resultado = {
+                "ubicacion": ubicacion,
+                "ruta": ruta,
+                "escaneados": escaneados,
+                "codigos_distintos": conteo.inesperados
+                + conteo.correctos
+                + conteo.mal_ubicados,
+                "correctos": conteo.correctos,
+                "faltantes": ausentes.faltantes,
+                "no_disponibles": ausentes.no_disponibles,
+                "mal_ubicados": conteo.mal_ubicados,
+                "inesperados": conteo.inesperados,
+                "corregidos": 0,
+                "detalle_faltantes": self._detalle(DETALLE_FALTANTES, parametros),
+                "detalle_mal_ubicados": self._detalle(DETALLE_MAL_UBICADOS, parametros),
+                "detalle_inesperados": self._detalle(DETALLE_INESPERADOS, parametros),
+            }
+
+            if aplicar and conteo.mal_ubicados:
+                corregir = (
+                    text(CORREGIR_UBICACIONES)
+                    .bindparams(
+                        bindparam(
+                            "id_usuario",
+                            id_usuario_edicion,
+                            type_=PG_UUID(as_uuid=True),
+                        )
+                    )
+                    .columns(id=PG_UUID(as_uuid=True))
+                )
+                datos = {"ubicacion": ubicacion, "ubicacion_ruta": ruta}
+                ids = self.db.scalars(
+                    corregir, {"ubicacion": ubicacion, "ruta": ruta}
+                ).all()
+                registrar(
+                    self.db, [Cambio("actualizar", "items", i, datos) for i in ids]
+                )
+                resultado["corregidos"] = len(ids)
+                self.db.commit()
+            else:
+                # Solo lectura: descartar las tablas temporales
+                self.db.rollback()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return resultado
+
+    def _detalle(self, sql: str, parametros: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if not parametros["limite"]:
+            return []
+        return [dict(fila._mapping) for fila in self.db.execute(text(sql), parametros)]
@@ -1,11 +1,43 @@
-from typing import List, Optional
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
-from entities.items import Item
+from crud.disponibilidad_crud import DisponibilidadCRUD, material_de_item
+from database.eventos import Cambio, registrar
+from entities.items import ESTADOS_FISICOS, Item
 from entities.libros import Libro
 from entities.periodico import Periodico
 from entities.revista import Revista
+from sqlalchemy import func, insert, select, text, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, joinedload
+from utils.codigo_barras import SECUENCIA, formatear_codigo, numero_de_codigo
+from utils.consultas import igual_a_alguno, obtener_por_ids
+from utils.filtro_bloom import filtro_codigos_barras
+from utils.paginacion import codificar_cursor, decodificar_cursor
+from utils.ubicacion import ruta_de_ubicacion
+
+
+TIPOS_ITEM = ("libro", "revista", "periodico")
+
+RELACIONES_POR_TIPO = {
+    "libro": Item.libro,
+    "revista": Item.revista,
+    "periodico": Item.periodico,
+}
+
+# Columna de Item -> (tipo, modelo del material)
+MATERIALES_POR_COLUMNA = {
+    "id_libro": ("libro", Libro),
+    "id_revista": ("revista", Revista),
+    "id_periodico": ("periodico", Periodico),
+}
+
+MAX_ITEMS_LOTE = 1000
+MAX_CODIGOS_RESERVA = 10000
+
+# Campos que se pueden cambiar en bloque con actualizar_items
+CAMPOS_ACTUALIZACION_LOTE = ("ubicacion", "estado_fisico", "observaciones")
 
 
 class ItemCRUD:
@@ -51,36 +83,36 @@ class ItemCRUD:
             if not periodico:
                 raise ValueError("El periódico especificado no existe")
 
-        # Validar código de barras único si se proporciona
+        # Validar código de barras único si se proporciona; si no, se genera
+        # uno de la secuencia, que no necesita comprobar la unicidad
         if codigo_barras:
             if len(codigo_barras) > 50:
                 raise ValueError("El código de barras no puede exceder 50 caracteres")
-            existing = (
-                self.db.query(Item)
-                .filter(Item.codigo_barras == codigo_barras.strip())
-                .first()
-            )
-            if existing:
-                raise ValueError("Ya existe un item con ese código de barras")
             codigo_barras = codigo_barras.strip()
+            self._validar_codigo_reservado(codigo_barras)
+            if self._codigo_barras_existe(codigo_barras):
+                raise ValueError("Ya existe un item con ese código de barras")
 
         # Validar estado_fisico
-        estados_validos = ["bueno", "regular", "malo", "reparacion"]
-        if estado_fisico not in estados_validos:
+        if estado_fisico not in ESTADOS_FISICOS:
             raise ValueError(
-                f"El estado físico debe ser uno de: {', '.join(estados_validos)}"
+                f"El estado físico debe ser uno de: {', '.join(ESTADOS_FISICOS)}"
             )
 
         # Validar ubicacion
         if ubicacion and len(ubicacion) > 100:
             raise ValueError("La ubicación no puede exceder 100 caracteres")
 
+        if not codigo_barras:
+            codigo_barras = self.reservar_codigos_barras(1)[0]
+
         item = Item(
             id_libro=id_libro,
             id_revista=id_revista,
             id_periodico=id_periodico,
             codigo_barras=codigo_barras,
             ubicacion=ubicacion.strip() if ubicacion else None,
+            ubicacion_ruta=ruta_de_ubicacion(ubicacion),
             estado_fisico=estado_fisico,
             disponible=disponible,
             observaciones=observaciones,
@@ -88,10 +120,262 @@ class ItemCRUD:
             id_usuario_edicion=id_usuario_creacion,
         )
         self.db.add(item)
-        self.db.commit()
+        DisponibilidadCRUD(self.db).ajustar_item(
+            item, total=1, disponibles=1 if disponible else 0
+        )
+        self._confirmar()
         self.db.refresh(item)
         return item
 
+    def reservar_codigos_barras(self, cantidad: int) -> List[str]:
+        """
+        Reservar `cantidad` códigos de barras consecutivos de la secuencia.
+
+        Los códigos reservados no se repiten nunca (aunque la transacción se
+        revierta) y pueden imprimirse antes de crear los items.
+        """
+        if not 1 <= cantidad <= MAX_CODIGOS_RESERVA:
+            raise ValueError(
+                f"La cantidad de códigos debe estar entre 1 y {MAX_CODIGOS_RESERVA}"
+            )
+        primero = self.db.scalar(select(func.reservar_codigos_barras(cantidad)))
+        return [formatear_codigo(n) for n in range(primero, primero + cantidad)]
+
+    def _ultimo_codigo_reservado(self) -> int:
+        """Último número entregado por la secuencia de códigos (0 si ninguno)."""
+        return self.db.scalar(
+            text(
+                f"SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM {SECUENCIA}"
+            )
+        )
+
+    def _validar_codigo_reservado(
+        self, codigo_barras: str, ultimo: Optional[int] = None
+    ) -> None:
+        """
+        Un código manual con el formato generado solo es válido si ya salió
+        de la secuencia; si no, chocaría con un código generado más adelante.
+        """
+        numero = numero_de_codigo(codigo_barras)
+        if numero is None:
+            return
+        if ultimo is None:
+            ultimo = self._ultimo_codigo_reservado()
+        if numero > ultimo:
+            raise ValueError(
+                "El código de barras pertenece al rango de códigos generados y "
+                "no ha sido reservado"
+            )
+
+    def _codigo_barras_existe(
+        self, codigo_barras: str, excluir_id: Optional[UUID] = None
+    ) -> bool:
+        # Si el filtro de Bloom descarta el código no hace falta consultar
+        if not filtro_codigos_barras.puede_contener(codigo_barras):
+            return False
+        query = self.db.query(Item.id).filter(Item.codigo_barras == codigo_barras)
+        if excluir_id:
+            query = query.filter(Item.id != excluir_id)
+        return query.first() is not None
+
+    def _confirmar(self) -> None:
+        """Commit; un código duplicado que escapó al filtro lo frena el índice único."""
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if "codigo_barras" in str(e.orig):
+                raise ValueError("Ya existe un item con ese código de barras")
+            raise
+
+    def _validar_fila_lote(self, datos: Dict[str, Any]) -> Dict[str, Any]:
+        """Validaciones de una fila del lote que no consultan la base de datos."""
+        materiales = [c for c in MATERIALES_POR_COLUMNA if datos.get(c)]
+        if len(materiales) != 1:
+            raise ValueError(
+                "Debe especificar exactamente uno: id_libro, id_revista o id_periodico"
+            )
+        codigo_barras = (datos.get("codigo_barras") or "").strip() or None
+        if codigo_barras and len(codigo_barras) > 50:
+            raise ValueError("El código de barras no puede exceder 50 caracteres")
+        estado_fisico = datos.get("estado_fisico") or "bueno"
+        if estado_fisico not in ESTADOS_FISICOS:
+            raise ValueError(
+                f"El estado físico debe ser uno de: {', '.join(ESTADOS_FISICOS)}"
+            )
+        ubicacion = (datos.get("ubicacion") or "").strip() or None
+        if ubicacion and len(ubicacion) > 100:
+            raise ValueError("La ubicación no puede exceder 100 caracteres")
+        # Las tres columnas en todas las filas: el INSERT de varias filas agrupa
+        # los parámetros por conjunto de claves y un lote mixto se partiría
+        return {
+            **{columna: None for columna in MATERIALES_POR_COLUMNA},
+            materiales[0]: datos[materiales[0]],
+            "codigo_barras": codigo_barras,
+            "ubicacion": ubicacion,
+            "ubicacion_ruta": ruta_de_ubicacion(ubicacion),
+            "estado_fisico": estado_fisico,
+            "disponible": datos.get("disponible", True) is not False,
+            "observaciones": datos.get("observaciones"),
+        }
+
+    def crear_items(
+        self, items: List[Dict[str, Any]], id_usuario_creacion: UUID
+    ) -> Tuple[List[Item], List[Dict[str, Any]]]:
+        """
+        Crear varios items en una sola transacción.
+
+        Las filas inválidas no se insertan y se informan por posición; el
+        resto se inserta igualmente. Toda la validación contra la base de
+        datos son tres consultas como máximo para los materiales (una por
+        tipo) y una para los códigos de barras, y la inserción es un único
+        INSERT de varias filas con RETURNING. Las filas sin código de barras
+        reciben códigos consecutivos reservados con una sola llamada.
+
+        Returns:
+            (items creados en el orden del lote, errores {"indice", "error"})
+        """
+        if not id_usuario_creacion:
+            raise ValueError("El id_usuario_creacion es obligatorio")
+        if not items:
+            raise ValueError("El lote no contiene items")
+        if len(items) > MAX_ITEMS_LOTE:
+            raise ValueError(f"El lote no puede superar {MAX_ITEMS_LOTE} items")
+
+        errores: Dict[int, str] = {}
+        filas: Dict[int, Dict[str, Any]] = {}
+        for indice, datos in enumerate(items):
+            try:
+                filas[indice] = self._validar_fila_lote(datos)
+            except ValueError as e:
+                errores[indice] = str(e)
+
+        # 1. Materiales: una consulta por tipo presente en el lote
+        for columna, (tipo, modelo) in MATERIALES_POR_COLUMNA.items():
+            ids = {f[columna] for f in filas.values() if f[columna] is not None}
+            if not ids:
+                continue
+            existentes = set(
+                self.db.scalars(
+                    select(modelo.id).where(igual_a_alguno(modelo.id, ids, "ids"))
+                )
+            )
+            for indice, fila in list(filas.items()):
+                if fila[columna] is not None and fila[columna] not in existentes:
+                    errores[indice] = f"El material ({tipo}) especificado no existe"
+                    del filas[indice]
+
+        # 2. Códigos de barras: repetidos en el lote y ya existentes, en una consulta
+        codigos = Counter(
+            f["codigo_barras"] for f in filas.values() if f["codigo_barras"]
+        )
+        # Solo se consultan los que el filtro de Bloom no descarta
+        posibles = [c for c in codigos if filtro_codigos_barras.puede_contener(c)]
+        existentes = set()
+        if posibles:
+            existentes = set(
+                self.db.scalars(
+                    select(Item.codigo_barras).where(
+                        igual_a_alguno(Item.codigo_barras, posibles, "codigos")
+                    )
+                )
+            )
+        ultimo_reservado = None
+        if any(numero_de_codigo(c) for c in codigos):
+            ultimo_reservado = self._ultimo_codigo_reservado()
+        for indice, fila in list(filas.items()):
+            codigo = fila["codigo_barras"]
+            error = None
+            if codigo in existentes:
+                error = "Ya existe un item con ese código de barras"
+            elif codigo and codigos[codigo] > 1:
+                error = "Código de barras repetido en el lote"
+            elif codigo and ultimo_reservado is not None:
+                try:
+                    self._validar_codigo_reservado(codigo, ultimo_reservado)
+                except ValueError as e:
+                    error = str(e)
+            if error:
+                errores[indice] = error
+                del filas[indice]
+
+        # 3. Las filas sin código reciben un bloque consecutivo de la secuencia
+        sin_codigo = [f for f in filas.values() if not f["codigo_barras"]]
+        if sin_codigo:
+            for fila, codigo in zip(
+                sin_codigo, self.reservar_codigos_barras(len(sin_codigo))
+            ):
+                fila["codigo_barras"] = codigo
+
+        lista_errores = [
+            {"indice": indice, "error": error}
+            for indice, error in sorted(errores.items())
+        ]
+        if not filas:
+            return [], lista_errores
+
+        # 4. Un INSERT de varias filas; RETURNING en el orden de los parámetros.
+        # render_nulls: sin él el ORM quita las claves con None de cada fila y
+        # agrupa las filas por las claves que quedan, con un INSERT por grupo
+        parametros = [
+            {
+                **fila,
+                "id_usuario_creacion": id_usuario_creacion,
+                "id_usuario_edicion": id_usuario_creacion,
+            }
+            for fila in filas.values()
+        ]
+        try:
+            creados = self.db.scalars(
+                insert(Item)
+                .returning(Item, sort_by_parameter_order=True)
+                .execution_options(render_nulls=True),
+                parametros,
+            ).all()
+
+            deltas: Dict[Tuple[str, UUID], List[int]] = {}
+            for item in creados:
+                contador = deltas.setdefault(material_de_item(item), [0, 0, 0])
+                contador[0] += 1
+                contador[1] += 1 if item.disponible else 0
+            DisponibilidadCRUD(self.db).ajustar_lote(
+                {material: tuple(valores) for material, valores in deltas.items()}
+            )
+            # Ids leídos antes del commit, que expira los objetos
+            ids = [item.id for item in creados]
+            registrar(
+                self.db,
+                [
+                    Cambio(
+                        "crear", "items", item.id, {"codigo_barras": item.codigo_barras}
+                    )
+                    for item in creados
+                ],
+            )
+            self.db.commit()
+        except IntegrityError:
+            # Un código de barras insertado por otra petición durante el lote
+            self.db.rollback()
+            raise ValueError(
+                "Conflicto al insertar el lote (código de barras duplicado); "
+                "vuelva a enviarlo"
+            )
+        except Exception:
+            self.db.rollback()
+            raise
+
+        cargados = {
+            item.id: item
+            for item in self.db.query(Item)
+            .options(
+                joinedload(Item.libro),
+                joinedload(Item.revista),
+                joinedload(Item.periodico),
+            )
+            .filter(igual_a_alguno(Item.id, ids, "ids"))
+        }
+        return [cargados[i] for i in ids], lista_errores
+
     def obtener_items(
         self,
         skip: int = 0,
@@ -100,18 +384,44 @@ class ItemCRUD:
         id_libro: Optional[UUID] = None,
         id_revista: Optional[UUID] = None,
         id_periodico: Optional[UUID] = None,
+        tipo: Optional[str] = None,
     ) -> List[Item]:
         """Obtener todos los items con opciones de filtrado."""
-        # Cargar relaciones explícitamente para evitar lazy loading
-        try:
+        if tipo and tipo not in TIPOS_ITEM:
+            raise ValueError("Tipo inválido. Debe ser: libro, revista o periodico")
+
+        # El filtro por material implica el tipo; uno explícito debe coincidir
+        tipos_material = [
+            tipo_material
+            for tipo_material, id_material in (
+                ("libro", id_libro),
+                ("revista", id_revista),
+                ("periodico", id_periodico),
+            )
+            if id_material
+        ]
+        if len(tipos_material) > 1:
+            raise ValueError(
+                "Solo se puede filtrar por uno de: id_libro, id_revista o id_periodico"
+            )
+        if tipos_material:
+            if tipo and tipo != tipos_material[0]:
+                raise ValueError(
+                    f"El tipo '{tipo}' no coincide con el filtro "
+                    f"id_{tipos_material[0]}"
+                )
+            tipo = tipos_material[0]
+
+        # Con el tipo conocido basta cargar una relación; sin él, las tres
+        if tipo:
+            query = self.db.query(Item).options(joinedload(RELACIONES_POR_TIPO[tipo]))
+            query = query.filter(Item.tipo == tipo)
+        else:
             query = self.db.query(Item).options(
                 joinedload(Item.libro),
                 joinedload(Item.revista),
                 joinedload(Item.periodico),
             )
-        except Exception:
-            # Si joinedload falla, usar query simple
-            query = self.db.query(Item)
 
         if solo_disponibles:
             query = query.filter(Item.disponible == True)
@@ -125,6 +435,100 @@ class ItemCRUD:
 
         return query.offset(skip).limit(limit).all()
 
+    def obtener_items_por_ubicacion(
+        self,
+        ruta: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        solo_disponibles: bool = False,
+    ) -> Tuple[List[Item], Optional[str]]:
+        """
+        Items bajo un nodo de ubicación (y todos sus descendientes),
+        ordenados por ruta.
+
+        `ruta` admite texto libre ("piso 2") o una ruta ("edificio/piso-2");
+        sin ruta se recorren todos los items con ubicación. La consulta es un
+        rango del índice (ubicacion_ruta, id) y la paginación por cursor
+        continúa el rango donde lo dejó la página anterior.
+
+        Returns:
+            (items, cursor de la página siguiente o None)
+        """
+        prefijo = ruta_de_ubicacion(ruta) or ""
+        query = (
+            self.db.query(Item)
+            .options(
+                joinedload(Item.libro),
+                joinedload(Item.revista),
+                joinedload(Item.periodico),
+            )
+            .filter(Item.ubicacion_ruta.like(prefijo + "%"))
+        )
+        if solo_disponibles:
+            query = query.filter(Item.disponible == True)
+        if cursor:
+            ultimo = decodificar_cursor(cursor)
+            try:
+                clave = (ultimo["ruta"], UUID(ultimo["id"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Cursor de paginación inválido")
+            query = query.filter(tuple_(Item.ubicacion_ruta, Item.id) > clave)
+
+        items = query.order_by(Item.ubicacion_ruta, Item.id).limit(limit + 1).all()
+        siguiente = None
+        if len(items) > limit:
+            items = items[:limit]
+            siguiente = codificar_cursor(
+                {"ruta": items[-1].ubicacion_ruta, "id": str(items[-1].id)}
+            )
+        return items, siguiente
+
+    def contar_por_ubicacion(self, ruta: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Totales de items bajo un nodo de ubicación, desglosados por sus
+        nodos hijos, en una sola consulta agregada sobre el rango del índice.
+
+        Returns:
+            {"ruta", "total", "disponibles", "en_nodo", "hijos": [{"segmento",
+            "ruta", "total", "disponibles"}]}; `en_nodo` son los items
+            ubicados en el propio nodo y no en un hijo
+        """
+        prefijo = ruta_de_ubicacion(ruta) or ""
+        segmento = func.split_part(
+            func.substr(Item.ubicacion_ruta, len(prefijo) + 1), "/", 1
+        ).label("segmento")
+        filas = self.db.execute(
+            select(
+                segmento,
+                func.count().label("total"),
+                func.count().filter(Item.disponible.isnot(False)).label("disponibles"),
+            )
+            .where(Item.ubicacion_ruta.like(prefijo + "%"))
+            .group_by(segmento)
+            .order_by(segmento)
+        ).all()
+
+        resultado = {
+            "ruta": prefijo,
+            "total": sum(f.total for f in filas),
+            "disponibles": sum(f.disponibles for f in filas),
+            "en_nodo": 0,
+            "hijos": [],
+        }
+        for fila in filas:
+            if not fila.segmento:
+                resultado["en_nodo"] = fila.total
+                continue
+            resultado["hijos"].append(
+                {
+                    "segmento": fila.segmento,
+                    "ruta": f"{prefijo}{fila.segmento}/",
+                    "total": fila.total,
+                    "disponibles": fila.disponibles,
+                }
+            )
+        return resultado
+
     def obtener_item(self, item_id: UUID) -> Optional[Item]:
         """Obtener un item por ID."""
         return (
@@ -138,6 +542,17 @@ class ItemCRUD:
             .first()
         )
 
+    def obtener_items_por_ids(self, ids: List[UUID]) -> Dict[UUID, Item]:
+        """Obtener varios items por ID en una consulta, con su material."""
+        return obtener_por_ids(
+            self.db,
+            Item,
+            ids,
+            joinedload(Item.libro),
+            joinedload(Item.revista),
+            joinedload(Item.periodico),
+        )
+
     def obtener_items_por_material(
         self,
         tipo: str,
@@ -179,21 +594,16 @@ class ItemCRUD:
             codigo_barras = kwargs["codigo_barras"]
             if len(codigo_barras) > 50:
                 raise ValueError("El código de barras no puede exceder 50 caracteres")
-            existing = (
-                self.db.query(Item)
-                .filter(Item.codigo_barras == codigo_barras.strip(), Item.id != item_id)
-                .first()
-            )
-            if existing:
-                raise ValueError("Ya existe un item con ese código de barras")
             kwargs["codigo_barras"] = codigo_barras.strip()
+            self._validar_codigo_reservado(kwargs["codigo_barras"])
+            if self._codigo_barras_existe(kwargs["codigo_barras"], excluir_id=item_id):
+                raise ValueError("Ya existe un item con ese código de barras")
 
         # Validar estado_fisico
         if "estado_fisico" in kwargs:
-            estados_validos = ["bueno", "regular", "malo", "reparacion"]
-            if kwargs["estado_fisico"] not in estados_validos:
+            if kwargs["estado_fisico"] not in ESTADOS_FISICOS:
                 raise ValueError(
-                    f"El estado físico debe ser uno de: {', '.join(estados_validos)}"
+                    f"El estado físico debe ser uno de: {', '.join(ESTADOS_FISICOS)}"
                 )
 
         # Validar ubicacion
@@ -201,20 +611,116 @@ class ItemCRUD:
             if len(kwargs["ubicacion"]) > 100:
                 raise ValueError("La ubicación no puede exceder 100 caracteres")
             kwargs["ubicacion"] = kwargs["ubicacion"].strip()
+        if "ubicacion" in kwargs:
+            kwargs["ubicacion_ruta"] = ruta_de_ubicacion(kwargs["ubicacion"])
+
+        if "disponible" in kwargs and kwargs["disponible"] != item.disponible:
+            DisponibilidadCRUD(self.db).ajustar_item(
+                item, disponibles=1 if kwargs["disponible"] else -1
+            )
 
         item.id_usuario_edicion = id_usuario_edicion
 
         for key, value in kwargs.items():
             if hasattr(item, key):
                 setattr(item, key, value)
-        self.db.commit()
+        self._confirmar()
         self.db.refresh(item)
         return item
 
+    def actualizar_items(
+        self,
+        id_usuario_edicion: UUID,
+        cambios: Dict[str, Any],
+        ids: Optional[List[UUID]] = None,
+        codigos_barras: Optional[List[str]] = None,
+        ruta: Optional[str] = None,
+    ) -> List[UUID]:
+        """
+        Cambiar la ubicación, el estado físico o las observaciones de muchos
+        items con un único UPDATE ... RETURNING id.
+
+        Los items se eligen con exactamente un filtro: ids, códigos de barras
+        o una ruta de ubicación (el nodo y todo lo que cuelga de él). El
+        usuario y la fecha de edición se fijan en la misma sentencia.
+
+        Returns:
+            Ids de los items actualizados
+        """
+        if not id_usuario_edicion:
+            raise ValueError("El id_usuario_edicion es obligatorio")
+        filtros = [f for f in (ids, codigos_barras, ruta) if f]
+        if len(filtros) != 1:
+            raise ValueError(
+                "Debe especificar exactamente un filtro: ids, codigos_barras o ruta"
+            )
+        for lista in (ids, codigos_barras):
+            if lista and len(lista) > MAX_ITEMS_LOTE:
+                raise ValueError(f"El filtro no puede superar {MAX_ITEMS_LOTE} valores")
+
+        desconocidos = set(cambios) - set(CAMPOS_ACTUALIZACION_LOTE)
+        if desconocidos:
+            raise ValueError(
+                f"Solo se pueden cambiar en bloque: {', '.join(CAMPOS_ACTUALIZACION_LOTE)}"
+            )
+        if not cambios:
+            raise ValueError("No se indicó ningún cambio")
+
+        valores = dict(cambios)
+        if (
+            "estado_fisico" in valores
+            and valores["estado_fisico"] not in ESTADOS_FISICOS
+        ):
+            raise ValueError(
+                f"El estado físico debe ser uno de: {', '.join(ESTADOS_FISICOS)}"
+            )
+        if "ubicacion" in valores:
+            ubicacion = (valores["ubicacion"] or "").strip() or None
+            if ubicacion and len(ubicacion) > 100:
+                raise ValueError("La ubicación no puede exceder 100 caracteres")
+            valores["ubicacion"] = ubicacion
+            valores["ubicacion_ruta"] = ruta_de_ubicacion(ubicacion)
+
+        if ids:
+            condicion = igual_a_alguno(Item.id, ids, "ids")
+        elif codigos_barras:
+            codigos = [c.strip() for c in codigos_barras if c and c.strip()]
+            condicion = igual_a_alguno(Item.codigo_barras, codigos, "codigos")
+        else:
+            prefijo = ruta_de_ubicacion(ruta)
+            if not prefijo:
+                raise ValueError("La ruta de ubicación no es válida")
+            condicion = Item.ubicacion_ruta.like(prefijo + "%")
+
+        try:
+            actualizados = self.db.scalars(
+                update(Item)
+                .where(condicion)
+                .values(
+                    **valores,
+                    id_usuario_edicion=id_usuario_edicion,
+                    fecha_actualizacion=func.now(),
+                )
+                .returning(Item.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+            registrar(
+                self.db,
+                [Cambio("actualizar", "items", i, valores) for i in actualizados],
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return actualizados
+
     def eliminar_item(self, item_id: UUID) -> bool:
         """Eliminar un item."""
         item = self.obtener_item(item_id)
         if item:
+            DisponibilidadCRUD(self.db).ajustar_item(
+                item, total=-1, disponibles=-1 if item.disponible else 0
+            )
             self.db.delete(item)
             self.db.commit()
             return True
@@ -1,10 +1,15 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from crud.material_crud import MaterialCRUD
 from entities.autores import Autor
 from entities.editoriales import Editorial
-from entities.libros import Libro
+from entities.libros import MAX_PAGINAS, Libro
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
+from utils.filtro_bloom import filtro_isbn13
+from utils.isbn import a_isbn13
 
 
 class LibroCRUD:
@@ -18,7 +23,7 @@ class LibroCRUD:
         id_autor: UUID,
         id_usuario_creacion: UUID,
         isbn: Optional[str] = None,
-        numero_paginas: Optional[str] = None,
+        numero_paginas: Optional[int] = None,
         id_categoria: Optional[UUID] = None,
     ) -> Libro:
         """Crear un nuevo libro."""
@@ -26,12 +31,15 @@ class LibroCRUD:
             raise ValueError("El título es obligatorio")
         if len(titulo) > 255:
             raise ValueError("El título no puede exceder 255 caracteres")
+        self._validar_numero_paginas(numero_paginas)
 
-        if isbn and len(isbn) > 20:
-            raise ValueError("El ISBN no puede exceder 20 caracteres")
-
-        if isbn and self.obtener_libro_por_isbn(isbn):
-            raise ValueError("Ya existe un libro con ese ISBN")
+        isbn13 = None
+        if isbn:
+            if len(isbn) > 20:
+                raise ValueError("El ISBN no puede exceder 20 caracteres")
+            isbn13 = a_isbn13(isbn)
+            if self._isbn13_existe(isbn13):
+                raise ValueError("Ya existe un libro con ese ISBN")
 
         # Validar que el autor existe
         autor = self.db.query(Autor).filter(Autor.id == id_autor).first()
@@ -58,7 +66,8 @@ class LibroCRUD:
         libro = Libro(
             titulo=titulo.strip(),
             isbn=isbn.strip() if isbn else None,
-            numero_paginas=numero_paginas.strip() if numero_paginas else None,
+            isbn13=isbn13,
+            numero_paginas=numero_paginas,
             id_editorial=id_editorial,
             id_autor=id_autor,
             id_categoria=id_categoria,
@@ -66,21 +75,80 @@ class LibroCRUD:
             id_usuario_edicion=id_usuario_creacion,
         )
         self.db.add(libro)
-        self.db.commit()
+        self._confirmar()
         self.db.refresh(libro)
         return libro
 
-    def obtener_libros(self, skip: int = 0, limit: int = 1000) -> List[Libro]:
-        """Obtener todos los libros."""
-        return self.db.query(Libro).offset(skip).limit(limit).all()
+    def _isbn13_existe(self, isbn13: str, excluir_id: Optional[UUID] = None) -> bool:
+        # Si el filtro de Bloom descarta el ISBN no hace falta consultar
+        if not filtro_isbn13.puede_contener(isbn13):
+            return False
+        existente = self._obtener_por_isbn13(isbn13)
+        return existente is not None and existente.id != excluir_id
+
+    def _confirmar(self) -> None:
+        """Commit; un ISBN duplicado que escapó al filtro lo frena el índice único."""
+        try:
+            self.db.commit()
+        except IntegrityError as e:
+            self.db.rollback()
+            if "isbn13" in str(e.orig):
+                raise ValueError("Ya existe un libro con ese ISBN")
+            raise
+
+    def _validar_numero_paginas(self, numero_paginas: Optional[int]) -> None:
+        if numero_paginas is None:
+            return
+        if isinstance(numero_paginas, bool) or not isinstance(numero_paginas, int):
+            raise ValueError("El número de páginas debe ser un entero")
+        if not 1 <= numero_paginas <= MAX_PAGINAS:
+            raise ValueError(f"El número de páginas debe estar entre 1 y {MAX_PAGINAS}")
+
+    def obtener_libros(
+        self,
+        skip: int = 0,
+        limit: int = 1000,
+        paginas_min: Optional[int] = None,
+        paginas_max: Optional[int] = None,
+    ) -> List[Libro]:
+        """
+        Obtener los libros, opcionalmente solo los que tienen entre
+        `paginas_min` y `paginas_max` páginas (ambos incluidos).
+
+        Con un rango el resultado se ordena por número de páginas usando el
+        índice de esa columna; los libros sin número de páginas no se
+        incluyen.
+        """
+        if paginas_min is not None and paginas_max is not None:
+            if paginas_min > paginas_max:
+                raise ValueError("paginas_min no puede ser mayor que paginas_max")
+
+        query = self.db.query(Libro)
+        if paginas_min is not None or paginas_max is not None:
+            if paginas_min is not None:
+                query = query.filter(Libro.numero_paginas >= paginas_min)
+            if paginas_max is not None:
+                query = query.filter(Libro.numero_paginas <= paginas_max)
+            query = query.order_by(Libro.numero_paginas, Libro.id)
+        return query.offset(skip).limit(limit).all()
 
     def obtener_libro(self, libro_id: UUID) -> Optional[Libro]:
         """Obtener un libro por ID."""
         return self.db.query(Libro).filter(Libro.id == libro_id).first()
 
+    def obtener_libros_por_ids(self, ids: List[UUID]) -> Dict[UUID, Libro]:
+        """Obtener varios libros por ID en una consulta."""
+        return obtener_por_ids(self.db, Libro, ids)
+
+    def _obtener_por_isbn13(self, isbn13: str) -> Optional[Libro]:
+        return self.db.query(Libro).filter(Libro.isbn13 == isbn13).first()
+
     def obtener_libro_por_isbn(self, isbn: str) -> Optional[Libro]:
-        """Obtener un libro por ISBN."""
-        return self.db.query(Libro).filter(Libro.isbn == isbn.strip()).first()
+        """Obtener un libro por ISBN en cualquier forma (ISBN-10 o 13, con o sin guiones)."""
+        try:
+            return self._obtener_por_isbn13(a_isbn13(isbn))
+        except ValueError:
+            return None
 
     def actualizar_libro(
         self, libro_id: UUID, id_usuario_edicion: UUID, **kwargs
@@ -98,14 +166,19 @@ class LibroCRUD:
                 raise ValueError("El título no puede exceder 255 caracteres")
             kwargs["titulo"] = titulo.strip()
 
-        if "isbn" in kwargs and kwargs["isbn"]:
-            isbn = kwargs["isbn"]
+        if "numero_paginas" in kwargs:
+            self._validar_numero_paginas(kwargs["numero_paginas"])
+
+        if "isbn" in kwargs:
+            # Un ISBN vacío lo quita, y con él el isbn13 que lo indexa
+            isbn = (kwargs["isbn"] or "").strip()
             if len(isbn) > 20:
                 raise ValueError("El ISBN no puede exceder 20 caracteres")
-            existing = self.obtener_libro_por_isbn(isbn)
-            if existing and existing.id != libro_id:
+            isbn13 = a_isbn13(isbn) if isbn else None
+            if isbn13 and self._isbn13_existe(isbn13, excluir_id=libro_id):
                 raise ValueError("Ya existe un libro con ese ISBN")
-            kwargs["isbn"] = isbn.strip()
+            kwargs["isbn"] = isbn or None
+            kwargs["isbn13"] = isbn13
 
         if "id_autor" in kwargs and kwargs["id_autor"]:
             autor = self.db.query(Autor).filter(Autor.id == kwargs["id_autor"]).first()
@@ -137,15 +210,10 @@ class LibroCRUD:
         for key, value in kwargs.items():
             if hasattr(libro, key):
                 setattr(libro, key, value)
-        self.db.commit()
+        self._confirmar()
         self.db.refresh(libro)
         return libro
 
     def eliminar_libro(self, libro_id: UUID) -> bool:
-        """Eliminar un libro."""
-        libro = self.obtener_libro(libro_id)
-        if libro:
-            self.db.delete(libro)
-            self.db.commit()
-            return True
-        return False
+        """Eliminar un libro y sus ejemplares (ver MaterialCRUD.eliminar_material)."""
+        return MaterialCRUD(self.db).eliminar_material("libro", libro_id)
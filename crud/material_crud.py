@@ -0,0 +1,379 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from crud.disponibilidad_crud import DisponibilidadCRUD
+from database.eventos import Cambio, registrar
+from entities.autores import Autor
+from entities.categoria import Categoria
+from entities.disponibilidad import DisponibilidadMaterial
+from entities.editoriales import Editorial
+from entities.libros import Libro
+from entities.periodico import Periodico
+from entities.revista import Revista
+from sqlalchemy import bindparam, func, literal, select, text, tuple_, union_all
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Session
+from utils.cache_facetas import cache_facetas, firma_filtros
+from utils.paginacion import codificar_cursor, decodificar_cursor
+
+MODELOS_MATERIAL = {"libro": Libro, "revista": Revista, "periodico": Periodico}
+
+# Columnas comunes por las que se puede filtrar el catálogo
+FILTROS_MATERIAL = ("id_autor", "id_editorial", "id_categoria")
+
+# Una sola sentencia: comprueba los préstamos de los ejemplares y, si no hay,
+# borra el material; items.id_<tipo> es ON DELETE CASCADE, así que los
+# ejemplares los borra la base de datos sin traerlos a Python. prestamos.id_item
+# no es CASCADE: un ejemplar con historial impide el borrado, igual que antes
+ELIMINAR_MATERIAL = """
+WITH prestamos_material AS (
+    SELECT
+        EXISTS (
+            SELECT 1 FROM items i JOIN prestamos p ON p.id_item = i.id
+            WHERE i.{columna} = :id AND p.estado <> 'devuelto'
+        ) AS activos,
+        EXISTS (
+            SELECT 1 FROM items i JOIN prestamos p ON p.id_item = i.id
+            WHERE i.{columna} = :id
+        ) AS historial
+),
+material AS (
+    DELETE FROM {tabla} m
+    USING prestamos_material pm
+    WHERE m.id = :id AND NOT pm.historial
+    RETURNING m.id
+),
+contadores AS (
+    DELETE FROM disponibilidad_materiales d
+    USING material m
+    WHERE d.id_material = m.id
+)
+SELECT (SELECT id FROM material) AS id, activos, historial
+FROM prestamos_material
+"""
+
+# faceta -> (columna agrupada, modelo con el nombre del valor)
+FACETAS = {
+    "autor": ("id_autor", Autor),
+    "editorial": ("id_editorial", Editorial),
+    "categoria": ("id_categoria", Categoria),
+}
+
+
+class MaterialCRUD:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def obtener_tipo_material(self, id_material: UUID) -> Optional[str]:
+        """Tipo del material con ese id, o None si no existe."""
+        for tipo, modelo in MODELOS_MATERIAL.items():
+            if self.db.query(modelo.id).filter(modelo.id == id_material).first():
+                return tipo
+        return None
+
+    def obtener_disponibilidad(self, id_material: UUID) -> Optional[Dict[str, Any]]:
+        """
+        Contadores de ejemplares de un material (búsqueda por clave primaria).
+
+        Un material sin fila de contadores no tiene ejemplares.
+        """
+        contadores = DisponibilidadCRUD(self.db).obtener_disponibilidad(id_material)
+        if contadores:
+            return {
+                "id_material": contadores.id_material,
+                "tipo": contadores.tipo,
+                "total": contadores.total,
+                "disponibles": contadores.disponibles,
+                "en_prestamo": contadores.en_prestamo,
+            }
+        tipo = self.obtener_tipo_material(id_material)
+        if not tipo:
+            return None
+        return {
+            "id_material": id_material,
+            "tipo": tipo,
+            "total": 0,
+            "disponibles": 0,
+            "en_prestamo": 0,
+        }
+
+    def eliminar_material(self, tipo: str, id_material: UUID) -> bool:
+        """
+        Eliminar un material con todos sus ejemplares en un único DELETE.
+
+        No se puede eliminar si alguno de sus ejemplares tiene préstamos
+        (activos o devueltos). Los contadores de disponibilidad se borran en
+        la misma sentencia.
+
+        Returns:
+            True si se eliminó, False si no existe
+        """
+        if tipo not in MODELOS_MATERIAL:
+            raise ValueError(f"El tipo debe ser uno de: {', '.join(MODELOS_MATERIAL)}")
+        modelo = MODELOS_MATERIAL[tipo]
+        sentencia = (
+            text(
+                ELIMINAR_MATERIAL.format(
+                    tabla=modelo.__tablename__, columna=f"id_{tipo}"
+                )
+            )
+            .bindparams(bindparam("id", id_material, type_=PG_UUID(as_uuid=True)))
+            .columns(id=PG_UUID(as_uuid=True))
+        )
+        try:
+            resultado = self.db.execute(sentencia).one()
+            if resultado.activos:
+                raise ValueError("No se puede eliminar: hay ejemplares en préstamo")
+            if resultado.historial:
+                raise ValueError(
+                    "No se puede eliminar: hay ejemplares con historial de préstamos"
+                )
+            if resultado.id is None:
+                self.db.rollback()
+                return False
+            registrar(self.db, [Cambio("eliminar", modelo.__tablename__, resultado.id)])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        # La fila ya no existe: que la sesión no conserve el objeto si lo cargó
+        objeto = self.db.identity_map.get(self.db.identity_key(modelo, id_material))
+        if objeto is not None:
+            self.db.expunge(objeto)
+        return True
+
+    def _despues_del_cursor(self, tipo: str, modelo, ultimo: Dict[str, Any]):
+        """
+        Condición (titulo, tipo, id) > cursor para un tipo concreto.
+
+        Como el tipo de cada rama es constante, se reduce a una condición
+        sobre (titulo, id) que puede usar el índice de esa tabla.
+        """
+        if tipo > ultimo["tipo"]:
+            return modelo.titulo >= ultimo["titulo"]
+        if tipo < ultimo["tipo"]:
+            return modelo.titulo > ultimo["titulo"]
+        return tuple_(modelo.titulo, modelo.id) > tuple_(
+            literal(ultimo["titulo"]), literal(ultimo["id"], type_=modelo.id.type)
+        )
+
+    def _validar_tipo(self, tipo: Optional[str]) -> List[str]:
+        """Tipos de material a consultar: el indicado o todos."""
+        if tipo and tipo not in MODELOS_MATERIAL:
+            raise ValueError(
+                f"Tipo inválido. Debe ser uno de: {', '.join(MODELOS_MATERIAL)}"
+            )
+        return [tipo] if tipo else list(MODELOS_MATERIAL)
+
+    def _filtrar(self, consulta, modelo, filtros: Dict[str, Any]):
+        for campo in FILTROS_MATERIAL:
+            if filtros.get(campo):
+                consulta = consulta.where(getattr(modelo, campo) == filtros[campo])
+        return consulta
+
+    def _consulta_material(
+        self,
+        tipo: str,
+        modelo,
+        limite: int,
+        ultimo: Optional[Dict[str, Any]],
+        filtros: Dict[str, Any],
+    ):
+        consulta = select(
+            literal(tipo).label("tipo"),
+            modelo.id.label("id"),
+            modelo.titulo.label("titulo"),
+            modelo.id_autor.label("id_autor"),
+            modelo.id_editorial.label("id_editorial"),
+            modelo.id_categoria.label("id_categoria"),
+        )
+        consulta = self._filtrar(consulta, modelo, filtros)
+        if ultimo:
+            consulta = consulta.where(self._despues_del_cursor(tipo, modelo, ultimo))
+        # Cada rama se corta ya ordenada, así la unión nunca lee más de
+        # `limite` filas por tabla
+        rama = consulta.order_by(modelo.titulo, modelo.id).limit(limite).subquery()
+        return select(rama)
+
+    def _leer_cursor(self, cursor: str) -> Dict[str, Any]:
+        ultimo = decodificar_cursor(cursor)
+        try:
+            return {
+                "titulo": str(ultimo["titulo"]),
+                "tipo": str(ultimo["tipo"]),
+                "id": UUID(ultimo["id"]),
+            }
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Cursor de paginación inválido")
+
+    def obtener_materiales(
+        self,
+        tipo: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        id_autor: Optional[UUID] = None,
+        id_editorial: Optional[UUID] = None,
+        id_categoria: Optional[UUID] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Listar libros, revistas y periódicos ordenados por título, opcionalmente
+        filtrados por autor, editorial y categoría.
+
+        Cada material incluye total_items, items_disponibles e
+        items_en_prestamo, leídos de los contadores de disponibilidad por
+        clave primaria, de modo que toda la página es una sola consulta.
+
+        Returns:
+            (materiales, cursor de la página siguiente o None)
+        """
+        tipos = self._validar_tipo(tipo)
+        ultimo = self._leer_cursor(cursor) if cursor else None
+        filtros = {
+            "id_autor": id_autor,
+            "id_editorial": id_editorial,
+            "id_categoria": id_categoria,
+        }
+
+        # 1. Página: una fila de más para saber si hay página siguiente
+        ramas = [
+            self._consulta_material(t, MODELOS_MATERIAL[t], limit + 1, ultimo, filtros)
+            for t in tipos
+        ]
+        union = union_all(*ramas).subquery("materiales")
+        pagina = (
+            select(union)
+            .order_by(union.c.titulo, union.c.tipo, union.c.id)
+            .limit(limit + 1)
+            .cte("pagina")
+        )
+
+        # 2. Disponibilidad: búsqueda por clave primaria en los contadores
+        consulta = (
+            select(
+                pagina,
+                func.coalesce(DisponibilidadMaterial.total, 0).label("total_items"),
+                func.coalesce(DisponibilidadMaterial.disponibles, 0).label(
+                    "items_disponibles"
+                ),
+                func.coalesce(DisponibilidadMaterial.en_prestamo, 0).label(
+                    "items_en_prestamo"
+                ),
+            )
+            .outerjoin(
+                DisponibilidadMaterial,
+                DisponibilidadMaterial.id_material == pagina.c.id,
+            )
+            .order_by(pagina.c.titulo, pagina.c.tipo, pagina.c.id)
+        )
+        filas = self.db.execute(consulta).mappings().all()
+
+        materiales = [dict(fila) for fila in filas[:limit]]
+        siguiente = None
+        if len(filas) > limit:
+            ultima = materiales[-1]
+            siguiente = codificar_cursor(
+                {
+                    "titulo": ultima["titulo"],
+                    "tipo": ultima["tipo"],
+                    "id": str(ultima["id"]),
+                }
+            )
+        return materiales, siguiente
+
+    def obtener_facetas(
+        self,
+        tipo: Optional[str] = None,
+        id_autor: Optional[UUID] = None,
+        id_editorial: Optional[UUID] = None,
+        id_categoria: Optional[UUID] = None,
+        limite_valores: int = 20,
+    ) -> Dict[str, Any]:
+        """
+        Conteos por tipo, autor, editorial y categoría del catálogo filtrado.
+
+        Todas las facetas salen de una sola consulta con GROUPING SETS. El
+        resultado se guarda en caché por firma de filtros y se invalida con
+        cada escritura confirmada en el catálogo.
+        """
+        tipos = self._validar_tipo(tipo)
+        filtros = {
+            "tipo": tipo,
+            "id_autor": id_autor,
+            "id_editorial": id_editorial,
+            "id_categoria": id_categoria,
+        }
+        firma = firma_filtros({**filtros, "limite_valores": limite_valores})
+        return cache_facetas.obtener(
+            firma, lambda: self._calcular_facetas(tipos, filtros, limite_valores)
+        )
+
+    def _calcular_facetas(
+        self, tipos: List[str], filtros: Dict[str, Any], limite_valores: int
+    ) -> Dict[str, Any]:
+        ramas = []
+        for t in tipos:
+            modelo = MODELOS_MATERIAL[t]
+            consulta = select(
+                literal(t).label("tipo"),
+                modelo.id_autor.label("id_autor"),
+                modelo.id_editorial.label("id_editorial"),
+                modelo.id_categoria.label("id_categoria"),
+            )
+            ramas.append(self._filtrar(consulta, modelo, filtros))
+        union = union_all(*ramas).subquery("materiales")
+        agrupadas = [union.c.tipo] + [union.c[c] for c, _ in FACETAS.values()]
+
+        # 1. Un conjunto de agrupación por faceta, más () para el total
+        conteos = (
+            select(
+                *agrupadas,
+                *(func.grouping(c).label(f"sin_{c.name}") for c in agrupadas),
+                func.count().label("total"),
+            )
+            .group_by(func.grouping_sets(*agrupadas, tuple_()))
+            .cte("conteos")
+        )
+
+        # 2. Nombres de los valores, una fila por grupo
+        nombres = [
+            modelo.nombre.label(f"nombre_{faceta}")
+            for faceta, (_, modelo) in FACETAS.items()
+        ]
+        consulta = select(conteos, *nombres)
+        for columna, modelo in FACETAS.values():
+            consulta = consulta.outerjoin(modelo, modelo.id == conteos.c[columna])
+        filas = self.db.execute(consulta).mappings().all()
+
+        facetas: Dict[str, Any] = {"total": 0, "tipo": []}
+        facetas.update({faceta: [] for faceta in FACETAS})
+        for fila in filas:
+            agrupada = [c.name for c in agrupadas if not fila[f"sin_{c.name}"]]
+            if not agrupada:
+                facetas["total"] = fila["total"]
+            elif agrupada == ["tipo"]:
+                facetas["tipo"].append(
+                    {
+                        "valor": fila["tipo"],
+                        "nombre": fila["tipo"],
+                        "total": fila["total"],
+                    }
+                )
+            else:
+                faceta = next(f for f, (c, _) in FACETAS.items() if c == agrupada[0])
+                # Los materiales sin autor o sin categoría no forman un valor
+                if fila[agrupada[0]] is None:
+                    continue
+                facetas[faceta].append(
+                    {
+                        "valor": str(fila[agrupada[0]]),
+                        "nombre": fila[f"nombre_{faceta}"],
+                        "total": fila["total"],
+                    }
+                )
+
+        for faceta in ["tipo", *FACETAS]:
+            valores = sorted(
+                facetas[faceta], key=lambda v: (-v["total"], v["nombre"] or "")
+            )
+            facetas[faceta] = valores[:limite_valores]
+        return facetas
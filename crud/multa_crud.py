@@ -1,10 +1,11 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from entities.multa import Multa
+from entities.multa import ESTADOS_MULTA, Multa
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class MultaCRUD:
@@ -53,6 +54,10 @@ class MultaCRUD:
         """Obtener todas las multas."""
         query = self.db.query(Multa)
         if estado:
+            if estado not in ESTADOS_MULTA:
+                raise ValueError(
+                    f"El estado debe ser uno de: {', '.join(ESTADOS_MULTA)}"
+                )
             query = query.filter(Multa.estado == estado)
         if id_usuario:
             query = query.filter(Multa.id_usuario == id_usuario)
@@ -62,6 +67,10 @@ class MultaCRUD:
         """Obtener una multa por ID."""
         return self.db.query(Multa).filter(Multa.id == multa_id).first()
 
+    def obtener_multas_por_ids(self, ids: List[UUID]) -> Dict[UUID, Multa]:
+        """Obtener varios multas por ID en una consulta."""
+        return obtener_por_ids(self.db, Multa, ids)
+
     def obtener_multa_por_prestamo(self, id_prestamo: UUID) -> Optional[Multa]:
         """Obtener una multa por préstamo."""
         return self.db.query(Multa).filter(Multa.id_prestamo == id_prestamo).first()
@@ -86,10 +95,9 @@ class MultaCRUD:
             kwargs["motivo"] = kwargs["motivo"].strip()
 
         if "estado" in kwargs:
-            valid_states = ["pendiente", "pagada", "cancelada"]
-            if kwargs["estado"] not in valid_states:
+            if kwargs["estado"] not in ESTADOS_MULTA:
                 raise ValueError(
-                    f"El estado debe ser uno de: {', '.join(valid_states)}"
+                    f"El estado debe ser uno de: {', '.join(ESTADOS_MULTA)}"
                 )
 
         multa.id_usuario_edicion = id_usuario_edicion
@@ -1,11 +1,13 @@
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from crud.material_crud import MaterialCRUD
 from entities.autores import Autor
 from entities.editoriales import Editorial
 from entities.periodico import Periodico
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class PeriodicoCRUD:
@@ -66,14 +68,44 @@ class PeriodicoCRUD:
         self.db.refresh(periodico)
         return periodico
 
-    def obtener_periodicos(self, skip: int = 0, limit: int = 1000) -> List[Periodico]:
-        """Obtener todos los periódicos."""
-        return self.db.query(Periodico).offset(skip).limit(limit).all()
+    def obtener_periodicos(
+        self,
+        skip: int = 0,
+        limit: int = 1000,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+    ) -> List[Periodico]:
+        """
+        Obtener los periódicos, opcionalmente solo los publicados entre
+        `desde` y `hasta` (ambos días incluidos, en UTC).
+
+        El rango usa el índice BRIN de fecha_publicacion y el resultado se
+        ordena por fecha.
+        """
+        if desde and hasta and desde > hasta:
+            raise ValueError("La fecha 'desde' no puede ser posterior a 'hasta'")
+
+        query = self.db.query(Periodico)
+        if desde or hasta:
+            if desde:
+                inicio = datetime.combine(desde, time.min, tzinfo=timezone.utc)
+                query = query.filter(Periodico.fecha_publicacion >= inicio)
+            if hasta:
+                fin = datetime.combine(
+                    hasta + timedelta(days=1), time.min, tzinfo=timezone.utc
+                )
+                query = query.filter(Periodico.fecha_publicacion < fin)
+            query = query.order_by(Periodico.fecha_publicacion, Periodico.id)
+        return query.offset(skip).limit(limit).all()
 
     def obtener_periodico(self, periodico_id: UUID) -> Optional[Periodico]:
         """Obtener un periódico por ID."""
         return self.db.query(Periodico).filter(Periodico.id == periodico_id).first()
 
+    def obtener_periodicos_por_ids(self, ids: List[UUID]) -> Dict[UUID, Periodico]:
+        """Obtener varios periódicos por ID en una consulta."""
+        return obtener_por_ids(self.db, Periodico, ids)
+
     def actualizar_periodico(
         self, periodico_id: UUID, id_usuario_edicion: UUID, **kwargs
     ) -> Optional[Periodico]:
@@ -128,10 +160,5 @@ class PeriodicoCRUD:
         return periodico
 
     def eliminar_periodico(self, periodico_id: UUID) -> bool:
-        """Eliminar un periódico."""
-        periodico = self.obtener_periodico(periodico_id)
-        if periodico:
-            self.db.delete(periodico)
-            self.db.commit()
-            return True
-        return False
+        """Eliminar un periódico y sus ejemplares (ver MaterialCRUD.eliminar_material)."""
+        return MaterialCRUD(self.db).eliminar_material("periodico", periodico_id)
@@ -1,11 +1,13 @@
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from crud.disponibilidad_crud import DisponibilidadCRUD
 from entities.items import Item
-from entities.prestamo import Prestamo
+from entities.prestamo import ESTADOS_PRESTAMO, Prestamo
 from entities.usuario import Usuario
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class PrestamoCRUD:
@@ -119,6 +121,7 @@ class PrestamoCRUD:
 
         # Marcar el item como no disponible
         item.disponible = False
+        DisponibilidadCRUD(self.db).ajustar_item(item, disponibles=-1, en_prestamo=1)
         self.db.commit()
         self.db.refresh(prestamo)
         return prestamo
@@ -133,6 +136,10 @@ class PrestamoCRUD:
         """Obtener todos los préstamos."""
         query = self.db.query(Prestamo)
         if estado:
+            if estado not in ESTADOS_PRESTAMO:
+                raise ValueError(
+                    f"El estado debe ser uno de: {', '.join(ESTADOS_PRESTAMO)}"
+                )
             query = query.filter(Prestamo.estado == estado)
         if id_usuario:
             query = query.filter(Prestamo.id_usuario == id_usuario)
@@ -142,10 +149,21 @@ class PrestamoCRUD:
         """Obtener un préstamo por ID."""
         return self.db.query(Prestamo).filter(Prestamo.id == prestamo_id).first()
 
+    def obtener_prestamos_por_ids(self, ids: List[UUID]) -> Dict[UUID, Prestamo]:
+        """Obtener varios préstamos por ID en una consulta."""
+        return obtener_por_ids(self.db, Prestamo, ids)
+
     def actualizar_prestamo(
         self, prestamo_id: UUID, id_usuario_edicion: UUID, **kwargs
     ) -> Optional[Prestamo]:
-        """Actualizar un préstamo."""
+        """
+        Actualizar un préstamo.
+
+        Cambiar el estado a "devuelto" libera el item como devolver_prestamo;
+        reabrir un préstamo devuelto vuelve a prestar el item si sigue
+        disponible. Los contadores de disponibilidad se ajustan en la misma
+        transacción.
+        """
         prestamo = self.obtener_prestamo(prestamo_id)
         if not prestamo:
             return None
@@ -160,12 +178,23 @@ class PrestamoCRUD:
                     raise ValueError("La fecha de devolución estimada debe ser futura")
 
         if "estado" in kwargs:
-            valid_states = ["activo", "devuelto", "vencido"]
-            if kwargs["estado"] not in valid_states:
+            if kwargs["estado"] not in ESTADOS_PRESTAMO:
                 raise ValueError(
-                    f"El estado debe ser uno de: {', '.join(valid_states)}"
+                    f"El estado debe ser uno de: {', '.join(ESTADOS_PRESTAMO)}"
                 )
 
+        # El estado se cambia aparte: cerrar o reabrir el préstamo mueve el
+        # item y los contadores de disponibilidad
+        estado = kwargs.pop("estado", None)
+        if estado and estado != prestamo.estado:
+            if estado == "devuelto":
+                self._liberar_item(prestamo)
+                prestamo.fecha_devolucion_real = datetime.now(timezone.utc)
+            elif prestamo.estado == "devuelto":
+                self._reservar_item(prestamo)
+                prestamo.fecha_devolucion_real = None
+            prestamo.estado = estado
+
         prestamo.id_usuario_edicion = id_usuario_edicion
 
         for key, value in kwargs.items():
@@ -175,6 +204,28 @@ class PrestamoCRUD:
         self.db.refresh(prestamo)
         return prestamo
 
+    def _liberar_item(self, prestamo: Prestamo) -> None:
+        """Devolver el item de un préstamo a disponible, con sus contadores."""
+        estaba_abierto = prestamo.estado != "devuelto"
+        item = self.db.query(Item).filter(Item.id == prestamo.id_item).first()
+        if item:
+            DisponibilidadCRUD(self.db).ajustar_item(
+                item,
+                disponibles=0 if item.disponible else 1,
+                en_prestamo=-1 if estaba_abierto else 0,
+            )
+            item.disponible = True
+
+    def _reservar_item(self, prestamo: Prestamo) -> None:
+        """Volver a prestar el item de un préstamo devuelto que se reabre."""
+        item = self.db.query(Item).filter(Item.id == prestamo.id_item).first()
+        if not item:
+            return
+        if not item.disponible:
+            raise ValueError("El item ya no está disponible para reabrir el préstamo")
+        DisponibilidadCRUD(self.db).ajustar_item(item, disponibles=-1, en_prestamo=1)
+        item.disponible = False
+
     def devolver_prestamo(
         self, prestamo_id: UUID, id_usuario_edicion: UUID
     ) -> Optional[Prestamo]:
@@ -183,15 +234,12 @@ class PrestamoCRUD:
         if not prestamo:
             return None
 
+        # Marcar el item como disponible nuevamente
+        self._liberar_item(prestamo)
         prestamo.fecha_devolucion_real = datetime.now(timezone.utc)
         prestamo.estado = "devuelto"
         prestamo.id_usuario_edicion = id_usuario_edicion
 
-        # Marcar el item como disponible nuevamente
-        item = self.db.query(Item).filter(Item.id == prestamo.id_item).first()
-        if item:
-            item.disponible = True
-
         self.db.commit()
         self.db.refresh(prestamo)
         return prestamo
@@ -204,7 +252,16 @@ class PrestamoCRUD:
             if prestamo.estado == "activo":
                 item = self.db.query(Item).filter(Item.id == prestamo.id_item).first()
                 if item:
+                    DisponibilidadCRUD(self.db).ajustar_item(
+                        item,
+                        disponibles=0 if item.disponible else 1,
+                        en_prestamo=-1,
+                    )
                     item.disponible = True
+            elif prestamo.estado == "vencido":
+                item = self.db.query(Item).filter(Item.id == prestamo.id_item).first()
+                if item:
+                    DisponibilidadCRUD(self.db).ajustar_item(item, en_prestamo=-1)
             self.db.delete(prestamo)
             self.db.commit()
             return True
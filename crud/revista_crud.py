@@ -1,10 +1,12 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
+from crud.material_crud import MaterialCRUD
 from entities.autores import Autor
 from entities.editoriales import Editorial
 from entities.revista import Revista
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class RevistaCRUD:
@@ -75,6 +77,10 @@ class RevistaCRUD:
         """Obtener una revista por ID."""
         return self.db.query(Revista).filter(Revista.id == revista_id).first()
 
+    def obtener_revistas_por_ids(self, ids: List[UUID]) -> Dict[UUID, Revista]:
+        """Obtener varios revistas por ID en una consulta."""
+        return obtener_por_ids(self.db, Revista, ids)
+
     def actualizar_revista(
         self, revista_id: UUID, id_usuario_edicion: UUID, **kwargs
     ) -> Optional[Revista]:
@@ -133,10 +139,5 @@ class RevistaCRUD:
         return revista
 
     def eliminar_revista(self, revista_id: UUID) -> bool:
-        """Eliminar una revista."""
-        revista = self.obtener_revista(revista_id)
-        if revista:
-            self.db.delete(revista)
-            self.db.commit()
-            return True
-        return False
+        """Eliminar una revista y sus ejemplares (ver MaterialCRUD.eliminar_material)."""
+        return MaterialCRUD(self.db).eliminar_material("revista", revista_id)
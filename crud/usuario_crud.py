@@ -1,10 +1,11 @@
 import re
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from auth.security import PasswordManager
 from entities.usuario import Usuario
 from sqlalchemy.orm import Session
+from utils.consultas import obtener_por_ids
 
 
 class UsuarioCRUD:
@@ -97,6 +98,10 @@ class UsuarioCRUD:
         """Obtener un usuario por ID."""
         return self.db.query(Usuario).filter(Usuario.id == usuario_id).first()
 
+    def obtener_usuarios_por_ids(self, ids: List[UUID]) -> Dict[UUID, Usuario]:
+        """Obtener varios usuarios por ID en una consulta."""
+        return obtener_por_ids(self.db, Usuario, ids)
+
     def obtener_usuario_por_email(self, email: str) -> Optional[Usuario]:
         """Obtener un usuario por email."""
         return (
@@ -0,0 +1,113 @@
+"""
+Notificación de cambios confirmados en la base de datos.
+
+Los índices y cachés en memoria se suscriben con `al_confirmar` y reciben,
+tras cada commit, la lista de filas creadas, actualizadas o eliminadas en
+esa transacción. Si la transacción se revierte no se notifica nada.
+
+Los cambios se capturan desde los eventos de la sesión de SQLAlchemy, así
+que cubren todos los métodos crear_*, actualizar_* y eliminar_* de los
+CRUD. Las operaciones masivas (query.delete(), insert() con varias filas)
+no pasan por la sesión y deben llamar a `registrar` explícitamente.
+
+Las notificaciones son locales al proceso: cada worker mantiene sus
+propias estructuras en memoria.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CLAVE_PENDIENTES = "cambios_pendientes"
+
+
+@dataclass(frozen=True)
+class Cambio:
+    """Fila afectada por una transacción confirmada."""
+
+    operacion: str  # "crear", "actualizar" o "eliminar"
+    tabla: str
+    id: Any
+    datos: Dict[str, Any] = field(default_factory=dict)
+
+
+_suscriptores: List[Callable[[List[Cambio]], None]] = []
+
+
+def al_confirmar(callback: Callable[[List[Cambio]], None]):
+    """Suscribir una función a los cambios confirmados (usable como decorador)."""
+    if callback not in _suscriptores:
+        _suscriptores.append(callback)
+    return callback
+
+
+def cancelar_suscripcion(callback: Callable[[List[Cambio]], None]) -> None:
+    """Dejar de recibir los cambios confirmados."""
+    if callback in _suscriptores:
+        _suscriptores.remove(callback)
+
+
+def notificar(cambios: List[Cambio]) -> None:
+    """Entregar cambios ya confirmados a los suscriptores."""
+    if not cambios:
+        return
+    for callback in list(_suscriptores):
+        try:
+            callback(cambios)
+        except Exception:
+            # Un suscriptor con errores no debe hacer fallar la petición
+            logger.exception(f"Error al notificar cambios a {callback!r}")
+
+
+def registrar(db: Session, cambios: Iterable[Cambio]) -> None:
+    """Añadir cambios de operaciones masivas, notificados al hacer commit."""
+    if _suscriptores:
+        db.info.setdefault(CLAVE_PENDIENTES, []).extend(cambios)
+
+
+def _datos_cargados(objeto) -> Dict[str, Any]:
+    """Valores de columna ya cargados, sin disparar consultas."""
+    estado = inspect(objeto)
+    return {
+        atributo.key: estado.dict[atributo.key]
+        for atributo in estado.mapper.column_attrs
+        if atributo.key in estado.dict
+    }
+
+
+@event.listens_for(Session, "after_flush")
+def _capturar_cambios(session, flush_context):
+    if not _suscriptores:
+        return
+    pendientes = session.info.setdefault(CLAVE_PENDIENTES, [])
+    for operacion, objetos in (
+        ("crear", session.new),
+        ("actualizar", session.dirty),
+        ("eliminar", session.deleted),
+    ):
+        for objeto in objetos:
+            if operacion == "actualizar" and not session.is_modified(objeto):
+                continue
+            pendientes.append(
+                Cambio(
+                    operacion=operacion,
+                    tabla=objeto.__tablename__,
+                    id=getattr(objeto, "id", None),
+                    datos=_datos_cargados(objeto),
+                )
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _notificar_confirmados(session):
+    notificar(session.info.pop(CLAVE_PENDIENTES, []))
+
+
+@event.listens_for(Session, "after_rollback")
+def _descartar_revertidos(session):
+    session.info.pop(CLAVE_PENDIENTES, None)
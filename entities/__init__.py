@@ -1,5 +1,6 @@
 from entities.autores import Autor
 from entities.categoria import Categoria
+from entities.disponibilidad import DisponibilidadMaterial
 from entities.editoriales import Editorial
 from entities.items import Item
 from entities.libros import Libro
@@ -12,6 +13,7 @@ from entities.usuario import Usuario
 __all__ = [
     "Autor",
     "Categoria",
+    "DisponibilidadMaterial",
     "Editorial",
     "Item",
     "Libro",
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from database.config import Base
+
+
+class DisponibilidadMaterial(Base):
+    """Contadores de ejemplares por material, mantenidos al escribir.
+
+    Los actualizan ItemCRUD y PrestamoCRUD en la misma transacción que el
+    cambio; el job jobs.reconciliar_disponibilidad corrige las desviaciones.
+    """
+
+    __tablename__ = "disponibilidad_materiales"
+
+    id_material = Column(UUID(as_uuid=True), primary_key=True)
+    tipo = Column(String(10), nullable=False)  # "libro", "revista" o "periodico"
+    total = Column(Integer, nullable=False, default=0, server_default="0")
+    disponibles = Column(Integer, nullable=False, default=0, server_default="0")
+    en_prestamo = Column(Integer, nullable=False, default=0, server_default="0")
+    fecha_actualizacion = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self):
+        return f"<DisponibilidadMaterial(id_material={self.id_material}, disponibles={self.disponibles}/{self.total})>"
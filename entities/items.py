@@ -4,8 +4,12 @@ from sqlalchemy import (
     Boolean,
     CheckConstraint,
     Column,
+    Computed,
     DateTime,
+    Enum,
     ForeignKey,
+    Index,
+    Sequence,
     String,
     Text,
 )
@@ -15,6 +19,17 @@ from sqlalchemy.sql import func
 
 from database.config import Base
 
+ESTADOS_FISICOS = ("bueno", "regular", "malo", "reparacion")
+
+# Números de los códigos de barras generados (utils.codigo_barras); se
+# reservan con la función reservar_codigos_barras de la migración b7e9a1c3d5f8
+SECUENCIA_CODIGOS_BARRAS = Sequence(
+    "items_codigo_barras_seq",
+    minvalue=1,
+    maxvalue=9999999999,
+    metadata=Base.metadata,
+)
+
 
 class Item(Base):
     """Entidad que representa un ejemplar físico prestable de la biblioteca."""
@@ -43,12 +58,30 @@ class Item(Base):
         index=True,
     )
 
+    # Discriminador materializado, derivado de la FK presente (ver chk_item_tipo)
+    tipo = Column(
+        String(10),
+        Computed(
+            "CASE WHEN id_libro IS NOT NULL THEN 'libro' "
+            "WHEN id_revista IS NOT NULL THEN 'revista' "
+            "WHEN id_periodico IS NOT NULL THEN 'periodico' END",
+            persisted=True,
+        ),
+    )
+
     # Información del ejemplar
     codigo_barras = Column(String(50), unique=True, nullable=True, index=True)
     ubicacion = Column(String(100), nullable=True)
+    # Ubicación normalizada como ruta jerárquica (utils.ubicacion); con
+    # intercalación "C" el índice sirve tanto para LIKE 'prefijo%' como para
+    # ordenar por ruta
+    ubicacion_ruta = Column(String(255, collation="C"), nullable=True)
     estado_fisico = Column(
-        String(50), default="bueno"
-    )  # bueno, regular, malo, reparacion
+        Enum(*ESTADOS_FISICOS, name="estado_fisico_item"),
+        nullable=False,
+        default="bueno",
+        server_default="bueno",
+    )
     disponible = Column(Boolean, default=True, index=True)
     observaciones = Column(Text, nullable=True)
 
@@ -72,11 +105,15 @@ class Item(Base):
             "(id_libro IS NULL AND id_revista IS NULL AND id_periodico IS NOT NULL)",
             name="chk_item_tipo",
         ),
+        Index("idx_items_tipo_disponible", "tipo", "disponible"),
+        Index("idx_items_ubicacion_ruta", "ubicacion_ruta", "id"),
     )
 
     @property
     def tipo_item(self):
         """Determina el tipo de item basado en qué relación está presente"""
+        if self.tipo:
+            return self.tipo
         if self.id_libro:
             return "libro"
         elif self.id_revista:
@@ -88,7 +125,10 @@ class Item(Base):
     @property
     def material(self):
         """Retorna el material bibliográfico asociado"""
-        return self.libro or self.revista or self.periodico
+        tipo = self.tipo_item
+        if tipo is None:
+            return None
+        return getattr(self, tipo)
 
     def __repr__(self):
         tipo = self.tipo_item or "desconocido"
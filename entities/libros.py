@@ -1,22 +1,48 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    CHAR,
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from database.config import Base
 
+MAX_PAGINAS = 100000
+
 
 class Libro(Base):
     """Entidad que representa un libro."""
 
     __tablename__ = "libros"
+    __table_args__ = (
+        Index("idx_libros_busqueda", "busqueda", postgresql_using="gin"),
+        Index("idx_libros_titulo_id", "titulo", "id"),
+        Index("idx_libros_autor_titulo", "id_autor", "titulo", "id"),
+        Index("idx_libros_editorial_titulo", "id_editorial", "titulo", "id"),
+        Index("idx_libros_categoria_titulo", "id_categoria", "titulo", "id"),
+        Index("uq_libros_isbn13", "isbn13", unique=True),
+        Index("idx_libros_numero_paginas", "numero_paginas"),
+        CheckConstraint(
+            f"numero_paginas BETWEEN 1 AND {MAX_PAGINAS}",
+            name="ck_libros_numero_paginas",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     titulo = Column(String(255), nullable=False)
-    isbn = Column(String(20), unique=True, nullable=True)
-    numero_paginas = Column(String(10), nullable=True)
+    isbn = Column(String(20), nullable=True)
+    # ISBN-13 canónico (solo dígitos) para búsquedas y unicidad
+    isbn13 = Column(CHAR(13), nullable=True)
+    numero_paginas = Column(Integer, nullable=True)
     id_editorial = Column(
         UUID(as_uuid=True), ForeignKey("editoriales.id"), nullable=False
     )
@@ -28,11 +54,14 @@ class Libro(Base):
     id_usuario_edicion = Column(UUID(as_uuid=True), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion = Column(DateTime(timezone=True), onupdate=func.now())
+    # Título y nombre del autor para la búsqueda; lo mantiene un trigger
+    busqueda = deferred(Column(TSVECTOR, nullable=True))
 
     editorial = relationship("Editorial", back_populates="libros")
     autor = relationship("Autor", back_populates="libros")
     categoria = relationship("Categoria", back_populates="libros")
-    items = relationship("Item", back_populates="libro")
+    # Los items los borra la FK ON DELETE CASCADE, sin cargarlos
+    items = relationship("Item", back_populates="libro", passive_deletes=True)
 
     def __repr__(self):
         return f"<Libro(id={self.id}, titulo='{self.titulo}', isbn='{self.isbn}')>"
@@ -1,30 +1,43 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Numeric, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database.config import Base
 
+ESTADOS_MULTA = ("pendiente", "pagada", "cancelada")
+
 
 class Multa(Base):
-    """Entidad que representa una multa por retraso en la devolución de un préstamo."""
+    """Entidad que representa una multa por retraso en la devolución de un préstamo.
+
+    En PostgreSQL la tabla está particionada por mes de fecha_multa. La FK
+    hacia prestamos incluye su clave de partición (columna fecha_prestamo,
+    completada por trigger), y la unicidad por préstamo la garantiza
+    MultaCRUD, ya que no puede declararse sin la clave de partición.
+    """
 
     __tablename__ = "multas"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    id_prestamo = Column(
-        UUID(as_uuid=True), ForeignKey("prestamos.id"), nullable=False, unique=True
-    )
+    id_prestamo = Column(UUID(as_uuid=True), ForeignKey("prestamos.id"), nullable=False)
     id_usuario = Column(
         UUID(as_uuid=True), ForeignKey("tbl_usuarios.id"), nullable=False
     )
     monto = Column(Numeric(10, 2), nullable=False)
     motivo = Column(String(255), nullable=True)
-    fecha_multa = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_multa = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     fecha_pago = Column(DateTime(timezone=True), nullable=True)
-    estado = Column(String(20), default="pendiente")
+    estado = Column(
+        Enum(*ESTADOS_MULTA, name="estado_multa"),
+        nullable=False,
+        default="pendiente",
+        server_default="pendiente",
+    )
     id_usuario_creacion = Column(UUID(as_uuid=True), nullable=False)
     id_usuario_edicion = Column(UUID(as_uuid=True), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
@@ -33,6 +46,11 @@ class Multa(Base):
     prestamo = relationship("Prestamo", back_populates="multa")
     usuario = relationship("Usuario", back_populates="multas")
 
+    __table_args__ = (
+        Index("idx_multas_estado", "estado"),
+        Index("idx_multas_prestamo", "id_prestamo"),
+    )
+
     def __repr__(self):
         return (
             f"<Multa(id={self.id}, prestamo='{self.id_prestamo}', monto={self.monto})>"
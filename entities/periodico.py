@@ -1,8 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from database.config import Base
@@ -12,6 +12,19 @@ class Periodico(Base):
     """Entidad que representa un periódico."""
 
     __tablename__ = "periodicos"
+    __table_args__ = (
+        Index("idx_periodicos_busqueda", "busqueda", postgresql_using="gin"),
+        Index("idx_periodicos_titulo_id", "titulo", "id"),
+        Index("idx_periodicos_autor_titulo", "id_autor", "titulo", "id"),
+        Index("idx_periodicos_editorial_titulo", "id_editorial", "titulo", "id"),
+        Index("idx_periodicos_categoria_titulo", "id_categoria", "titulo", "id"),
+        # Los números llegan casi en orden de fecha: un BRIN basta para los rangos
+        Index(
+            "idx_periodicos_fecha_brin",
+            "fecha_publicacion",
+            postgresql_using="brin",
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     titulo = Column(String(255), nullable=False)
@@ -27,11 +40,14 @@ class Periodico(Base):
     id_usuario_edicion = Column(UUID(as_uuid=True), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion = Column(DateTime(timezone=True), onupdate=func.now())
+    # Título y nombre del autor para la búsqueda; lo mantiene un trigger
+    busqueda = deferred(Column(TSVECTOR, nullable=True))
 
     editorial = relationship("Editorial", back_populates="periodicos")
     autor = relationship("Autor", back_populates="periodicos")
     categoria = relationship("Categoria", back_populates="periodicos")
-    items = relationship("Item", back_populates="periodico")
+    # Los items los borra la FK ON DELETE CASCADE, sin cargarlos
+    items = relationship("Item", back_populates="periodico", passive_deletes=True)
 
     def __repr__(self):
         return f"<Periodico(id={self.id}, titulo='{self.titulo}', fecha='{self.fecha_publicacion}')>"
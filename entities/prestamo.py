@@ -1,15 +1,22 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from database.config import Base
 
+ESTADOS_PRESTAMO = ("activo", "devuelto", "vencido")
+
 
 class Prestamo(Base):
-    """Entidad que representa un préstamo de un item de la biblioteca."""
+    """Entidad que representa un préstamo de un item de la biblioteca.
+
+    En PostgreSQL la tabla está particionada por mes de fecha_prestamo
+    (migración f2b8d4e6a1c7); las particiones futuras las crea el job
+    jobs.particiones.
+    """
 
     __tablename__ = "prestamos"
 
@@ -18,10 +25,17 @@ class Prestamo(Base):
     id_usuario = Column(
         UUID(as_uuid=True), ForeignKey("tbl_usuarios.id"), nullable=False
     )
-    fecha_prestamo = Column(DateTime(timezone=True), server_default=func.now())
+    fecha_prestamo = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
     fecha_devolucion_estimada = Column(DateTime(timezone=True), nullable=False)
     fecha_devolucion_real = Column(DateTime(timezone=True), nullable=True)
-    estado = Column(String(20), default="activo")
+    estado = Column(
+        Enum(*ESTADOS_PRESTAMO, name="estado_prestamo"),
+        nullable=False,
+        default="activo",
+        server_default="activo",
+    )
     id_usuario_creacion = Column(UUID(as_uuid=True), nullable=False)
     id_usuario_edicion = Column(UUID(as_uuid=True), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
@@ -31,5 +45,11 @@ class Prestamo(Base):
     usuario = relationship("Usuario", back_populates="prestamos")
     multa = relationship("Multa", back_populates="prestamo", uselist=False)
 
+    __table_args__ = (
+        Index("idx_prestamos_estado", "estado"),
+        Index("idx_prestamos_item_estado", "id_item", "estado"),
+        Index("idx_prestamos_usuario", "id_usuario"),
+    )
+
     def __repr__(self):
         return f"<Prestamo(id={self.id}, item='{self.id_item}', usuario='{self.id_usuario}')>"
@@ -1,8 +1,8 @@
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from database.config import Base
@@ -12,6 +12,13 @@ class Revista(Base):
     """Entidad que representa una revista."""
 
     __tablename__ = "revistas"
+    __table_args__ = (
+        Index("idx_revistas_busqueda", "busqueda", postgresql_using="gin"),
+        Index("idx_revistas_titulo_id", "titulo", "id"),
+        Index("idx_revistas_autor_titulo", "id_autor", "titulo", "id"),
+        Index("idx_revistas_editorial_titulo", "id_editorial", "titulo", "id"),
+        Index("idx_revistas_categoria_titulo", "id_categoria", "titulo", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     titulo = Column(String(255), nullable=False)
@@ -27,11 +34,14 @@ class Revista(Base):
     id_usuario_edicion = Column(UUID(as_uuid=True), nullable=False)
     fecha_creacion = Column(DateTime(timezone=True), server_default=func.now())
     fecha_actualizacion = Column(DateTime(timezone=True), onupdate=func.now())
+    # Título y nombre del autor para la búsqueda; lo mantiene un trigger
+    busqueda = deferred(Column(TSVECTOR, nullable=True))
 
     editorial = relationship("Editorial", back_populates="revistas")
     autor = relationship("Autor", back_populates="revistas")
     categoria = relationship("Categoria", back_populates="revistas")
-    items = relationship("Item", back_populates="revista")
+    # Los items los borra la FK ON DELETE CASCADE, sin cargarlos
+    items = relationship("Item", back_populates="revista", passive_deletes=True)
 
     def __repr__(self):
         return f"<Revista(id={self.id}, titulo='{self.titulo}', numero='{self.numero_publicacion}')>"
@@ -0,0 +1 @@
+"""Módulo de jobs de mantenimiento."""
@@ -0,0 +1,116 @@
+"""
+Job de archivo en frío de préstamos cerrados.
+
+Mueve por lotes los préstamos devueltos hace más de `dias_retencion` días
+(y sus multas, si ya están pagadas o canceladas) a segmentos NDJSON
+comprimidos en ARCHIVO_DIR y los elimina de las tablas calientes. Cada lote
+se escribe en disco antes de confirmar el borrado; si el borrado falla, el
+segmento se elimina.
+
+Uso:
+    python -m jobs.archivar_prestamos [dias_retencion] [tamano_lote]
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+
+from database.config import SessionLocal
+from entities.multa import Multa
+from entities.prestamo import Prestamo
+from sqlalchemy import delete, or_
+from sqlalchemy.orm import Session, selectinload
+from utils.archivo_historial import (
+    eliminar_segmento,
+    escribir_segmento,
+    serializar_fila,
+)
+
+ESTADOS_MULTA_CERRADA = ("pagada", "cancelada")
+
+
+def archivar_prestamos(
+    db: Session, dias_retencion: int = 365, tamano_lote: int = 5000
+) -> int:
+    """
+    Archivar los préstamos cerrados anteriores a la ventana de retención.
+
+    Args:
+        db: Sesión de base de datos
+        dias_retencion: Días desde la devolución que un préstamo sigue en caliente
+        tamano_lote: Préstamos por segmento (y por transacción)
+
+    Returns:
+        Número de préstamos archivados
+    """
+    if dias_retencion < 0:
+        raise ValueError("Los días de retención no pueden ser negativos")
+    if tamano_lote < 1:
+        raise ValueError("El tamaño de lote debe ser mayor a cero")
+
+    corte = datetime.now(timezone.utc) - timedelta(days=dias_retencion)
+    total = 0
+
+    while True:
+        prestamos = (
+            db.query(Prestamo)
+            .options(selectinload(Prestamo.multa))
+            .outerjoin(Multa, Multa.id_prestamo == Prestamo.id)
+            .filter(Prestamo.estado == "devuelto")
+            .filter(Prestamo.fecha_devolucion_real < corte)
+            .filter(or_(Multa.id.is_(None), Multa.estado.in_(ESTADOS_MULTA_CERRADA)))
+            .order_by(Prestamo.fecha_prestamo, Prestamo.id)
+            .limit(tamano_lote)
+            .all()
+        )
+        if not prestamos:
+            break
+
+        registros = []
+        for prestamo in prestamos:
+            registro = serializar_fila(prestamo)
+            registro["multa"] = (
+                serializar_fila(prestamo.multa) if prestamo.multa else None
+            )
+            registros.append(registro)
+
+        ids = [prestamo.id for prestamo in prestamos]
+        ruta = escribir_segmento(registros)
+        try:
+            db.execute(
+                delete(Multa)
+                .where(Multa.id_prestamo.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.execute(
+                delete(Prestamo)
+                .where(Prestamo.id.in_(ids))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            eliminar_segmento(ruta)
+            raise
+
+        db.expunge_all()
+        total += len(prestamos)
+        print(f"Archivados {total} préstamos (último segmento: {ruta})")
+
+    return total
+
+
+def main():
+    dias_retencion = int(sys.argv[1]) if len(sys.argv) > 1 else 365
+    tamano_lote = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    db = SessionLocal()
+    try:
+        total = archivar_prestamos(
+            db, dias_retencion=dias_retencion, tamano_lote=tamano_lote
+        )
+        print(f"Archivo completado: {total} préstamos.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Job de detección de registros casi duplicados del catálogo.
+
+Recorre libros (título + nombre del autor), autores o editoriales leyendo
+solo id, texto y fecha de creación, agrupa los casi duplicados con MinHash
+y LSH (utils.minhash) y escribe un informe JSON con un grupo por entrada.
+Cada grupo propone como destino el registro más antiguo; los grupos
+revisados se fusionan con POST /api/deduplicacion/fusionar.
+
+Uso:
+    python -m jobs.deduplicacion <libro|autor|editorial> [umbral] [salida.json]
+"""
+
+import json
+import sys
+from typing import Any, Dict, List
+
+from database.config import SessionLocal
+from entities.autores import Autor
+from entities.editoriales import Editorial
+from entities.libros import Libro
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from utils.minhash import agrupar_duplicados
+
+CONSULTAS = {
+    "libro": lambda: select(
+        Libro.id, Libro.titulo + " " + Autor.nombre, Libro.fecha_creacion
+    ).join(Autor, Autor.id == Libro.id_autor),
+    "autor": lambda: select(Autor.id, Autor.nombre, Autor.fecha_creacion),
+    "editorial": lambda: select(
+        Editorial.id, Editorial.nombre, Editorial.fecha_creacion
+    ),
+}
+
+
+def detectar_duplicados(
+    db: Session, tipo: str, umbral: float = 0.7, tamano_lote: int = 10000
+) -> List[Dict[str, Any]]:
+    """
+    Detectar grupos de registros casi duplicados de un tipo.
+
+    Returns:
+        Grupos {"tipo", "id_destino", "ids_origen", "registros"}, de mayor
+        a menor tamaño
+    """
+    if tipo not in CONSULTAS:
+        raise ValueError(f"Tipo inválido. Debe ser uno de: {', '.join(CONSULTAS)}")
+
+    textos = {}
+    fechas = {}
+    filas = db.execute(CONSULTAS[tipo]().execution_options(yield_per=tamano_lote))
+    for id_registro, texto, fecha_creacion in filas:
+        textos[id_registro] = texto
+        fechas[id_registro] = fecha_creacion
+
+    grupos = []
+    for miembros in agrupar_duplicados(textos.items(), umbral=umbral):
+        # El más antiguo es el que más referencias suele acumular
+        miembros.sort(key=lambda i: (fechas[i] is None, fechas[i] or 0, str(i)))
+        grupos.append(
+            {
+                "tipo": tipo,
+                "id_destino": str(miembros[0]),
+                "ids_origen": [str(i) for i in miembros[1:]],
+                "registros": [{"id": str(i), "texto": textos[i]} for i in miembros],
+            }
+        )
+    grupos.sort(key=lambda g: -len(g["registros"]))
+    return grupos
+
+
+def main():
+    if len(sys.argv) < 2:
+        raise ValueError("Uso: python -m jobs.deduplicacion <tipo> [umbral] [salida]")
+    tipo = sys.argv[1]
+    umbral = float(sys.argv[2]) if len(sys.argv) > 2 else 0.7
+    salida = sys.argv[3] if len(sys.argv) > 3 else f"duplicados_{tipo}.json"
+    db = SessionLocal()
+    try:
+        grupos = detectar_duplicados(db, tipo, umbral=umbral)
+    finally:
+        db.close()
+
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(grupos, archivo, ensure_ascii=False, indent=2)
+    registros = sum(len(g["registros"]) for g in grupos)
+    print(
+        f"Detección completada: {len(grupos)} grupos con {registros} "
+        f"registros. Informe en {salida}."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Job de mantenimiento de las particiones mensuales de préstamos y multas.
+
+Crea por adelantado las particiones de los próximos meses para que las
+filas nuevas nunca caigan en la partición DEFAULT (una partición DEFAULT
+con datos impide crear después la partición de ese rango).
+
+Uso (por ejemplo, desde un cron diario):
+    python -m jobs.particiones [meses]
+"""
+
+import sys
+from datetime import date
+from typing import List
+
+from database.config import SessionLocal
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+TABLAS_PARTICIONADAS = ("prestamos", "multas")
+
+
+def _sumar_meses(fecha: date, meses: int) -> date:
+    """Primer día del mes desplazado `meses` respecto a `fecha`."""
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+def crear_particiones_futuras(
+    db: Session, meses: int = 3, hoy: date = None
+) -> List[str]:
+    """
+    Crear las particiones del mes actual y de los `meses` siguientes.
+
+    Args:
+        db: Sesión de base de datos
+        meses: Meses por delante del actual que deben existir
+        hoy: Fecha de referencia (por defecto, la fecha actual)
+
+    Returns:
+        Nombres de las particiones creadas (las existentes se omiten)
+    """
+    if meses < 0:
+        raise ValueError("El número de meses no puede ser negativo")
+
+    hoy = hoy or date.today()
+    creadas = []
+    for tabla in TABLAS_PARTICIONADAS:
+        for desplazamiento in range(meses + 1):
+            mes = _sumar_meses(hoy, desplazamiento)
+            nombre = db.execute(
+                text("SELECT crear_particion_mensual(:tabla, :mes)"),
+                {"tabla": tabla, "mes": mes},
+            ).scalar()
+            if nombre:
+                creadas.append(nombre)
+    db.commit()
+    return creadas
+
+
+def main():
+    meses = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    db = SessionLocal()
+    try:
+        creadas = crear_particiones_futuras(db, meses=meses)
+        if creadas:
+            print(f"Particiones creadas: {', '.join(creadas)}")
+        else:
+            print("Todas las particiones ya existían.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Job de reconciliación de los contadores de disponibilidad.
+
+Recalcula total, disponibles y en_prestamo de cada material a partir de
+items y prestamos, corrige las filas de disponibilidad_materiales que se
+hayan desviado (por escrituras fuera de los CRUD, restauraciones, etc.) y
+elimina las de materiales que ya no tienen ejemplares.
+
+Uso (por ejemplo, desde un cron nocturno):
+    python -m jobs.reconciliar_disponibilidad
+"""
+
+from typing import Dict
+
+from database.config import SessionLocal
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Conteos reales por material; un item cuenta como prestado si tiene algún
+# préstamo abierto (activo o vencido)
+CONTEOS_REALES = """
+SELECT coalesce(i.id_libro, i.id_revista, i.id_periodico) AS id_material,
+       i.tipo,
+       count(*) AS total,
+       count(*) FILTER (WHERE i.disponible) AS disponibles,
+       count(p.id_item) AS en_prestamo
+FROM items i
+LEFT JOIN (
+    SELECT DISTINCT id_item FROM prestamos WHERE estado IN ('activo', 'vencido')
+) p ON p.id_item = i.id
+GROUP BY 1, 2
+"""
+
+CORREGIR_DESVIADOS = f"""
+INSERT INTO disponibilidad_materiales AS d
+    (id_material, tipo, total, disponibles, en_prestamo)
+{CONTEOS_REALES}
+ON CONFLICT (id_material) DO UPDATE SET
+    tipo = EXCLUDED.tipo,
+    total = EXCLUDED.total,
+    disponibles = EXCLUDED.disponibles,
+    en_prestamo = EXCLUDED.en_prestamo,
+    fecha_actualizacion = now()
+WHERE (d.tipo, d.total, d.disponibles, d.en_prestamo) IS DISTINCT FROM
+      (EXCLUDED.tipo, EXCLUDED.total, EXCLUDED.disponibles, EXCLUDED.en_prestamo)
+"""
+
+ELIMINAR_HUERFANOS = """
+DELETE FROM disponibilidad_materiales d
+WHERE NOT EXISTS (
+    SELECT 1 FROM items i
+    WHERE i.id_libro = d.id_material
+       OR i.id_revista = d.id_material
+       OR i.id_periodico = d.id_material
+)
+"""
+
+
+def reconciliar_disponibilidad(db: Session) -> Dict[str, int]:
+    """
+    Corregir los contadores desviados en una sola transacción.
+
+    Returns:
+        {"corregidos": filas insertadas o corregidas, "eliminados": filas huérfanas}
+    """
+    try:
+        corregidos = db.execute(text(CORREGIR_DESVIADOS)).rowcount
+        eliminados = db.execute(text(ELIMINAR_HUERFANOS)).rowcount
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return {"corregidos": corregidos, "eliminados": eliminados}
+
+
+def main():
+    db = SessionLocal()
+    try:
+        resultado = reconciliar_disponibilidad(db)
+        print(
+            f"Reconciliación completada: {resultado['corregidos']} contadores "
+            f"corregidos, {resultado['eliminados']} eliminados."
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,31 @@ from contextlib import asynccontextmanager
 import uvicorn
 from apis import (
     auth,
+    autocompletado,
     autor,
+    busqueda,
     categoria,
+    deduplicacion,
     editorial,
+    importacion,
+    inventario,
     item,
     libro,
+    material,
     multa,
     periodico,
     prestamo,
     revista,
     usuario,
 )
-from database.config import create_tables
+from database.config import SessionLocal, create_tables
 from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from utils.autocompletado import cargar_autocompletado
+from utils.filtro_bloom import cargar_filtros
+from utils.indice_trigramas import cargar_indice
 
 
 @asynccontextmanager
@@ -29,6 +38,14 @@ async def lifespan(app: FastAPI):
     print("Iniciando sistema de biblioteca...")
     print("Configurando base de datos...")
     create_tables()
+    print("Cargando índices de búsqueda en memoria...")
+    db = SessionLocal()
+    try:
+        print(f"Documentos indexados: {cargar_indice(db)}")
+        print(f"Entradas de autocompletado: {cargar_autocompletado(db)}")
+        print(f"Valores en filtros de unicidad: {cargar_filtros(db)}")
+    finally:
+        db.close()
     print("Sistema listo.")
     print("Documentación: http://localhost:8000/docs")
     yield
@@ -61,8 +78,14 @@ app.include_router(libro.router, prefix="/api")
 app.include_router(revista.router, prefix="/api")
 app.include_router(periodico.router, prefix="/api")
 app.include_router(item.router, prefix="/api")
+app.include_router(material.router, prefix="/api")
 app.include_router(prestamo.router, prefix="/api")
 app.include_router(multa.router, prefix="/api")
+app.include_router(busqueda.router, prefix="/api")
+app.include_router(autocompletado.router, prefix="/api")
+app.include_router(deduplicacion.router, prefix="/api")
+app.include_router(importacion.router, prefix="/api")
+app.include_router(inventario.router, prefix="/api")
 
 
 @app.exception_handler(RequestValidationError)
@@ -92,8 +115,14 @@ async def root():
             "revistas": "/api/revistas",
             "periodicos": "/api/periodicos",
             "items": "/api/items",
+            "materiales": "/api/materiales",
             "prestamos": "/api/prestamos",
             "multas": "/api/multas",
+            "busqueda": "/api/buscar",
+            "autocompletado": "/api/autocomplete",
+            "deduplicacion": "/api/deduplicacion",
+            "importacion": "/api/importacion",
+            "inventario": "/api/inventario",
         },
     }
 
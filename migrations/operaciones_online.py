@@ -0,0 +1,371 @@
+"""
+Operaciones de migración que no bloquean las tablas en producción.
+
+- crear_indice_concurrente / eliminar_indice_concurrente: CREATE/DROP INDEX
+  CONCURRENTLY fuera de la transacción de la migración.
+- actualizar_por_lotes / eliminar_por_lotes: UPDATE/DELETE en lotes
+  pequeños recorridos por clave, cada uno en su propia transacción.
+- procesar_por_lotes: igual, pero calculando los valores nuevos en Python.
+
+Los recorridos por lotes guardan su avance en la tabla migracion_progreso,
+de modo que si la migración se interrumpe, al volver a ejecutarla se
+retoma desde el último lote confirmado. Cada lote debe ser idempotente:
+un lote interrumpido antes de guardar el avance se vuelve a procesar.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+from alembic import context, op
+from sqlalchemy import text
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+TABLA_PROGRESO = "migracion_progreso"
+
+
+def _modo_offline() -> bool:
+    return context.is_offline_mode()
+
+
+def crear_indice_concurrente(
+    nombre: str,
+    tabla: str,
+    columnas: Sequence[str],
+    unique: bool = False,
+    using: Optional[str] = None,
+    where: Optional[str] = None,
+) -> None:
+    """
+    Crear un índice con CREATE INDEX CONCURRENTLY, sin bloquear escrituras.
+
+    Args:
+        nombre: Nombre del índice
+        tabla: Tabla indexada
+        columnas: Columnas o expresiones SQL (admiten clase de operadores,
+            por ejemplo "titulo text_pattern_ops")
+        unique: Crear un índice único
+        using: Método de acceso (btree, gin, brin...)
+        where: Predicado para un índice parcial
+    """
+    if not _modo_offline():
+        # Un CREATE INDEX CONCURRENTLY fallido deja un índice inválido que
+        # IF NOT EXISTS daría por bueno: se elimina antes de reintentar
+        invalido = (
+            op.get_bind()
+            .execute(
+                text(
+                    "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                    "WHERE c.relname = :nombre AND NOT i.indisvalid"
+                ),
+                {"nombre": nombre},
+            )
+            .first()
+        )
+        if invalido:
+            eliminar_indice_concurrente(nombre)
+
+    sql = "CREATE {unico}INDEX CONCURRENTLY IF NOT EXISTS {nombre} ON {tabla}".format(
+        unico="UNIQUE " if unique else "", nombre=nombre, tabla=tabla
+    )
+    if using:
+        sql += f" USING {using}"
+    sql += f" ({', '.join(columnas)})"
+    if where:
+        sql += f" WHERE {where}"
+
+    with context.get_context().autocommit_block():
+        op.execute(sql)
+
+
+def eliminar_indice_concurrente(nombre: str) -> None:
+    """Eliminar un índice con DROP INDEX CONCURRENTLY."""
+    with context.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {nombre}")
+
+
+def _asegurar_tabla_progreso(conexion) -> None:
+    conexion.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {TABLA_PROGRESO} ("
+            "tarea VARCHAR(200) PRIMARY KEY, "
+            "ultima_clave TEXT, "
+            "filas BIGINT NOT NULL DEFAULT 0, "
+            "completada BOOLEAN NOT NULL DEFAULT FALSE, "
+            "fecha_actualizacion TIMESTAMPTZ NOT NULL DEFAULT now())"
+        )
+    )
+
+
+def _leer_progreso(conexion, tarea: str) -> Tuple[Optional[str], int, bool]:
+    fila = conexion.execute(
+        text(
+            f"SELECT ultima_clave, filas, completada FROM {TABLA_PROGRESO} "
+            "WHERE tarea = :tarea"
+        ),
+        {"tarea": tarea},
+    ).first()
+    if not fila:
+        return None, 0, False
+    return fila.ultima_clave, fila.filas, fila.completada
+
+
+def _guardar_progreso(
+    conexion, tarea: str, ultima_clave: Optional[str], filas: int, completada: bool
+) -> None:
+    conexion.execute(
+        text(
+            f"INSERT INTO {TABLA_PROGRESO} "
+            "(tarea, ultima_clave, filas, completada, fecha_actualizacion) "
+            "VALUES (:tarea, :ultima_clave, :filas, :completada, now()) "
+            "ON CONFLICT (tarea) DO UPDATE SET ultima_clave = EXCLUDED.ultima_clave, "
+            "filas = EXCLUDED.filas, completada = EXCLUDED.completada, "
+            "fecha_actualizacion = now()"
+        ),
+        {
+            "tarea": tarea,
+            "ultima_clave": ultima_clave,
+            "filas": filas,
+            "completada": completada,
+        },
+    )
+
+
+def _filas_estimadas(conexion, tabla: str) -> int:
+    estimadas = conexion.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE relname = :tabla"),
+        {"tabla": tabla},
+    ).scalar()
+    return max(estimadas or 0, 0)
+
+
+@contextmanager
+def _transaccion(conexion):
+    """
+    Transacción explícita dentro de un autocommit_block.
+
+    En el bloque la conexión está en AUTOCOMMIT (y ya dentro de la
+    transacción ficticia que abre Alembic), así que cada lote abre y
+    confirma la suya con BEGIN/COMMIT.
+    """
+    conexion.execute(text("BEGIN"))
+    try:
+        yield
+    except Exception:
+        conexion.execute(text("ROLLBACK"))
+        raise
+    conexion.execute(text("COMMIT"))
+
+
+def _recorrer_lotes(
+    tarea: str,
+    tabla: str,
+    paso: Callable[[Any, Optional[str]], Tuple[int, Optional[str]]],
+    pausa: float,
+) -> int:
+    """
+    Ejecutar `paso` hasta agotar la tabla, un lote por transacción.
+
+    `paso(conexion, ultima_clave)` procesa un lote a partir de la clave
+    indicada y devuelve (filas procesadas, última clave del lote), o
+    (0, None) cuando no quedan filas.
+    """
+    with context.get_context().autocommit_block():
+        conexion = op.get_bind()
+        _asegurar_tabla_progreso(conexion)
+        ultima_clave, filas, completada = _leer_progreso(conexion, tarea)
+        if completada:
+            logger.info(f"[{tarea}] ya completada ({filas} filas), se omite")
+            return filas
+        if ultima_clave:
+            logger.info(f"[{tarea}] retomando tras {filas} filas")
+
+        estimadas = _filas_estimadas(conexion, tabla)
+        inicio = time.monotonic()
+        while True:
+            with _transaccion(conexion):
+                procesadas, nueva_clave = paso(conexion, ultima_clave)
+                if not nueva_clave:
+                    _guardar_progreso(conexion, tarea, ultima_clave, filas, True)
+                    break
+                filas += procesadas
+                ultima_clave = nueva_clave
+                _guardar_progreso(conexion, tarea, ultima_clave, filas, False)
+
+            transcurrido = time.monotonic() - inicio
+            avance = f" (~{min(filas / estimadas, 1):.0%})" if estimadas else ""
+            logger.info(
+                f"[{tarea}] {filas} filas{avance}, {filas / max(transcurrido, 1e-6):.0f} filas/s"
+            )
+            if pausa:
+                time.sleep(pausa)
+
+    logger.info(f"[{tarea}] completada: {filas} filas")
+    return filas
+
+
+def _condicion_lote(clave: str, condicion: str, ultima_clave: Optional[str]) -> str:
+    desde = f"{clave} > :ultima_clave AND " if ultima_clave else ""
+    return f"{desde}({condicion})"
+
+
+def actualizar_por_lotes(
+    tarea: str,
+    tabla: str,
+    asignaciones: str,
+    condicion: str = "TRUE",
+    clave: str = "id",
+    tamano_lote: int = 5000,
+    pausa: float = 0.1,
+) -> int:
+    """
+    Ejecutar un UPDATE en lotes recorridos por clave.
+
+    Args:
+        tarea: Identificador único del recorrido (para retomarlo)
+        tabla: Tabla a actualizar
+        asignaciones: Cláusula SET, por ejemplo "estado = lower(estado)"
+        condicion: Filtro de las filas a actualizar
+        clave: Columna única y ordenable por la que se recorre la tabla
+        tamano_lote: Filas por lote (y por transacción)
+        pausa: Segundos de espera entre lotes para no saturar la BD
+
+    Returns:
+        Número de filas actualizadas
+    """
+    if _modo_offline():
+        op.execute(f"UPDATE {tabla} SET {asignaciones} WHERE {condicion}")
+        return 0
+
+    def paso(conexion, ultima_clave):
+        claves = (
+            conexion.execute(
+                text(
+                    f"UPDATE {tabla} SET {asignaciones} WHERE {clave} IN ("
+                    f"SELECT {clave} FROM {tabla} "
+                    f"WHERE {_condicion_lote(clave, condicion, ultima_clave)} "
+                    f"ORDER BY {clave} LIMIT :limite) RETURNING {clave}"
+                ),
+                {"ultima_clave": ultima_clave, "limite": tamano_lote},
+            )
+            .scalars()
+            .all()
+        )
+        if not claves:
+            return 0, None
+        return len(claves), str(max(claves))
+
+    return _recorrer_lotes(tarea, tabla, paso, pausa)
+
+
+def eliminar_por_lotes(
+    tarea: str,
+    tabla: str,
+    condicion: str,
+    clave: str = "id",
+    tamano_lote: int = 5000,
+    pausa: float = 0.1,
+) -> int:
+    """Ejecutar un DELETE en lotes recorridos por clave (ver actualizar_por_lotes)."""
+    if _modo_offline():
+        op.execute(f"DELETE FROM {tabla} WHERE {condicion}")
+        return 0
+
+    def paso(conexion, ultima_clave):
+        claves = (
+            conexion.execute(
+                text(
+                    f"DELETE FROM {tabla} WHERE {clave} IN ("
+                    f"SELECT {clave} FROM {tabla} "
+                    f"WHERE {_condicion_lote(clave, condicion, ultima_clave)} "
+                    f"ORDER BY {clave} LIMIT :limite) RETURNING {clave}"
+                ),
+                {"ultima_clave": ultima_clave, "limite": tamano_lote},
+            )
+            .scalars()
+            .all()
+        )
+        if not claves:
+            return 0, None
+        return len(claves), str(max(claves))
+
+    return _recorrer_lotes(tarea, tabla, paso, pausa)
+
+
+def procesar_por_lotes(
+    tarea: str,
+    tabla: str,
+    columnas: Sequence[str],
+    funcion: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+    condicion: str = "TRUE",
+    clave: str = "id",
+    tamano_lote: int = 2000,
+    pausa: float = 0.1,
+) -> int:
+    """
+    Recorrer una tabla por lotes calculando en Python los valores nuevos.
+
+    Args:
+        tarea: Identificador único del recorrido (para retomarlo)
+        tabla: Tabla a recorrer
+        columnas: Columnas que recibe `funcion` en cada fila
+        funcion: Recibe la fila como diccionario y devuelve las columnas a
+            actualizar, o None para dejarla igual
+        condicion: Filtro de las filas a recorrer
+        clave: Columna única y ordenable por la que se recorre la tabla
+        tamano_lote: Filas por lote (y por transacción)
+        pausa: Segundos de espera entre lotes
+
+    Returns:
+        Número de filas recorridas
+    """
+    if _modo_offline():
+        op.execute(f"-- procesar_por_lotes({tarea}) requiere ejecutar en modo online")
+        return 0
+
+    def paso(conexion, ultima_clave):
+        filas = (
+            conexion.execute(
+                text(
+                    f"SELECT {clave}, {', '.join(columnas)} FROM {tabla} "
+                    f"WHERE {_condicion_lote(clave, condicion, ultima_clave)} "
+                    f"ORDER BY {clave} LIMIT :limite"
+                ),
+                {"ultima_clave": ultima_clave, "limite": tamano_lote},
+            )
+            .mappings()
+            .all()
+        )
+        if not filas:
+            return 0, None
+
+        cambios_por_columnas = {}
+        for fila in filas:
+            cambios = funcion(dict(fila))
+            if cambios:
+                cambios_por_columnas.setdefault(tuple(sorted(cambios)), []).append(
+                    {**cambios, "_clave": fila[clave]}
+                )
+        for nombres, parametros in cambios_por_columnas.items():
+            asignaciones = ", ".join(f"{nombre} = :{nombre}" for nombre in nombres)
+            conexion.execute(
+                text(f"UPDATE {tabla} SET {asignaciones} WHERE {clave} = :_clave"),
+                parametros,
+            )
+        return len(filas), str(filas[-1][clave])
+
+    return _recorrer_lotes(tarea, tabla, paso, pausa)
+
+
+def limpiar_progreso(tarea: str) -> None:
+    """Olvidar el avance de una tarea (por ejemplo, en el downgrade)."""
+    # En modo offline los recorridos no guardan avance
+    if _modo_offline():
+        return
+    conexion = op.get_bind()
+    if conexion.execute(text("SELECT to_regclass(:t)"), {"t": TABLA_PROGRESO}).scalar():
+        conexion.execute(
+            text(f"DELETE FROM {TABLA_PROGRESO} WHERE tarea = :tarea"), {"tarea": tarea}
+        )
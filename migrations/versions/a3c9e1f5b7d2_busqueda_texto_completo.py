@@ -0,0 +1,100 @@
+"""Búsqueda de texto completo en libros, revistas y periódicos
+
+Revision ID: a3c9e1f5b7d2
+Revises: f2b8d4e6a1c7
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.operaciones_online import (
+    actualizar_por_lotes,
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+    limpiar_progreso,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "a3c9e1f5b7d2"
+down_revision: Union[str, None] = "f2b8d4e6a1c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS_MATERIAL = ("libros", "revistas", "periodicos")
+
+# El título pesa más (A) que el nombre del autor (B) en el ranking
+FUNCION_BUSQUEDA_MATERIAL = """
+CREATE OR REPLACE FUNCTION fn_material_busqueda()
+RETURNS trigger AS $$
+BEGIN
+    NEW.busqueda :=
+        setweight(to_tsvector('spanish', coalesce(NEW.titulo, '')), 'A') ||
+        setweight(to_tsvector('spanish', coalesce(
+            (SELECT nombre FROM autores WHERE id = NEW.id_autor), '')), 'B');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+# Al renombrar un autor se recalculan sus materiales; asignar id_autor a sí
+# mismo dispara el trigger de cada tabla
+FUNCION_BUSQUEDA_AUTOR = """
+CREATE OR REPLACE FUNCTION fn_autores_busqueda()
+RETURNS trigger AS $$
+BEGIN
+    UPDATE libros SET id_autor = id_autor WHERE id_autor = NEW.id;
+    UPDATE revistas SET id_autor = id_autor WHERE id_autor = NEW.id;
+    UPDATE periodicos SET id_autor = id_autor WHERE id_autor = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    # 1. Columnas y triggers que las mantienen
+    op.execute(FUNCION_BUSQUEDA_MATERIAL)
+    for tabla in TABLAS_MATERIAL:
+        op.add_column(tabla, sa.Column("busqueda", postgresql.TSVECTOR()))
+        op.execute(
+            f"CREATE TRIGGER trg_{tabla}_busqueda "
+            f"BEFORE INSERT OR UPDATE OF titulo, id_autor ON {tabla} "
+            "FOR EACH ROW EXECUTE FUNCTION fn_material_busqueda()"
+        )
+
+    op.execute(FUNCION_BUSQUEDA_AUTOR)
+    op.execute(
+        "CREATE TRIGGER trg_autores_busqueda "
+        "AFTER UPDATE OF nombre ON autores "
+        "FOR EACH ROW WHEN (OLD.nombre IS DISTINCT FROM NEW.nombre) "
+        "EXECUTE FUNCTION fn_autores_busqueda()"
+    )
+
+    # 2. Rellenar las filas existentes por lotes y crear los índices GIN
+    for tabla in TABLAS_MATERIAL:
+        actualizar_por_lotes(
+            f"{tabla}_busqueda",
+            tabla,
+            "id_autor = id_autor",
+            condicion="busqueda IS NULL",
+        )
+        crear_indice_concurrente(
+            f"idx_{tabla}_busqueda", tabla, ["busqueda"], using="gin"
+        )
+
+
+def downgrade() -> None:
+    for tabla in TABLAS_MATERIAL:
+        eliminar_indice_concurrente(f"idx_{tabla}_busqueda")
+
+    op.execute("DROP TRIGGER trg_autores_busqueda ON autores")
+    op.execute("DROP FUNCTION fn_autores_busqueda()")
+    for tabla in TABLAS_MATERIAL:
+        op.execute(f"DROP TRIGGER trg_{tabla}_busqueda ON {tabla}")
+        op.drop_column(tabla, "busqueda")
+        limpiar_progreso(f"{tabla}_busqueda")
+    op.execute("DROP FUNCTION fn_material_busqueda()")
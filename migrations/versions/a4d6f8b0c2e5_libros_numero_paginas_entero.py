@@ -0,0 +1,108 @@
+"""numero_paginas de libros como entero
+
+Revision ID: a4d6f8b0c2e5
+Revises: f3c5e7a9b1d2
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+import logging
+import re
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from migrations.operaciones_online import (
+    actualizar_por_lotes,
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+    limpiar_progreso,
+    procesar_por_lotes,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d6f8b0c2e5"
+down_revision: Union[str, None] = "f3c5e7a9b1d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+MAX_PAGINAS = 100000
+
+# Primer número del texto, admitiendo separador de miles ("1.200", "1 200")
+_NUMERO = re.compile(r"\d{1,3}(?:[.,\s]\d{3})+(?!\d)|\d+")
+
+
+def extraer_numero_paginas(texto: Optional[str]) -> Optional[int]:
+    """Rescatar el número de páginas de textos como "350", "350 págs." o "1.200"."""
+    encontrado = _NUMERO.search(texto or "")
+    if not encontrado:
+        return None
+    numero = int(re.sub(r"\D", "", encontrado.group()))
+    return numero if 1 <= numero <= MAX_PAGINAS else None
+
+
+def _convertir(fila):
+    numero = extraer_numero_paginas(fila["numero_paginas"])
+    if numero is None:
+        logger.warning(
+            f"Libro {fila['id']}: número de páginas "
+            f"{fila['numero_paginas']!r} no válido, queda vacío"
+        )
+        return None
+    return {"numero_paginas_num": numero}
+
+
+# Misma conversión en SQL para el script offline, que no puede ejecutar Python
+CONVERTIR_SQL = (
+    "UPDATE libros SET numero_paginas_num = CASE WHEN length(t.digitos) <= 6 "
+    f"AND t.digitos::integer BETWEEN 1 AND {MAX_PAGINAS} THEN t.digitos::integer END "
+    "FROM (SELECT id, substring(regexp_replace(numero_paginas, "
+    "'(\\d)[.,\\s](?=\\d{3}(\\D|$))', '\\1', 'g') FROM '\\d+') AS digitos "
+    "FROM libros WHERE numero_paginas IS NOT NULL) AS t WHERE libros.id = t.id"
+)
+
+
+def upgrade() -> None:
+    # 1. Columna entera nueva rellenada por lotes; lo que no se puede
+    #    interpretar queda en NULL
+    op.add_column("libros", sa.Column("numero_paginas_num", sa.Integer()))
+    if context.is_offline_mode():
+        op.execute(CONVERTIR_SQL)
+    else:
+        procesar_por_lotes(
+            "libros_numero_paginas",
+            "libros",
+            ["numero_paginas"],
+            _convertir,
+            condicion="numero_paginas IS NOT NULL",
+        )
+
+    # 2. Sustituir la columna de texto (cambios solo de catálogo)
+    op.drop_column("libros", "numero_paginas")
+    op.alter_column("libros", "numero_paginas_num", new_column_name="numero_paginas")
+    op.create_check_constraint(
+        "ck_libros_numero_paginas",
+        "libros",
+        f"numero_paginas BETWEEN 1 AND {MAX_PAGINAS}",
+    )
+
+    # 3. Índice para los filtros por rango de páginas
+    crear_indice_concurrente("idx_libros_numero_paginas", "libros", ["numero_paginas"])
+
+
+def downgrade() -> None:
+    eliminar_indice_concurrente("idx_libros_numero_paginas")
+    op.drop_constraint("ck_libros_numero_paginas", "libros", type_="check")
+    op.add_column("libros", sa.Column("numero_paginas_texto", sa.String(10)))
+    actualizar_por_lotes(
+        "libros_numero_paginas_texto",
+        "libros",
+        "numero_paginas_texto = numero_paginas::text",
+        condicion="numero_paginas IS NOT NULL",
+    )
+    op.drop_column("libros", "numero_paginas")
+    op.alter_column("libros", "numero_paginas_texto", new_column_name="numero_paginas")
+    limpiar_progreso("libros_numero_paginas_texto")
+    limpiar_progreso("libros_numero_paginas")
@@ -0,0 +1,73 @@
+"""ISBN-13 normalizado en libros
+
+Revision ID: b5d7f9a1c3e4
+Revises: a3c9e1f5b7d2
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from migrations.operaciones_online import (
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+    limpiar_progreso,
+    procesar_por_lotes,
+)
+from utils.isbn import isbn13_o_none
+
+# revision identifiers, used by Alembic.
+revision: str = "b5d7f9a1c3e4"
+down_revision: Union[str, None] = "a3c9e1f5b7d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _calcular_isbn13(fila):
+    return {"isbn13": isbn13_o_none(fila["isbn"])}
+
+
+def upgrade() -> None:
+    # 1. Columna nueva y relleno por lotes (los ISBN inválidos quedan en NULL)
+    op.add_column("libros", sa.Column("isbn13", sa.CHAR(13), nullable=True))
+    procesar_por_lotes(
+        "libros_isbn13",
+        "libros",
+        ["isbn"],
+        _calcular_isbn13,
+        condicion="isbn IS NOT NULL AND isbn13 IS NULL",
+    )
+
+    # 2. Formas distintas del mismo ISBN: se conserva el libro más antiguo
+    quitar_duplicados = (
+        "UPDATE libros SET isbn13 = NULL WHERE id IN ("
+        "SELECT id FROM (SELECT id, row_number() OVER ("
+        "PARTITION BY isbn13 ORDER BY fecha_creacion, id) AS orden "
+        "FROM libros WHERE isbn13 IS NOT NULL) AS t WHERE orden > 1)"
+    )
+    if context.is_offline_mode():
+        op.execute(quitar_duplicados)
+    else:
+        duplicados = op.get_bind().execute(
+            sa.text(quitar_duplicados + " RETURNING id, isbn")
+        )
+        for id_libro, isbn in duplicados:
+            logger.warning(
+                f"Libro {id_libro}: ISBN {isbn} duplicado, isbn13 queda vacío"
+            )
+
+    # 3. El índice único del ISBN-13 sustituye al del texto original
+    crear_indice_concurrente("uq_libros_isbn13", "libros", ["isbn13"], unique=True)
+    op.drop_constraint("libros_isbn_key", "libros", type_="unique")
+
+
+def downgrade() -> None:
+    op.create_unique_constraint("libros_isbn_key", "libros", ["isbn"])
+    eliminar_indice_concurrente("uq_libros_isbn13")
+    op.drop_column("libros", "isbn13")
+    limpiar_progreso("libros_isbn13")
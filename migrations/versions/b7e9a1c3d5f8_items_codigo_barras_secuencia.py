@@ -0,0 +1,67 @@
+"""Secuencia y reserva en bloque de códigos de barras de items
+
+Revision ID: b7e9a1c3d5f8
+Revises: a4d6f8b0c2e5
+Create Date: 2026-10-19 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e9a1c3d5f8"
+down_revision: Union[str, None] = "a4d6f8b0c2e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Los códigos ya existentes con el formato generado ("20" + 10 dígitos +
+# control) no deben volver a salir de la secuencia
+AJUSTAR_SECUENCIA = """
+SELECT setval('items_codigo_barras_seq', max(substring(codigo_barras, 3, 10)::bigint))
+FROM items
+WHERE codigo_barras ~ '^20[0-9]{11}$'
+HAVING max(substring(codigo_barras, 3, 10)::bigint) > 0
+"""
+
+# nextval + setval reservan un bloque contiguo; el bloqueo consultivo de
+# sesión evita que otra reserva se intercale entre ambos y se libera en
+# cuanto termina la función, sin esperar al commit
+FUNCION_RESERVAR = """
+CREATE OR REPLACE FUNCTION reservar_codigos_barras(cantidad integer)
+RETURNS bigint AS $$
+DECLARE
+    primero bigint;
+BEGIN
+    IF cantidad IS NULL OR cantidad < 1 THEN
+        RAISE EXCEPTION 'La cantidad de códigos debe ser positiva';
+    END IF;
+    PERFORM pg_advisory_lock(hashtext('items_codigo_barras_seq'));
+    BEGIN
+        primero := nextval('items_codigo_barras_seq');
+        IF cantidad > 1 THEN
+            PERFORM setval('items_codigo_barras_seq', primero + cantidad - 1);
+        END IF;
+    EXCEPTION WHEN OTHERS THEN
+        PERFORM pg_advisory_unlock(hashtext('items_codigo_barras_seq'));
+        RAISE;
+    END;
+    PERFORM pg_advisory_unlock(hashtext('items_codigo_barras_seq'));
+    RETURN primero;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE SEQUENCE items_codigo_barras_seq "
+        "AS bigint MINVALUE 1 MAXVALUE 9999999999 NO CYCLE"
+    )
+    op.execute(AJUSTAR_SECUENCIA)
+    op.execute(FUNCION_RESERVAR)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION IF EXISTS reservar_codigos_barras(integer)")
+    op.execute("DROP SEQUENCE IF EXISTS items_codigo_barras_seq")
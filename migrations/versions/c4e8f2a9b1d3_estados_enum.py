@@ -0,0 +1,112 @@
+"""Convertir columnas de estado a tipos ENUM de PostgreSQL
+
+Revision ID: c4e8f2a9b1d3
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8f2a9b1d3"
+down_revision: Union[str, None] = "a1b2c3d4e5f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ESTADOS_PRESTAMO = ("activo", "devuelto", "vencido")
+ESTADOS_MULTA = ("pendiente", "pagada", "cancelada")
+ESTADOS_FISICOS = ("bueno", "regular", "malo", "reparacion")
+
+
+def _crear_tipo(nombre: str, valores: Sequence[str]) -> None:
+    literales = ", ".join(f"'{valor}'" for valor in valores)
+    op.execute(f"CREATE TYPE {nombre} AS ENUM ({literales})")
+
+
+def _convertir_a_enum(
+    tabla: str, columna: str, tipo: str, valores: Sequence[str], defecto: str
+) -> None:
+    op.alter_column(tabla, columna, server_default=None)
+    op.alter_column(
+        tabla,
+        columna,
+        type_=postgresql.ENUM(*valores, name=tipo, create_type=False),
+        postgresql_using=f"{columna}::{tipo}",
+        existing_nullable=True,
+    )
+    op.alter_column(
+        tabla, columna, server_default=sa.text(f"'{defecto}'"), nullable=False
+    )
+
+
+def _convertir_a_texto(
+    tabla: str, columna: str, longitud: int, defecto: Union[str, None] = None
+) -> None:
+    op.alter_column(tabla, columna, server_default=None)
+    op.alter_column(
+        tabla,
+        columna,
+        type_=sa.String(length=longitud),
+        postgresql_using=f"{columna}::text",
+        nullable=True,
+    )
+    if defecto:
+        op.alter_column(tabla, columna, server_default=defecto)
+
+
+def upgrade() -> None:
+    # 1. Normalizar los valores existentes para que el cast no falle
+    op.execute("UPDATE prestamos SET estado = lower(trim(estado))")
+    op.execute(
+        "UPDATE prestamos SET estado = CASE "
+        "WHEN fecha_devolucion_real IS NOT NULL THEN 'devuelto' ELSE 'activo' END "
+        "WHERE estado IS NULL OR estado NOT IN ('activo', 'devuelto', 'vencido')"
+    )
+    op.execute("UPDATE multas SET estado = lower(trim(estado))")
+    op.execute(
+        "UPDATE multas SET estado = CASE "
+        "WHEN fecha_pago IS NOT NULL THEN 'pagada' ELSE 'pendiente' END "
+        "WHERE estado IS NULL OR estado NOT IN ('pendiente', 'pagada', 'cancelada')"
+    )
+    op.execute("UPDATE items SET estado_fisico = lower(trim(estado_fisico))")
+    op.execute(
+        "UPDATE items SET estado_fisico = 'bueno' WHERE estado_fisico IS NULL "
+        "OR estado_fisico NOT IN ('bueno', 'regular', 'malo', 'reparacion')"
+    )
+
+    # 2. Crear los tipos ENUM (4 bytes por valor frente al varchar original)
+    _crear_tipo("estado_prestamo", ESTADOS_PRESTAMO)
+    _crear_tipo("estado_multa", ESTADOS_MULTA)
+    _crear_tipo("estado_fisico_item", ESTADOS_FISICOS)
+
+    # 3. Convertir las columnas
+    _convertir_a_enum(
+        "prestamos", "estado", "estado_prestamo", ESTADOS_PRESTAMO, "activo"
+    )
+    _convertir_a_enum("multas", "estado", "estado_multa", ESTADOS_MULTA, "pendiente")
+    _convertir_a_enum(
+        "items", "estado_fisico", "estado_fisico_item", ESTADOS_FISICOS, "bueno"
+    )
+
+    # 4. Índices para las consultas filtradas por estado
+    op.create_index("idx_prestamos_estado", "prestamos", ["estado"])
+    op.create_index("idx_prestamos_item_estado", "prestamos", ["id_item", "estado"])
+    op.create_index("idx_multas_estado", "multas", ["estado"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_multas_estado", "multas")
+    op.drop_index("idx_prestamos_item_estado", "prestamos")
+    op.drop_index("idx_prestamos_estado", "prestamos")
+
+    _convertir_a_texto("items", "estado_fisico", 50, "bueno")
+    _convertir_a_texto("multas", "estado", 20)
+    _convertir_a_texto("prestamos", "estado", 20)
+
+    op.execute("DROP TYPE estado_fisico_item")
+    op.execute("DROP TYPE estado_multa")
+    op.execute("DROP TYPE estado_prestamo")
@@ -0,0 +1,32 @@
+"""Índices (titulo, id) para el listado paginado de materiales
+
+Revision ID: c6e8a0b2d4f7
+Revises: b5d7f9a1c3e4
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.operaciones_online import (
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e8a0b2d4f7"
+down_revision: Union[str, None] = "b5d7f9a1c3e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS_MATERIAL = ("libros", "revistas", "periodicos")
+
+
+def upgrade() -> None:
+    # El listado de /materiales pagina cada tabla por (titulo, id)
+    for tabla in TABLAS_MATERIAL:
+        crear_indice_concurrente(f"idx_{tabla}_titulo_id", tabla, ["titulo", "id"])
+
+
+def downgrade() -> None:
+    for tabla in TABLAS_MATERIAL:
+        eliminar_indice_concurrente(f"idx_{tabla}_titulo_id")
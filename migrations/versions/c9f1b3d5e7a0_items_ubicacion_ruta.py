@@ -0,0 +1,65 @@
+"""Ruta jerárquica de ubicación de items
+
+Revision ID: c9f1b3d5e7a0
+Revises: b7e9a1c3d5f8
+Create Date: 2026-10-19 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.operaciones_online import (
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+    limpiar_progreso,
+    procesar_por_lotes,
+)
+
+# Se usa el mismo analizador que la aplicación para que las rutas guardadas
+# coincidan con los prefijos que normalizan las consultas
+from utils.ubicacion import ruta_de_ubicacion
+
+# revision identifiers, used by Alembic.
+revision: str = "c9f1b3d5e7a0"
+down_revision: Union[str, None] = "b7e9a1c3d5f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _convertir(fila):
+    try:
+        ruta = ruta_de_ubicacion(fila["ubicacion"])
+    except ValueError:
+        return None
+    return {"ubicacion_ruta": ruta} if ruta else None
+
+
+def upgrade() -> None:
+    # 1. Columna con intercalación "C": LIKE 'prefijo%' y ORDER BY usan el
+    #    mismo índice B-tree, como text_pattern_ops pero también para ordenar
+    op.add_column(
+        "items",
+        sa.Column("ubicacion_ruta", sa.String(255, collation="C"), nullable=True),
+    )
+
+    # 2. Analizar las ubicaciones existentes por lotes
+    procesar_por_lotes(
+        "items_ubicacion_ruta",
+        "items",
+        ["ubicacion"],
+        _convertir,
+        condicion="ubicacion IS NOT NULL",
+    )
+
+    # 3. Índice para recorrer subárboles por prefijo
+    crear_indice_concurrente(
+        "idx_items_ubicacion_ruta", "items", ["ubicacion_ruta", "id"]
+    )
+
+
+def downgrade() -> None:
+    eliminar_indice_concurrente("idx_items_ubicacion_ruta")
+    op.drop_column("items", "ubicacion_ruta")
+    limpiar_progreso("items_ubicacion_ruta")
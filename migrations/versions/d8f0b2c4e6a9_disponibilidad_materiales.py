@@ -0,0 +1,51 @@
+"""Contadores de disponibilidad por material
+
+Revision ID: d8f0b2c4e6a9
+Revises: c6e8a0b2d4f7
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d8f0b2c4e6a9"
+down_revision: Union[str, None] = "c6e8a0b2d4f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "disponibilidad_materiales",
+        sa.Column("id_material", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("tipo", sa.String(length=10), nullable=False),
+        sa.Column("total", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("disponibles", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("en_prestamo", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "fecha_actualizacion",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id_material"),
+    )
+
+    # Carga inicial con la misma consulta que usa el job de reconciliación
+    op.execute(
+        "INSERT INTO disponibilidad_materiales "
+        "(id_material, tipo, total, disponibles, en_prestamo) "
+        "SELECT coalesce(i.id_libro, i.id_revista, i.id_periodico), i.tipo, "
+        "count(*), count(*) FILTER (WHERE i.disponible), count(p.id_item) "
+        "FROM items i LEFT JOIN (SELECT DISTINCT id_item FROM prestamos "
+        "WHERE estado IN ('activo', 'vencido')) p ON p.id_item = i.id "
+        "GROUP BY 1, 2"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("disponibilidad_materiales")
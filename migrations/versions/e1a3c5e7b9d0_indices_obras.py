@@ -0,0 +1,40 @@
+"""Índices (id_autor|id_editorial|id_categoria, titulo, id) para las obras
+
+Revision ID: e1a3c5e7b9d0
+Revises: d8f0b2c4e6a9
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.operaciones_online import (
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "e1a3c5e7b9d0"
+down_revision: Union[str, None] = "d8f0b2c4e6a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS_MATERIAL = ("libros", "revistas", "periodicos")
+RELACIONES = ("autor", "editorial", "categoria")
+
+
+def upgrade() -> None:
+    # Las obras de un autor, editorial o categoría se paginan por (titulo, id)
+    # dentro de cada tabla; el índice devuelve la página ya ordenada
+    for tabla in TABLAS_MATERIAL:
+        for relacion in RELACIONES:
+            crear_indice_concurrente(
+                f"idx_{tabla}_{relacion}_titulo",
+                tabla,
+                [f"id_{relacion}", "titulo", "id"],
+            )
+
+
+def downgrade() -> None:
+    for tabla in TABLAS_MATERIAL:
+        for relacion in RELACIONES:
+            eliminar_indice_concurrente(f"idx_{tabla}_{relacion}_titulo")
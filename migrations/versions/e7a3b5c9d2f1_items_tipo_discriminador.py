@@ -0,0 +1,43 @@
+"""Agregar discriminador tipo materializado en items
+
+Revision ID: e7a3b5c9d2f1
+Revises: c4e8f2a9b1d3
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a3b5c9d2f1"
+down_revision: Union[str, None] = "c4e8f2a9b1d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Columna generada: se deriva de la misma FK que valida chk_item_tipo,
+    # por lo que nunca puede quedar desincronizada
+    op.add_column(
+        "items",
+        sa.Column(
+            "tipo",
+            sa.String(length=10),
+            sa.Computed(
+                "CASE WHEN id_libro IS NOT NULL THEN 'libro' "
+                "WHEN id_revista IS NOT NULL THEN 'revista' "
+                "WHEN id_periodico IS NOT NULL THEN 'periodico' END",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index("idx_items_tipo_disponible", "items", ["tipo", "disponible"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_items_tipo_disponible", "items")
+    op.drop_column("items", "tipo")
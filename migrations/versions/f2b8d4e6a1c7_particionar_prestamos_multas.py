@@ -0,0 +1,232 @@
+"""Particionar prestamos y multas por rango mensual de fecha
+
+Revision ID: f2b8d4e6a1c7
+Revises: e7a3b5c9d2f1
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8d4e6a1c7"
+down_revision: Union[str, None] = "e7a3b5c9d2f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Meses por delante del actual que se crean en la migración; el job
+# jobs.particiones mantiene este margen después
+MESES_ADELANTE = 3
+
+COLUMNAS_PRESTAMOS = (
+    "id, id_item, id_usuario, fecha_prestamo, fecha_devolucion_estimada, "
+    "fecha_devolucion_real, estado, id_usuario_creacion, id_usuario_edicion, "
+    "fecha_creacion, fecha_actualizacion"
+)
+COLUMNAS_MULTAS = (
+    "id, id_prestamo, id_usuario, monto, motivo, fecha_multa, fecha_pago, estado, "
+    "id_usuario_creacion, id_usuario_edicion, fecha_creacion, fecha_actualizacion"
+)
+
+FUNCION_CREAR_PARTICION = """
+CREATE OR REPLACE FUNCTION crear_particion_mensual(tabla text, mes date)
+RETURNS text AS $$
+DECLARE
+    inicio date := date_trunc('month', mes)::date;
+    nombre text := format('%s_y%sm%s', tabla, to_char(inicio, 'YYYY'), to_char(inicio, 'MM'));
+BEGIN
+    IF to_regclass(nombre) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format(
+        'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        nombre, tabla, inicio, (inicio + interval '1 month')::date
+    );
+    RETURN nombre;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+FUNCION_FECHA_PRESTAMO_MULTA = """
+CREATE OR REPLACE FUNCTION fn_multas_fecha_prestamo()
+RETURNS trigger AS $$
+BEGIN
+    SELECT fecha_prestamo INTO NEW.fecha_prestamo
+    FROM prestamos WHERE id = NEW.id_prestamo;
+    IF NOT FOUND THEN
+        RAISE foreign_key_violation
+            USING MESSAGE = format('El préstamo %s no existe', NEW.id_prestamo);
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def _crear_particiones(tabla: str, origen: str, columna: str) -> None:
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            mes date;
+        BEGIN
+            FOR mes IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce((SELECT min({columna}) FROM {origen}), now())),
+                    date_trunc('month', now()) + interval '{MESES_ADELANTE} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                PERFORM crear_particion_mensual('{tabla}', mes);
+            END LOOP;
+        END
+        $$
+        """
+    )
+    op.execute(f"CREATE TABLE {tabla}_default PARTITION OF {tabla} DEFAULT")
+
+
+def upgrade() -> None:
+    op.execute(FUNCION_CREAR_PARTICION)
+
+    # 1. Apartar las tablas actuales
+    op.execute("ALTER TABLE multas RENAME TO multas_legacy")
+    op.execute("ALTER TABLE prestamos RENAME TO prestamos_legacy")
+
+    # 2. Crear las tablas particionadas con las mismas columnas
+    op.execute(
+        "CREATE TABLE prestamos (LIKE prestamos_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (fecha_prestamo)"
+    )
+    op.execute("ALTER TABLE prestamos ALTER COLUMN fecha_prestamo SET NOT NULL")
+    op.execute(
+        "CREATE TABLE multas (LIKE multas_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (fecha_multa)"
+    )
+    op.execute("ALTER TABLE multas ALTER COLUMN fecha_multa SET NOT NULL")
+    # Copia de la clave de partición del préstamo para poder referenciarlo
+    op.execute("ALTER TABLE multas ADD COLUMN fecha_prestamo TIMESTAMPTZ")
+
+    _crear_particiones("prestamos", "prestamos_legacy", "fecha_prestamo")
+    _crear_particiones("multas", "multas_legacy", "fecha_multa")
+
+    # 3. Copiar los datos
+    op.execute(
+        f"INSERT INTO prestamos ({COLUMNAS_PRESTAMOS}) "
+        "SELECT id, id_item, id_usuario, "
+        "coalesce(fecha_prestamo, fecha_creacion, now()), "
+        "fecha_devolucion_estimada, fecha_devolucion_real, estado, "
+        "id_usuario_creacion, id_usuario_edicion, fecha_creacion, "
+        "fecha_actualizacion FROM prestamos_legacy"
+    )
+    op.execute(
+        f"INSERT INTO multas ({COLUMNAS_MULTAS}, fecha_prestamo) "
+        "SELECT m.id, m.id_prestamo, m.id_usuario, m.monto, m.motivo, "
+        "coalesce(m.fecha_multa, m.fecha_creacion, now()), m.fecha_pago, "
+        "m.estado, m.id_usuario_creacion, m.id_usuario_edicion, "
+        "m.fecha_creacion, m.fecha_actualizacion, p.fecha_prestamo "
+        "FROM multas_legacy m JOIN prestamos p ON p.id = m.id_prestamo"
+    )
+
+    op.execute("DROP TABLE multas_legacy")
+    op.execute("DROP TABLE prestamos_legacy")
+
+    # 4. Claves, índices y relaciones (la clave de partición forma parte de
+    # toda restricción única)
+    op.execute(
+        "ALTER TABLE prestamos ADD CONSTRAINT prestamos_pkey "
+        "PRIMARY KEY (id, fecha_prestamo)"
+    )
+    op.execute(
+        "ALTER TABLE prestamos ADD CONSTRAINT prestamos_id_item_fkey "
+        "FOREIGN KEY (id_item) REFERENCES items (id)"
+    )
+    op.execute(
+        "ALTER TABLE prestamos ADD CONSTRAINT prestamos_id_usuario_fkey "
+        "FOREIGN KEY (id_usuario) REFERENCES tbl_usuarios (id)"
+    )
+    op.create_index("ix_prestamos_id", "prestamos", ["id"])
+    op.create_index("idx_prestamos_estado", "prestamos", ["estado"])
+    op.create_index("idx_prestamos_item_estado", "prestamos", ["id_item", "estado"])
+    op.create_index("idx_prestamos_usuario", "prestamos", ["id_usuario"])
+
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_pkey PRIMARY KEY (id, fecha_multa)"
+    )
+    op.execute("ALTER TABLE multas ALTER COLUMN fecha_prestamo SET NOT NULL")
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_id_prestamo_fkey "
+        "FOREIGN KEY (id_prestamo, fecha_prestamo) "
+        "REFERENCES prestamos (id, fecha_prestamo)"
+    )
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_id_usuario_fkey "
+        "FOREIGN KEY (id_usuario) REFERENCES tbl_usuarios (id)"
+    )
+    op.create_index("ix_multas_id", "multas", ["id"])
+    op.create_index("idx_multas_estado", "multas", ["estado"])
+    op.create_index("idx_multas_prestamo", "multas", ["id_prestamo"])
+
+    # 5. El ORM no conoce fecha_prestamo en multas: se completa en la BD
+    op.execute(FUNCION_FECHA_PRESTAMO_MULTA)
+    op.execute(
+        "CREATE TRIGGER trg_multas_fecha_prestamo "
+        "BEFORE INSERT OR UPDATE OF id_prestamo ON multas "
+        "FOR EACH ROW EXECUTE FUNCTION fn_multas_fecha_prestamo()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE multas RENAME TO multas_particionada")
+    op.execute("ALTER TABLE prestamos RENAME TO prestamos_particionada")
+
+    op.execute(
+        "CREATE TABLE prestamos " "(LIKE prestamos_particionada INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE prestamos ALTER COLUMN fecha_prestamo DROP NOT NULL")
+    op.execute(
+        f"INSERT INTO prestamos ({COLUMNAS_PRESTAMOS}) "
+        f"SELECT {COLUMNAS_PRESTAMOS} FROM prestamos_particionada"
+    )
+    op.execute("CREATE TABLE multas (LIKE multas_particionada INCLUDING DEFAULTS)")
+    op.execute("ALTER TABLE multas DROP COLUMN fecha_prestamo")
+    op.execute("ALTER TABLE multas ALTER COLUMN fecha_multa DROP NOT NULL")
+    op.execute(
+        f"INSERT INTO multas ({COLUMNAS_MULTAS}) "
+        f"SELECT {COLUMNAS_MULTAS} FROM multas_particionada"
+    )
+
+    op.execute("DROP TABLE multas_particionada CASCADE")
+    op.execute("DROP TABLE prestamos_particionada CASCADE")
+    op.execute("DROP FUNCTION fn_multas_fecha_prestamo()")
+    op.execute("DROP FUNCTION crear_particion_mensual(text, date)")
+
+    op.execute("ALTER TABLE prestamos ADD CONSTRAINT prestamos_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE prestamos ADD CONSTRAINT prestamos_id_item_fkey "
+        "FOREIGN KEY (id_item) REFERENCES items (id)"
+    )
+    op.execute(
+        "ALTER TABLE prestamos ADD CONSTRAINT prestamos_id_usuario_fkey "
+        "FOREIGN KEY (id_usuario) REFERENCES tbl_usuarios (id)"
+    )
+    op.create_index("ix_prestamos_id", "prestamos", ["id"])
+    op.create_index("idx_prestamos_estado", "prestamos", ["estado"])
+    op.create_index("idx_prestamos_item_estado", "prestamos", ["id_item", "estado"])
+
+    op.execute("ALTER TABLE multas ADD CONSTRAINT multas_pkey PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_id_prestamo_key UNIQUE (id_prestamo)"
+    )
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_id_prestamo_fkey "
+        "FOREIGN KEY (id_prestamo) REFERENCES prestamos (id)"
+    )
+    op.execute(
+        "ALTER TABLE multas ADD CONSTRAINT multas_id_usuario_fkey "
+        "FOREIGN KEY (id_usuario) REFERENCES tbl_usuarios (id)"
+    )
+    op.create_index("ix_multas_id", "multas", ["id"])
+    op.create_index("idx_multas_estado", "multas", ["estado"])
@@ -0,0 +1,34 @@
+"""Índice BRIN sobre periodicos.fecha_publicacion
+
+Revision ID: f3c5e7a9b1d2
+Revises: e1a3c5e7b9d0
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from migrations.operaciones_online import (
+    crear_indice_concurrente,
+    eliminar_indice_concurrente,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = "f3c5e7a9b1d2"
+down_revision: Union[str, None] = "e1a3c5e7b9d0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Los periódicos se insertan aproximadamente por fecha de publicación, así
+    # que cada rango de páginas cubre pocos días y el BRIN ocupa unos KB
+    crear_indice_concurrente(
+        "idx_periodicos_fecha_brin",
+        "periodicos",
+        ["fecha_publicacion"],
+        using="brin",
+    )
+
+
+def downgrade() -> None:
+    eliminar_indice_concurrente("idx_periodicos_fecha_brin")
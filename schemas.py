@@ -1,9 +1,9 @@
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Generic, List, Optional, TypeVar
 from uuid import UUID
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UsuarioBase(BaseModel):
@@ -134,7 +134,7 @@ class CategoriaResponse(CategoriaBase):
 class LibroBase(BaseModel):
     titulo: str
     isbn: Optional[str] = None
-    numero_paginas: Optional[str] = None
+    numero_paginas: Optional[int] = Field(None, ge=1, le=100000)
     id_editorial: UUID
     id_autor: Optional[
         UUID
@@ -150,7 +150,7 @@ class LibroCreate(LibroBase):
 class LibroUpdate(BaseModel):
     titulo: Optional[str] = None
     isbn: Optional[str] = None
-    numero_paginas: Optional[str] = None
+    numero_paginas: Optional[int] = Field(None, ge=1, le=100000)
     id_editorial: Optional[UUID] = None
     id_autor: Optional[UUID] = None
     id_categoria: Optional[UUID] = None
@@ -159,6 +159,7 @@ class LibroUpdate(BaseModel):
 
 class LibroResponse(LibroBase):
     id: UUID
+    isbn13: Optional[str] = None
     fecha_creacion: datetime
     fecha_actualizacion: Optional[datetime] = None
 
@@ -232,7 +233,7 @@ class PeriodicoResponse(PeriodicoBase):
         from_attributes = True
 
 
-class ItemCreate(BaseModel):
+class ItemBase(BaseModel):
     id_libro: Optional[UUID] = None
     id_revista: Optional[UUID] = None
     id_periodico: Optional[UUID] = None
@@ -241,9 +242,30 @@ class ItemCreate(BaseModel):
     estado_fisico: Optional[str] = "bueno"
     disponible: bool = True
     observaciones: Optional[str] = None
+
+
+class ItemCreate(ItemBase):
+    id_usuario_creacion: UUID
+
+
+class ItemsLoteCreate(BaseModel):
+    items: List[ItemBase] = Field(..., min_length=1, max_length=1000)
     id_usuario_creacion: UUID
 
 
+class CodigosBarrasReserva(BaseModel):
+    cantidad: int = Field(..., ge=1, le=10000)
+
+
+class CodigosBarrasResponse(BaseModel):
+    codigos: List[str]
+
+
+class ErrorFila(BaseModel):
+    indice: int  # posición de la fila en el lote
+    error: str
+
+
 class ItemUpdate(BaseModel):
     id_libro: Optional[UUID] = None
     id_revista: Optional[UUID] = None
@@ -256,6 +278,31 @@ class ItemUpdate(BaseModel):
     id_usuario_edicion: UUID
 
 
+class FiltroItems(BaseModel):
+    # Exactamente uno: ids, códigos de barras o ruta de ubicación (subárbol)
+    ids: Optional[List[UUID]] = Field(None, max_length=1000)
+    codigos_barras: Optional[List[str]] = Field(None, max_length=1000)
+    ruta: Optional[str] = None
+
+
+class CambiosItems(BaseModel):
+    # Solo se aplican los campos enviados; null borra ubicación u observaciones
+    ubicacion: Optional[str] = None
+    estado_fisico: Optional[str] = None
+    observaciones: Optional[str] = None
+
+
+class ItemsLoteUpdate(BaseModel):
+    filtro: FiltroItems
+    cambios: CambiosItems
+    id_usuario_edicion: UUID
+
+
+class ItemsLoteUpdateResponse(BaseModel):
+    actualizados: int
+    ids: List[UUID]
+
+
 class ItemResponse(BaseModel):
     id: UUID
     id_libro: Optional[UUID] = None
@@ -264,6 +311,7 @@ class ItemResponse(BaseModel):
     tipo_item: str  # Calculado: "libro", "revista", "periodico"
     codigo_barras: Optional[str] = None
     ubicacion: Optional[str] = None
+    ubicacion_ruta: Optional[str] = None
     estado_fisico: str
     disponible: bool
     observaciones: Optional[str] = None
@@ -276,6 +324,32 @@ class ItemResponse(BaseModel):
         from_attributes = True
 
 
+class ItemsUbicacionResponse(BaseModel):
+    ruta: str
+    items: List[ItemResponse]
+    siguiente_cursor: Optional[str] = None
+
+
+class ConteoNodoUbicacion(BaseModel):
+    segmento: str
+    ruta: str
+    total: int
+    disponibles: int
+
+
+class ConteoUbicacionResponse(BaseModel):
+    ruta: str
+    total: int
+    disponibles: int
+    en_nodo: int  # items del propio nodo, no de sus hijos
+    hijos: List[ConteoNodoUbicacion]
+
+
+class ItemsLoteResponse(BaseModel):
+    creados: List[ItemResponse]  # en el orden del lote, sin las filas con error
+    errores: List[ErrorFila]
+
+
 class PrestamoBase(BaseModel):
     id_item: UUID
     id_usuario: UUID
@@ -347,6 +421,23 @@ class MultaResponse(MultaBase):
         from_attributes = True
 
 
+T = TypeVar("T")
+
+
+class IdsLote(BaseModel):
+    ids: List[UUID] = Field(..., min_length=1, max_length=1000)
+
+
+class ResultadoLote(BaseModel, Generic[T]):
+    id: UUID
+    encontrado: bool
+    dato: Optional[T] = None  # None si el id no existe
+
+
+class ResultadosLote(BaseModel, Generic[T]):
+    resultados: List[ResultadoLote[T]]  # en el orden de los ids pedidos
+
+
 class RespuestaAPI(BaseModel):
     mensaje: str
     success: bool = True
@@ -358,3 +449,128 @@ class RespuestaError(BaseModel):
     exito: bool = False
     error: str
     codigo: int
+
+
+class BusquedaResultado(BaseModel):
+    tipo: str  # "libro", "revista" o "periodico"
+    id: UUID
+    titulo: str
+    autor: str
+    rango: float
+
+
+class BusquedaResponse(BaseModel):
+    resultados: List[BusquedaResultado]
+    siguiente_cursor: Optional[str] = None
+
+
+class CoincidenciaAproximada(BaseModel):
+    tipo: str  # "libro", "revista", "periodico" o "autor"
+    id: UUID
+    texto: str
+    similitud: float
+
+
+class SugerenciaAutocompletado(BaseModel):
+    tipo: str  # "libro", "revista", "periodico", "autor", "editorial" o "categoria"
+    id: UUID
+    texto: str
+
+
+class MaterialResumen(BaseModel):
+    tipo: str  # "libro", "revista" o "periodico"
+    id: UUID
+    titulo: str
+    id_autor: Optional[UUID] = None
+    id_editorial: UUID
+    id_categoria: Optional[UUID] = None
+    total_items: int
+    items_disponibles: int
+    items_en_prestamo: int
+
+
+class MaterialesResponse(BaseModel):
+    materiales: List[MaterialResumen]
+    siguiente_cursor: Optional[str] = None
+
+
+class ValorFaceta(BaseModel):
+    valor: str  # tipo de material o id del autor, editorial o categoría
+    nombre: Optional[str] = None
+    total: int
+
+
+class FacetasResponse(BaseModel):
+    total: int
+    tipo: List[ValorFaceta]
+    autor: List[ValorFaceta]
+    editorial: List[ValorFaceta]
+    categoria: List[ValorFaceta]
+
+
+class DisponibilidadResponse(BaseModel):
+    id_material: UUID
+    tipo: str
+    total: int
+    disponibles: int
+    en_prestamo: int
+
+    class Config:
+        from_attributes = True
+
+
+class FusionRequest(BaseModel):
+    tipo: str  # "libro", "autor" o "editorial"
+    id_destino: UUID
+    ids_origen: List[UUID]
+    id_usuario_edicion: UUID
+
+
+class FusionResponse(BaseModel):
+    fusionados: int
+    reasignados: Dict[str, int]
+
+
+class ErrorLinea(BaseModel):
+    linea: int
+    error: str
+
+
+class ImportacionResponse(BaseModel):
+    id: str
+    estado: str
+    fase: Optional[str] = None
+    filas_leidas: int
+    filas_validas: int
+    filas_con_error: int
+    libros_creados: int
+    libros_existentes: int
+    autores_creados: int
+    editoriales_creadas: int
+    categorias_creadas: int
+    errores: List[ErrorLinea]
+    mensaje: Optional[str] = None
+    fecha_inicio: Optional[datetime] = None
+    fecha_fin: Optional[datetime] = None
+
+
+class ItemInventario(BaseModel):
+    id: Optional[UUID] = None  # None para los códigos inesperados
+    codigo_barras: Optional[str] = None
+    ubicacion: Optional[str] = None
+
+
+class ConciliacionResponse(BaseModel):
+    ubicacion: str
+    ruta: str  # ubicación normalizada con la que se comparan los items
+    escaneados: int
+    codigos_distintos: int
+    correctos: int
+    faltantes: int
+    no_disponibles: int
+    mal_ubicados: int
+    inesperados: int
+    corregidos: int
+    detalle_faltantes: List[ItemInventario]
+    detalle_mal_ubicados: List[ItemInventario]
+    detalle_inesperados: List[ItemInventario]
@@ -0,0 +1,157 @@
+"""
+Archivo en frío del historial de préstamos.
+
+Los préstamos cerrados se guardan en segmentos NDJSON comprimidos con gzip
+(un préstamo por línea, con su multa anidada). Junto a cada segmento se
+escribe un índice pequeño en JSON con el rango de fechas y los usuarios e
+items que contiene, de modo que una consulta solo descomprime los
+segmentos donde puede haber resultados.
+"""
+
+import bisect
+import gzip
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+ARCHIVO_DIR = os.getenv("ARCHIVO_DIR", "archivo")
+
+EXTENSION_SEGMENTO = ".ndjson.gz"
+EXTENSION_INDICE = ".idx.json"
+
+
+def _a_json(valor: Any) -> Any:
+    """Convertir los tipos de las columnas a valores serializables."""
+    if isinstance(valor, UUID):
+        return str(valor)
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def _escribir_atomico(ruta: str, contenido: bytes) -> None:
+    """Escribir un archivo completo y sincronizado, o no escribirlo."""
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(contenido)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta)
+
+
+def serializar_fila(entidad) -> Dict[str, Any]:
+    """Convertir una entidad del ORM en un diccionario de sus columnas."""
+    return {
+        atributo.key: _a_json(getattr(entidad, atributo.key))
+        for atributo in entidad.__mapper__.column_attrs
+    }
+
+
+def escribir_segmento(
+    registros: List[Dict[str, Any]], directorio: Optional[str] = None
+) -> str:
+    """
+    Escribir un segmento de préstamos archivados y su índice.
+
+    Args:
+        registros: Préstamos serializados; cada uno con su clave "multa"
+        directorio: Directorio de destino (por defecto ARCHIVO_DIR)
+
+    Returns:
+        Ruta del segmento escrito
+    """
+    if not registros:
+        raise ValueError("No hay registros para archivar")
+
+    directorio = directorio or ARCHIVO_DIR
+    os.makedirs(directorio, exist_ok=True)
+
+    marca = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    nombre = f"segmento_{marca}_{uuid.uuid4().hex[:8]}"
+    ruta_segmento = os.path.join(directorio, nombre + EXTENSION_SEGMENTO)
+    ruta_indice = os.path.join(directorio, nombre + EXTENSION_INDICE)
+
+    lineas = "".join(
+        json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros
+    )
+    _escribir_atomico(ruta_segmento, gzip.compress(lineas.encode("utf-8")))
+
+    fechas = [r["fecha_prestamo"] for r in registros if r.get("fecha_prestamo")]
+    indice = {
+        "segmento": nombre + EXTENSION_SEGMENTO,
+        "registros": len(registros),
+        "desde": min(fechas) if fechas else None,
+        "hasta": max(fechas) if fechas else None,
+        "usuarios": sorted({r["id_usuario"] for r in registros}),
+        "items": sorted({r["id_item"] for r in registros}),
+    }
+    _escribir_atomico(ruta_indice, json.dumps(indice).encode("utf-8"))
+    return ruta_segmento
+
+
+def _contiene(lista_ordenada: List[str], valor: str) -> bool:
+    """Búsqueda binaria en las listas ordenadas del índice."""
+    posicion = bisect.bisect_left(lista_ordenada, valor)
+    return posicion < len(lista_ordenada) and lista_ordenada[posicion] == valor
+
+
+def eliminar_segmento(ruta_segmento: str) -> None:
+    """Eliminar un segmento y su índice (si la transacción no se confirma)."""
+    ruta_indice = ruta_segmento[: -len(EXTENSION_SEGMENTO)] + EXTENSION_INDICE
+    for ruta in (ruta_indice, ruta_segmento):
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+
+def leer_historial(
+    id_usuario: Optional[UUID] = None,
+    id_item: Optional[UUID] = None,
+    directorio: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Recorrer los préstamos archivados de un usuario y/o un item.
+
+    Solo se descomprimen los segmentos cuyo índice contiene el usuario o el
+    item buscado. Los registros se devuelven de uno en uno, sin cargar el
+    segmento completo en memoria.
+    """
+    if not id_usuario and not id_item:
+        raise ValueError("Debe especificar id_usuario o id_item")
+
+    directorio = directorio or ARCHIVO_DIR
+    if not os.path.isdir(directorio):
+        return
+
+    usuario = str(id_usuario) if id_usuario else None
+    item = str(id_item) if id_item else None
+    # Un reintento del job tras un fallo puede haber archivado un préstamo dos veces
+    vistos = set()
+
+    for nombre in sorted(os.listdir(directorio)):
+        if not nombre.endswith(EXTENSION_INDICE):
+            continue
+        with open(os.path.join(directorio, nombre), encoding="utf-8") as archivo:
+            indice = json.load(archivo)
+        if usuario and not _contiene(indice["usuarios"], usuario):
+            continue
+        if item and not _contiene(indice["items"], item):
+            continue
+
+        ruta_segmento = os.path.join(directorio, indice["segmento"])
+        with gzip.open(ruta_segmento, "rt", encoding="utf-8") as segmento:
+            for linea in segmento:
+                registro = json.loads(linea)
+                if usuario and registro["id_usuario"] != usuario:
+                    continue
+                if item and registro["id_item"] != item:
+                    continue
+                if registro["id"] in vistos:
+                    continue
+                vistos.add(registro["id"])
+                yield registro
@@ -0,0 +1,336 @@
+"""
+Autocompletado por prefijo sobre un arreglo ordenado en memoria.
+
+Cada título o nombre se guarda normalizado (sin tildes, en minúsculas) una
+vez por cada palabra con la que empieza, de modo que "sole" sugiere "Cien
+años de soledad". Hay un arreglo ordenado por tipo; las sugerencias de un
+prefijo son un rango contiguo de cada arreglo que se localiza con búsqueda
+binaria. Si el rango es corto se recorre; si no, el prefijo tiene sus mejores
+sugerencias precalculadas, de modo que ninguna consulta recorre más de
+MAX_RANGO_RECORRIDO entradas por tipo.
+
+Los arreglos se carga al arrancar la aplicación y se mantiene con los cambios
+confirmados que notifica database.eventos.
+"""
+
+import bisect
+import heapq
+import threading
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from database.eventos import Cambio, al_confirmar
+from entities.autores import Autor
+from entities.categoria import Categoria
+from entities.editoriales import Editorial
+from entities.libros import Libro
+from entities.periodico import Periodico
+from entities.revista import Revista
+from sqlalchemy.orm import Session
+from utils.indice_trigramas import normalizar
+
+# tabla -> (tipo, modelo, columna con el texto sugerido)
+FUENTES = {
+    "libros": ("libro", Libro, "titulo"),
+    "revistas": ("revista", Revista, "titulo"),
+    "periodicos": ("periodico", Periodico, "titulo"),
+    "autores": ("autor", Autor, "nombre"),
+    "editoriales": ("editorial", Editorial, "nombre"),
+    "categorias": ("categoria", Categoria, "nombre"),
+}
+
+# Un prefijo con más entradas que esto en un tipo tiene sus mejores
+# sugerencias precalculadas (y mantenidas con cada alta o baja); los demás se
+# resuelven recorriendo su rango, que nunca pasa de este tamaño
+MAX_RANGO_RECORRIDO = 128
+
+# Máximo que devuelve sugerir
+MAX_SUGERENCIAS = 50
+
+# Sugerencias guardadas por prefijo: con margen sobre MAX_SUGERENCIAS para
+# que las bajas no obliguen a recalcular la lista cada vez
+MAX_GUARDADAS = 2 * MAX_SUGERENCIAS
+
+# (clave normalizada desde una palabra, posición de la palabra, id, texto)
+Entrada = Tuple[str, int, str, str]
+
+# (prefiere inicio del texto, longitud, texto) -> menor es mejor
+Puntuacion = Tuple[bool, int, str]
+
+# Mayor que cualquier carácter: (prefijo + _FIN,) acota el rango del prefijo
+_FIN = "\U0010ffff"
+
+
+def _entradas(id_documento: str, texto: str) -> List[Entrada]:
+    palabras = normalizar(texto).split()
+    return [
+        (" ".join(palabras[posicion:]), posicion, id_documento, texto)
+        for posicion in range(len(palabras))
+    ]
+
+
+def _puntuacion(entrada: Entrada) -> Puntuacion:
+    _, orden, _, texto = entrada
+    return (orden > 0, len(texto), texto)
+
+
+def _limites(entradas: List[Entrada], prefijo: str, inicio: int = 0) -> Tuple[int, int]:
+    """Posiciones [inicio, fin) de las entradas cuya clave empieza por `prefijo`."""
+    inicio = bisect.bisect_left(entradas, (prefijo,), inicio)
+    return inicio, bisect.bisect_left(entradas, (prefijo + _FIN,), inicio)
+
+
+def _por_documento(
+    entradas: List[Entrada], inicio: int, fin: int
+) -> Dict[str, Puntuacion]:
+    """Mejor puntuación de cada documento en entradas[inicio:fin]."""
+    por_documento: Dict[str, Puntuacion] = {}
+    for posicion in range(inicio, fin):
+        entrada = entradas[posicion]
+        puntuacion = _puntuacion(entrada)
+        anterior = por_documento.get(entrada[2])
+        if anterior is None or puntuacion < anterior:
+            por_documento[entrada[2]] = puntuacion
+    return por_documento
+
+
+def _mejores(
+    por_documento: Dict[str, Puntuacion], limite: int
+) -> List[Tuple[Puntuacion, str]]:
+    return heapq.nsmallest(
+        limite, ((p, id_documento) for id_documento, p in por_documento.items())
+    )
+
+
+class _Guardadas:
+    """Mejores sugerencias de un prefijo, ordenadas."""
+
+    __slots__ = ("lista", "completa")
+
+    def __init__(self, entradas: List[Entrada], inicio: int, fin: int):
+        por_documento = _por_documento(entradas, inicio, fin)
+        self.lista = _mejores(por_documento, MAX_GUARDADAS)
+        # Completa: contiene todos los documentos del prefijo. Si no, contiene
+        # exactamente los mejores y solo entra quien mejore al último
+        self.completa = len(self.lista) == len(por_documento)
+
+
+class Autocompletado:
+    """
+    Un arreglo ordenado de entradas por tipo, con altas y bajas incrementales.
+
+    Separar los tipos permite filtrar por tipo sin recorrer las entradas de
+    los demás; las sugerencias de varios tipos se mezclan por puntuación.
+
+    Todo prefijo con más de MAX_RANGO_RECORRIDO entradas en un tipo tiene
+    guardadas sus mejores sugerencias; como los rangos de los prefijos de una
+    misma longitud no se solapan, hay como mucho len/MAX_RANGO_RECORRIDO por
+    longitud. Así ninguna consulta recorre más de MAX_RANGO_RECORRIDO
+    entradas, sea cual sea el tamaño del arreglo.
+    """
+
+    def __init__(self):
+        self._entradas: Dict[str, List[Entrada]] = {}
+        self._por_documento: Dict[Tuple[str, str], List[Entrada]] = {}
+        # tipo -> prefijo con rango grande -> sus mejores sugerencias
+        self._guardadas: Dict[str, Dict[str, _Guardadas]] = {}
+        self._bloqueo = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(entradas) for entradas in self._entradas.values())
+
+    def cargar(self, documentos) -> None:
+        """Reemplazar el contenido con (tipo, id, texto) en un solo ordenamiento."""
+        entradas: Dict[str, List[Entrada]] = {}
+        por_documento = {}
+        for tipo, id_documento, texto in documentos:
+            if not texto:
+                continue
+            propias = _entradas(str(id_documento), texto)
+            por_documento[(tipo, str(id_documento))] = propias
+            entradas.setdefault(tipo, []).extend(propias)
+        guardadas = {}
+        for tipo, propias in entradas.items():
+            propias.sort()
+            guardadas[tipo] = self._calcular_guardadas(propias)
+        with self._bloqueo:
+            self._entradas = entradas
+            self._por_documento = por_documento
+            self._guardadas = guardadas
+
+    @staticmethod
+    def _calcular_guardadas(entradas: List[Entrada]) -> Dict[str, _Guardadas]:
+        # Por longitud creciente: solo los prefijos grandes de una longitud
+        # pueden tener extensiones grandes en la siguiente
+        guardadas = {}
+        pendientes = [(0, len(entradas))]
+        longitud = 1
+        while pendientes:
+            siguientes = []
+            for inicio, fin in pendientes:
+                posicion = inicio
+                while posicion < fin:
+                    clave = entradas[posicion][0]
+                    if len(clave) < longitud:
+                        posicion += 1
+                        continue
+                    prefijo = clave[:longitud]
+                    _, final = _limites(entradas, prefijo, posicion)
+                    if final - posicion > MAX_RANGO_RECORRIDO:
+                        guardadas[prefijo] = _Guardadas(entradas, posicion, final)
+                        siguientes.append((posicion, final))
+                    posicion = final
+            pendientes = siguientes
+            longitud += 1
+        return guardadas
+
+    def _quitar(self, tipo: str, id_documento: str) -> None:
+        propias = self._por_documento.pop((tipo, id_documento), ())
+        entradas = self._entradas.get(tipo, [])
+        for entrada in propias:
+            posicion = bisect.bisect_left(entradas, entrada)
+            if posicion < len(entradas) and entradas[posicion] == entrada:
+                del entradas[posicion]
+        guardadas = self._guardadas.get(tipo, {})
+        revisados = set()
+        for entrada in propias:
+            for longitud in range(1, len(entrada[0]) + 1):
+                prefijo = entrada[0][:longitud]
+                mejores = guardadas.get(prefijo)
+                if mejores is None:
+                    break  # las extensiones tampoco están guardadas
+                if prefijo in revisados:
+                    continue
+                revisados.add(prefijo)
+                inicio, fin = _limites(entradas, prefijo)
+                if fin - inicio <= MAX_RANGO_RECORRIDO:
+                    del guardadas[prefijo]
+                    continue
+                restantes = [m for m in mejores.lista if m[1] != id_documento]
+                if len(restantes) == len(mejores.lista):
+                    continue
+                mejores.lista = restantes
+                if not mejores.completa and len(restantes) < MAX_SUGERENCIAS:
+                    # Los siguientes mejores solo están en el arreglo
+                    guardadas[prefijo] = _Guardadas(entradas, inicio, fin)
+
+    def _poner(self, tipo: str, id_documento: str, texto: str) -> None:
+        propias = _entradas(id_documento, texto)
+        entradas = self._entradas.setdefault(tipo, [])
+        for entrada in propias:
+            bisect.insort(entradas, entrada)
+        self._por_documento[(tipo, id_documento)] = propias
+        guardadas = self._guardadas.setdefault(tipo, {})
+
+        # Mejor puntuación del documento en cada prefijo guardado de sus claves
+        candidatas: Dict[str, Puntuacion] = {}
+        for entrada in propias:
+            puntuacion = _puntuacion(entrada)
+            for longitud in range(1, len(entrada[0]) + 1):
+                prefijo = entrada[0][:longitud]
+                if prefijo not in guardadas:
+                    inicio, fin = _limites(entradas, prefijo)
+                    if fin - inicio <= MAX_RANGO_RECORRIDO:
+                        break  # las extensiones tampoco superan el límite
+                    # Acaba de superar el límite: ya incluye este documento
+                    guardadas[prefijo] = _Guardadas(entradas, inicio, fin)
+                    candidatas.pop(prefijo, None)
+                    continue
+                if prefijo not in candidatas or puntuacion < candidatas[prefijo]:
+                    candidatas[prefijo] = puntuacion
+
+        for prefijo, puntuacion in candidatas.items():
+            mejores = guardadas[prefijo]
+            if any(m[1] == id_documento for m in mejores.lista):
+                continue  # recién calculada con este documento
+            candidata = (puntuacion, id_documento)
+            if mejores.completa or (mejores.lista and candidata < mejores.lista[-1]):
+                bisect.insort(mejores.lista, candidata)
+                if len(mejores.lista) > MAX_GUARDADAS:
+                    del mejores.lista[MAX_GUARDADAS:]
+                    mejores.completa = False
+
+    def agregar(self, tipo: str, id_documento, texto: Optional[str]) -> None:
+        """Insertar (o reemplazar) las entradas de un documento."""
+        with self._bloqueo:
+            self._quitar(tipo, str(id_documento))
+            if texto:
+                self._poner(tipo, str(id_documento), texto)
+
+    def eliminar(self, tipo: str, id_documento) -> None:
+        with self._bloqueo:
+            self._quitar(tipo, str(id_documento))
+
+    def sugerir(
+        self, prefijo: str, limite: int = 10, tipos: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        """
+        Devolver hasta `limite` (como mucho MAX_SUGERENCIAS) sugerencias para
+        un prefijo.
+
+        Se prefieren los textos que empiezan por el prefijo frente a los que
+        lo tienen en una palabra intermedia, y los más cortos.
+        """
+        clave = normalizar(prefijo)
+        if not clave:
+            return []
+        # Un espacio final ("cien ") sigue exigiendo la palabra completa
+        if prefijo[-1:].isspace():
+            clave += " "
+        limite = min(limite, MAX_SUGERENCIAS)
+
+        with self._bloqueo:
+            por_tipo = []
+            for tipo in tipos or list(self._entradas):
+                entradas = self._entradas.get(tipo, [])
+                guardadas = self._guardadas.get(tipo, {}).get(clave)
+                if guardadas is not None:
+                    mejores = guardadas.lista[:limite]
+                else:
+                    inicio, fin = _limites(entradas, clave)
+                    mejores = _mejores(_por_documento(entradas, inicio, fin), limite)
+                por_tipo.append(
+                    [(p, tipo, id_documento) for p, id_documento in mejores]
+                )
+
+        return [
+            {"tipo": tipo, "id": id_documento, "texto": puntuacion[2]}
+            for puntuacion, tipo, id_documento in islice(heapq.merge(*por_tipo), limite)
+        ]
+
+
+autocompletado = Autocompletado()
+
+
+def cargar_autocompletado(db: Session, tamano_lote: int = 1000) -> int:
+    """
+    Construir el arreglo desde la base de datos leyendo solo id y texto.
+
+    Se suscribe a los cambios confirmados antes de leer, para no perder los
+    que lleguen durante la carga.
+
+    Returns:
+        Número de entradas cargadas
+    """
+    al_confirmar(_aplicar_cambios)
+
+    def documentos():
+        for tipo, modelo, columna in FUENTES.values():
+            filas = db.query(modelo.id, getattr(modelo, columna)).yield_per(tamano_lote)
+            for id_documento, texto in filas:
+                yield tipo, id_documento, texto
+
+    autocompletado.cargar(documentos())
+    return len(autocompletado)
+
+
+def _aplicar_cambios(cambios: List[Cambio]) -> None:
+    for cambio in cambios:
+        fuente = FUENTES.get(cambio.tabla)
+        if not fuente:
+            continue
+        tipo, _, columna = fuente
+        if cambio.operacion == "eliminar":
+            autocompletado.eliminar(tipo, cambio.id)
+        elif columna in cambio.datos:
+            autocompletado.agregar(tipo, cambio.id, cambio.datos[columna])
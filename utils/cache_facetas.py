@@ -0,0 +1,83 @@
+"""
+Caché en memoria de los conteos de facetas del catálogo.
+
+Cada resultado se guarda bajo la firma de sus filtros. Cualquier escritura
+confirmada sobre materiales, autores, editoriales o categorías vacía la
+caché (ver database.eventos). Como las notificaciones son locales a cada
+proceso, las entradas caducan además tras `ttl` segundos para recoger las
+escrituras hechas por otros workers.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+from database.eventos import Cambio, al_confirmar
+
+TABLAS_CATALOGO = {
+    "libros",
+    "revistas",
+    "periodicos",
+    "autores",
+    "editoriales",
+    "categorias",
+}
+
+
+class CacheFacetas:
+    """Caché LRU con caducidad, invalidada por generación."""
+
+    def __init__(self, maximo: int = 256, ttl: float = 300.0):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._generacion = 0
+        self._bloqueo = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obtener(self, firma: Hashable, calcular: Callable[[], Any]) -> Any:
+        """
+        Devolver el valor guardado para la firma o calcularlo y guardarlo.
+
+        Si se invalida la caché mientras se calcula, el resultado se
+        devuelve pero no se guarda, porque puede no incluir esa escritura.
+        """
+        ahora = time.monotonic()
+        with self._bloqueo:
+            guardado = self._entradas.get(firma)
+            if guardado and guardado[0] > ahora:
+                self._entradas.move_to_end(firma)
+                return guardado[1]
+            generacion = self._generacion
+
+        valor = calcular()
+
+        with self._bloqueo:
+            if generacion == self._generacion:
+                self._entradas[firma] = (time.monotonic() + self.ttl, valor)
+                self._entradas.move_to_end(firma)
+                while len(self._entradas) > self.maximo:
+                    self._entradas.popitem(last=False)
+        return valor
+
+    def invalidar(self) -> None:
+        with self._bloqueo:
+            self._generacion += 1
+            self._entradas.clear()
+
+
+cache_facetas = CacheFacetas()
+
+
+def firma_filtros(filtros: Dict[str, Any]) -> Tuple:
+    """Clave de caché estable para un conjunto de filtros."""
+    return tuple(sorted((k, str(v)) for k, v in filtros.items() if v is not None))
+
+
+@al_confirmar
+def _invalidar_por_cambios(cambios: List[Cambio]) -> None:
+    if any(cambio.tabla in TABLAS_CATALOGO for cambio in cambios):
+        cache_facetas.invalidar()
@@ -0,0 +1,41 @@
+"""
+Códigos de barras de items generados por el servidor.
+
+Formato EAN-13 de circulación restringida: el prefijo "20" (reservado por
+GS1 para uso interno), el número de la secuencia items_codigo_barras_seq
+con 10 dígitos y el dígito de control EAN-13. Cualquier lector de códigos
+de barras comercial los lee sin configuración.
+"""
+
+from typing import Optional
+
+PREFIJO = "20"
+DIGITOS_NUMERO = 10
+MAX_NUMERO = 10**DIGITOS_NUMERO - 1
+SECUENCIA = "items_codigo_barras_seq"
+
+
+def digito_control_ean13(digitos: str) -> str:
+    """Dígito de control de los 12 primeros dígitos de un EAN-13."""
+    suma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digitos[:12]))
+    return str((10 - suma % 10) % 10)
+
+
+def formatear_codigo(numero: int) -> str:
+    """Código de barras del número `numero` de la secuencia."""
+    if not 1 <= numero <= MAX_NUMERO:
+        raise ValueError(f"El número de código debe estar entre 1 y {MAX_NUMERO}")
+    base = f"{PREFIJO}{numero:0{DIGITOS_NUMERO}d}"
+    return base + digito_control_ean13(base)
+
+
+def numero_de_codigo(codigo: str) -> Optional[int]:
+    """Número de secuencia de un código con el formato generado, o None."""
+    if (
+        len(codigo) != 13
+        or not codigo.isdigit()
+        or not codigo.startswith(PREFIJO)
+        or digito_control_ean13(codigo) != codigo[12]
+    ):
+        return None
+    return int(codigo[len(PREFIJO) : 12]) or None
@@ -0,0 +1,54 @@
+"""
+Utilidades para construir consultas.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+
+
+def igual_a_alguno(columna, valores: Iterable, nombre: str = "valores"):
+    """
+    Condición `columna = ANY(:valores)` con todos los valores en un solo
+    parámetro de tipo arreglo.
+
+    A diferencia de IN (...), que genera un parámetro por valor, la
+    sentencia es la misma para cualquier número de valores, de modo que
+    PostgreSQL puede reutilizar el plan en lotes de tamaños distintos.
+    """
+    return columna == any_(bindparam(nombre, list(valores), type_=ARRAY(columna.type)))
+
+
+def obtener_por_ids(db: Session, modelo, ids: Iterable, *opciones) -> Dict[Any, Any]:
+    """
+    Filas de `modelo` con esos ids en una sola consulta (`id = ANY(:ids)`).
+
+    Returns:
+        id -> fila, solo con los ids que existen
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+    filas = db.scalars(
+        select(modelo).options(*opciones).where(igual_a_alguno(modelo.id, ids, "ids"))
+    ).all()
+    return {fila.id: fila for fila in filas}
+
+
+def resultados_en_orden(
+    ids: Iterable,
+    encontrados: Dict[Any, Any],
+    serializar: Optional[Callable[[Any], Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Un resultado por id pedido, en el mismo orden, marcando los que faltan."""
+    resultados = []
+    for id_pedido in ids:
+        fila = encontrados.get(id_pedido)
+        if fila is not None and serializar:
+            fila = serializar(fila)
+        resultados.append(
+            {"id": id_pedido, "encontrado": fila is not None, "dato": fila}
+        )
+    return resultados
@@ -0,0 +1,150 @@
+"""
+Filtros de Bloom en memoria para comprobar la unicidad sin consultar.
+
+Guardan los códigos de barras de items y los ISBN-13 de libros existentes.
+Un filtro de Bloom no tiene falsos negativos: si dice que un valor no está,
+no está, y la comprobación de unicidad en la base de datos puede omitirse.
+Si dice que puede estar (un ~1 % de falsos positivos, o un valor ya
+eliminado, que no se puede quitar del filtro) se consulta como siempre.
+
+Los filtros se cargan al arrancar la aplicación recorriendo las columnas
+en streaming y después reciben los valores de los cambios confirmados que
+notifica database.eventos. Los valores insertados por otros procesos no
+llegan a este filtro; para esos casos la restricción UNIQUE de la base de
+datos sigue siendo la última garantía. Mientras un filtro no está cargado
+todo valor "puede estar".
+"""
+
+import hashlib
+import math
+import threading
+from typing import List, Optional
+
+from database.eventos import Cambio, al_confirmar
+from entities.items import Item
+from entities.libros import Libro
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+CAPACIDAD_MINIMA = 100_000
+TASA_FALSOS_POSITIVOS = 0.01
+
+
+class FiltroBloom:
+    """Conjunto probabilístico de cadenas con altas, sin bajas."""
+
+    def __init__(self, capacidad: int, tasa_falsos_positivos: float):
+        capacidad = max(capacidad, 1)
+        self.num_bits = max(
+            8,
+            int(-capacidad * math.log(tasa_falsos_positivos) / math.log(2) ** 2),
+        )
+        self.num_hashes = max(1, round(self.num_bits / capacidad * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._elementos = 0
+        self._bloqueo = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._elementos
+
+    def _posiciones(self, valor: str) -> List[int]:
+        # Doble hashing: k posiciones a partir de dos hashes de 64 bits
+        resumen = hashlib.blake2b(valor.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(resumen[:8], "little")
+        h2 = int.from_bytes(resumen[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def agregar(self, valor: str) -> None:
+        posiciones = self._posiciones(valor)
+        with self._bloqueo:
+            for posicion in posiciones:
+                self._bits[posicion >> 3] |= 1 << (posicion & 7)
+            self._elementos += 1
+
+    def puede_contener(self, valor: str) -> bool:
+        return all(
+            self._bits[posicion >> 3] & (1 << (posicion & 7))
+            for posicion in self._posiciones(valor)
+        )
+
+
+class FiltroColumna:
+    """Filtro de Bloom de los valores de una columna, recargable."""
+
+    def __init__(self, columna):
+        self.columna = columna
+        self._filtro: Optional[FiltroBloom] = None
+        # Filtro en construcción: también recibe las altas confirmadas durante
+        # la carga, que la lectura en streaming puede no ver
+        self._en_carga: Optional[FiltroBloom] = None
+
+    def __len__(self) -> int:
+        return len(self._filtro) if self._filtro else 0
+
+    def cargar(self, db: Session, tamano_lote: int = 10000) -> int:
+        """Construir el filtro con todos los valores no nulos de la columna."""
+        condicion = self.columna.isnot(None)
+        existentes = db.scalar(select(func.count()).where(condicion))
+        # El doble de capacidad deja margen para las altas sin degradar la tasa
+        filtro = FiltroBloom(
+            max(2 * existentes, CAPACIDAD_MINIMA), TASA_FALSOS_POSITIVOS
+        )
+        self._en_carga = filtro
+        try:
+            filas = db.execute(
+                select(self.columna)
+                .where(condicion)
+                .execution_options(yield_per=tamano_lote)
+            )
+            for (valor,) in filas:
+                filtro.agregar(valor)
+            self._filtro = filtro
+        finally:
+            self._en_carga = None
+        return len(filtro)
+
+    def agregar(self, valor: Optional[str]) -> None:
+        if not valor:
+            return
+        for filtro in (self._filtro, self._en_carga):
+            if filtro is not None:
+                filtro.agregar(valor)
+
+    def puede_contener(self, valor: str) -> bool:
+        """False solo si el valor seguro que no está en la columna."""
+        if self._filtro is None:
+            return True
+        return self._filtro.puede_contener(valor)
+
+
+filtro_codigos_barras = FiltroColumna(Item.codigo_barras)
+filtro_isbn13 = FiltroColumna(Libro.isbn13)
+
+# tabla -> (columna notificada en Cambio.datos, filtro)
+FILTROS = {
+    "items": ("codigo_barras", filtro_codigos_barras),
+    "libros": ("isbn13", filtro_isbn13),
+}
+
+
+def cargar_filtros(db: Session) -> int:
+    """
+    Cargar los filtros desde la base de datos.
+
+    La suscripción a los cambios se registra antes de leer; como los
+    valores solo se añaden, repetir uno que ya llegó en la carga no afecta.
+
+    Returns:
+        Número total de valores cargados
+    """
+    al_confirmar(_aplicar_cambios)
+    return sum(filtro.cargar(db) for _, filtro in FILTROS.values())
+
+
+def _aplicar_cambios(cambios: List[Cambio]) -> None:
+    for cambio in cambios:
+        fuente = FILTROS.get(cambio.tabla)
+        if not fuente or cambio.operacion == "eliminar":
+            continue
+        columna, filtro = fuente
+        filtro.agregar(cambio.datos.get(columna))
@@ -0,0 +1,204 @@
+"""
+Índice invertido de trigramas en memoria para búsquedas tolerantes a erratas.
+
+Indexa los títulos de libros, revistas y periódicos y los nombres de los
+autores. La similitud entre la consulta y cada texto es la de pg_trgm
+(trigramas compartidos / trigramas totales), de modo que "garcia marques"
+encuentra "Gabriel García Márquez" sin consultar la base de datos.
+
+El índice se carga al arrancar la aplicación con una sola pasada sobre las
+tablas y después se mantiene con los cambios confirmados que notifica
+database.eventos.
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from database.eventos import Cambio, al_confirmar
+from entities.autores import Autor
+from entities.libros import Libro
+from entities.periodico import Periodico
+from entities.revista import Revista
+from sqlalchemy.orm import Session
+
+# tabla -> (tipo, columna con el texto indexado)
+FUENTES = {
+    "libros": ("libro", "titulo"),
+    "revistas": ("revista", "titulo"),
+    "periodicos": ("periodico", "titulo"),
+    "autores": ("autor", "nombre"),
+}
+MODELOS = {
+    "libros": Libro,
+    "revistas": Revista,
+    "periodicos": Periodico,
+    "autores": Autor,
+}
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sin tildes y con cualquier separador como un espacio."""
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    sin_tildes = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", sin_tildes).strip()
+
+
+def trigramas(texto: str) -> FrozenSet[str]:
+    """Trigramas de cada palabra, con el mismo relleno que pg_trgm."""
+    resultado = set()
+    for palabra in normalizar(texto).split():
+        relleno = f"  {palabra} "
+        for i in range(len(relleno) - 2):
+            resultado.add(relleno[i : i + 3])
+    return frozenset(resultado)
+
+
+class IndiceTrigramas:
+    """
+    Índice invertido trigrama -> documentos, seguro entre hilos.
+
+    Cada documento recibe un entero interno; las listas del índice guardan
+    esos enteros, más baratos de combinar que las claves (tipo, id).
+    """
+
+    def __init__(self):
+        self._claves: Dict[Tuple[str, str], int] = {}
+        self._documentos: Dict[int, Tuple[str, str, str, FrozenSet[str]]] = {}
+        self._invertido: Dict[str, Set[int]] = defaultdict(set)
+        self._siguiente = 0
+        self._bloqueo = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documentos)
+
+    def _quitar(self, clave: Tuple[str, str]) -> None:
+        numero = self._claves.pop(clave, None)
+        if numero is None:
+            return
+        for trigrama in self._documentos.pop(numero)[3]:
+            documentos = self._invertido.get(trigrama)
+            if documentos is not None:
+                documentos.discard(numero)
+                if not documentos:
+                    del self._invertido[trigrama]
+
+    def agregar(self, tipo: str, id_documento, texto: Optional[str]) -> None:
+        """Indexar (o reindexar) un documento."""
+        clave = (tipo, str(id_documento))
+        grupo = trigramas(texto) if texto else frozenset()
+        with self._bloqueo:
+            self._quitar(clave)
+            if not grupo:
+                return
+            numero = self._siguiente
+            self._siguiente += 1
+            self._claves[clave] = numero
+            self._documentos[numero] = (clave[0], clave[1], texto, grupo)
+            for trigrama in grupo:
+                self._invertido[trigrama].add(numero)
+
+    def eliminar(self, tipo: str, id_documento) -> None:
+        """Quitar un documento del índice."""
+        with self._bloqueo:
+            self._quitar((tipo, str(id_documento)))
+
+    def vaciar(self) -> None:
+        with self._bloqueo:
+            self._claves.clear()
+            self._documentos.clear()
+            self._invertido.clear()
+
+    def buscar(
+        self,
+        consulta: str,
+        k: int = 10,
+        tipos: Optional[Sequence[str]] = None,
+        umbral: float = 0.3,
+    ) -> List[dict]:
+        """
+        Devolver los k documentos más parecidos a la consulta.
+
+        Args:
+            consulta: Texto buscado
+            k: Número máximo de resultados
+            tipos: Restringir a estos tipos ("libro", "revista"...)
+            umbral: Similitud mínima (0-1), como pg_trgm.similarity_threshold
+
+        Returns:
+            Lista de {tipo, id, texto, similitud}, de mayor a menor similitud
+        """
+        grupo_consulta = trigramas(consulta)
+        n = len(grupo_consulta)
+        if not n:
+            return []
+
+        # Filtro por prefijo: con similitud >= umbral un documento comparte
+        # al menos ceil(umbral * n) trigramas con la consulta, así que
+        # aparece en alguna de las n - minimo + 1 listas más cortas. Las
+        # listas de los trigramas más comunes no se recorren.
+        minimo = max(1, math.ceil(umbral * n))
+        with self._bloqueo:
+            listas = sorted(
+                (self._invertido.get(trigrama, ()) for trigrama in grupo_consulta),
+                key=len,
+            )
+            candidatos = set().union(*listas[: n - minimo + 1])
+
+            puntuados = []
+            for numero in candidatos:
+                tipo, id_documento, texto, grupo = self._documentos[numero]
+                if tipos and tipo not in tipos:
+                    continue
+                comunes = len(grupo_consulta & grupo)
+                similitud = comunes / (n + len(grupo) - comunes)
+                if similitud >= umbral:
+                    puntuados.append((similitud, tipo, id_documento, texto))
+
+        mejores = heapq.nlargest(k, puntuados, key=lambda p: p[0])
+        return [
+            {"tipo": tipo, "id": id_documento, "texto": texto, "similitud": similitud}
+            for similitud, tipo, id_documento, texto in mejores
+        ]
+
+
+indice = IndiceTrigramas()
+
+
+def cargar_indice(db: Session, tamano_lote: int = 1000) -> int:
+    """
+    Construir el índice desde la base de datos en una sola pasada.
+
+    Solo se leen el id y el texto de cada fila, por lotes, sin cargar las
+    entidades completas. El índice se suscribe a los cambios confirmados
+    antes de leer, para no perder los que lleguen durante la carga.
+
+    Returns:
+        Número de documentos indexados
+    """
+    al_confirmar(_aplicar_cambios)
+    indice.vaciar()
+    for tabla, (tipo, columna) in FUENTES.items():
+        modelo = MODELOS[tabla]
+        filas = db.query(modelo.id, getattr(modelo, columna)).yield_per(tamano_lote)
+        for id_documento, texto in filas:
+            indice.agregar(tipo, id_documento, texto)
+    return len(indice)
+
+
+def _aplicar_cambios(cambios: List[Cambio]) -> None:
+    for cambio in cambios:
+        fuente = FUENTES.get(cambio.tabla)
+        if not fuente:
+            continue
+        tipo, columna = fuente
+        if cambio.operacion == "eliminar":
+            indice.eliminar(tipo, cambio.id)
+        elif columna in cambio.datos:
+            indice.agregar(tipo, cambio.id, cambio.datos[columna])
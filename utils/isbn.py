@@ -0,0 +1,57 @@
+"""
+Normalización de ISBN.
+
+Un mismo libro puede escribirse como ISBN-10 o ISBN-13, con o sin guiones
+y espacios. La forma canónica es el ISBN-13 solo con dígitos, que es la
+clave de búsqueda y de unicidad de la columna libros.isbn13.
+"""
+
+import re
+
+_SEPARADORES = re.compile(r"[\s\-]+")
+
+
+def _digito_control_isbn10(digitos: str) -> str:
+    suma = sum((10 - i) * int(d) for i, d in enumerate(digitos[:9]))
+    resto = (11 - suma % 11) % 11
+    return "X" if resto == 10 else str(resto)
+
+
+def _digito_control_isbn13(digitos: str) -> str:
+    suma = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digitos[:12]))
+    return str((10 - suma % 10) % 10)
+
+
+def a_isbn13(isbn: str) -> str:
+    """
+    Convertir cualquier forma de ISBN-10 o ISBN-13 al ISBN-13 canónico.
+
+    Raises:
+        ValueError: Si el ISBN no tiene un formato o dígito de control válido
+    """
+    limpio = _SEPARADORES.sub("", isbn or "").upper()
+    if limpio.startswith("ISBN"):
+        limpio = limpio[4:].lstrip(":")
+
+    if len(limpio) == 10 and limpio[:9].isdigit() and limpio[9] in "0123456789X":
+        if _digito_control_isbn10(limpio) != limpio[9]:
+            raise ValueError("El dígito de control del ISBN no es válido")
+        base = "978" + limpio[:9]
+        return base + _digito_control_isbn13(base)
+
+    if len(limpio) == 13 and limpio.isdigit():
+        if limpio[:3] not in ("978", "979"):
+            raise ValueError("El ISBN-13 debe empezar por 978 o 979")
+        if _digito_control_isbn13(limpio) != limpio[12]:
+            raise ValueError("El dígito de control del ISBN no es válido")
+        return limpio
+
+    raise ValueError("El ISBN debe tener 10 o 13 dígitos")
+
+
+def isbn13_o_none(isbn: str):
+    """Como a_isbn13, pero devuelve None si el ISBN no es válido."""
+    try:
+        return a_isbn13(isbn)
+    except ValueError:
+        return None
@@ -0,0 +1,142 @@
+"""
+Detección de registros casi duplicados con MinHash y LSH.
+
+Cada texto se reduce a su conjunto de trigramas (los mismos que usa el
+índice de búsqueda aproximada) y a una firma MinHash de NUM_PERMUTACIONES
+valores. La firma se corta en BANDAS bandas; dos textos son candidatos si
+coinciden en alguna banda completa, lo que evita comparar todos los pares.
+Los candidatos se confirman con la similitud de Jaccard exacta y se unen en
+grupos (si A~B y B~C, A, B y C forman un grupo).
+
+Con 16 bandas de 6 filas, un par con similitud 0.8 resulta candidato con
+probabilidad ~0.99, uno con 0.7 con ~0.87 y uno con 0.3 con ~0.01.
+"""
+
+import hashlib
+import logging
+import struct
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Set, Tuple
+
+from utils.indice_trigramas import normalizar, trigramas
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTACIONES = 96
+BANDAS = 16
+FILAS_POR_BANDA = NUM_PERMUTACIONES // BANDAS
+
+# Cubetas con más textos distintos que esto son títulos genéricos ("Informe
+# anual") que generarían millones de pares; se descartan
+MAX_CUBETA = 500
+
+_FORMATO = struct.Struct(f"<{NUM_PERMUTACIONES}I")
+
+
+@lru_cache(maxsize=200_000)
+def _hashes(trigrama: str) -> Tuple[int, ...]:
+    """NUM_PERMUTACIONES hashes independientes de 32 bits de un trigrama."""
+    return _FORMATO.unpack(hashlib.shake_128(trigrama.encode()).digest(_FORMATO.size))
+
+
+def firma_minhash(conjunto: Iterable[str]) -> Tuple[int, ...]:
+    """Mínimo de cada función hash sobre los elementos del conjunto."""
+    return tuple(map(min, zip(*map(_hashes, conjunto))))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Grupos:
+    """Unión-búsqueda para agrupar pares similares."""
+
+    def __init__(self):
+        self._padre: Dict[Hashable, Hashable] = {}
+
+    def raiz(self, x: Hashable) -> Hashable:
+        raiz = x
+        while self._padre.setdefault(raiz, raiz) != raiz:
+            raiz = self._padre[raiz]
+        # Compresión de caminos
+        while x != raiz:
+            self._padre[x], x = raiz, self._padre[x]
+        return raiz
+
+    def unir(self, a: Hashable, b: Hashable) -> None:
+        ra, rb = self.raiz(a), self.raiz(b)
+        if ra != rb:
+            self._padre[rb] = ra
+
+    def grupos(self) -> List[List[Hashable]]:
+        por_raiz = defaultdict(list)
+        for x in self._padre:
+            por_raiz[self.raiz(x)].append(x)
+        return [miembros for miembros in por_raiz.values() if len(miembros) > 1]
+
+
+def agrupar_duplicados(
+    registros: Iterable[Tuple[Hashable, str]], umbral: float = 0.7
+) -> List[List[Hashable]]:
+    """
+    Agrupar los registros (id, texto) cuyos textos son casi iguales.
+
+    Los textos idénticos tras normalizar se agrupan directamente y solo sus
+    formas distintas pasan por MinHash.
+
+    Args:
+        registros: Pares (id, texto)
+        umbral: Similitud de Jaccard mínima entre trigramas para unir dos textos
+
+    Returns:
+        Grupos de ids con al menos dos miembros
+    """
+    grupos = _Grupos()
+
+    # 1. Textos idénticos tras normalizar: un representante por forma
+    ids_por_texto: Dict[str, List[Hashable]] = defaultdict(list)
+    for id_registro, texto in registros:
+        clave = normalizar(texto or "")
+        if clave:
+            ids_por_texto[clave].append(id_registro)
+    for ids in ids_por_texto.values():
+        for otro in ids[1:]:
+            grupos.unir(ids[0], otro)
+
+    # 2. LSH sobre las formas distintas
+    textos = list(ids_por_texto)
+    conjuntos = [trigramas(texto) for texto in textos]
+    cubetas: Dict[Tuple, List[int]] = defaultdict(list)
+    for posicion, conjunto in enumerate(conjuntos):
+        if not conjunto:
+            continue
+        firma = firma_minhash(conjunto)
+        for banda in range(BANDAS):
+            inicio = banda * FILAS_POR_BANDA
+            cubetas[(banda, firma[inicio : inicio + FILAS_POR_BANDA])].append(posicion)
+
+    # 3. Confirmar los pares candidatos con la similitud exacta
+    comparados: Set[Tuple[int, int]] = set()
+    descartadas = 0
+    for miembros in cubetas.values():
+        if len(miembros) < 2:
+            continue
+        if len(miembros) > MAX_CUBETA:
+            descartadas += 1
+            continue
+        for i, a in enumerate(miembros):
+            for b in miembros[i + 1 :]:
+                if (a, b) in comparados:
+                    continue
+                comparados.add((a, b))
+                if jaccard(conjuntos[a], conjuntos[b]) >= umbral:
+                    grupos.unir(
+                        ids_por_texto[textos[a]][0], ids_por_texto[textos[b]][0]
+                    )
+    if descartadas:
+        logger.warning(f"{descartadas} cubetas LSH demasiado grandes descartadas")
+
+    return grupos.grupos()
@@ -0,0 +1,28 @@
+"""
+Cursores opacos para la paginación por clave (keyset).
+
+El cursor guarda los valores de ordenación de la última fila devuelta; la
+página siguiente se pide con "(columnas de orden) < (valores del cursor)",
+que usa el índice en lugar de recorrer y descartar OFFSET filas.
+"""
+
+import base64
+import json
+from typing import Any, Dict
+
+
+def codificar_cursor(valores: Dict[str, Any]) -> str:
+    """Codificar los valores de la última fila en un cursor opaco."""
+    contenido = json.dumps(valores, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(contenido.encode("utf-8")).decode("ascii")
+
+
+def decodificar_cursor(cursor: str) -> Dict[str, Any]:
+    """Recuperar los valores de un cursor; ValueError si no es válido."""
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Cursor de paginación inválido")
+    if not isinstance(valores, dict):
+        raise ValueError("Cursor de paginación inválido")
+    return valores
@@ -0,0 +1,79 @@
+"""
+Rutas jerárquicas de ubicación de items.
+
+`Item.ubicacion` es texto libre ("Edificio Central, Piso 2, Sección B",
+"Piso 2 / Estante 4", "P2 - Sala B"). `Item.ubicacion_ruta` guarda el mismo
+dato como una ruta normalizada de segmentos separados por "/" y terminada
+en "/": "edificio-central/piso-2/seccion-b/". Todo lo que hay bajo un nodo
+comparte el prefijo de su ruta, así que "todo el piso 2" es un rango del
+índice sobre la columna (LIKE 'edificio-central/piso-2/%').
+
+Los segmentos solo contienen [a-z0-9-], sin los comodines de LIKE, y la
+barra final evita que "piso-2/" encuentre "piso-20/".
+"""
+
+import re
+import unicodedata
+from typing import List, Optional
+
+MAX_LONGITUD_RUTA = 255
+
+# Separadores explícitos entre niveles; el guion solo con espacios alrededor
+# ("P2 - Sala B"), porque "A-3" es un único segmento
+_SEPARADORES = re.compile(r"\s*(?:[/>|\\,;]|\s-\s)\s*")
+_NO_PERMITIDO = re.compile(r"[^a-z0-9]+")
+
+# Palabras que abren un nivel cuando el texto no trae separadores
+# ("Piso 2 Sección B Estante 4")
+NIVELES = (
+    "edificio",
+    "sede",
+    "planta",
+    "piso",
+    "seccion",
+    "sala",
+    "pasillo",
+    "estanteria",
+    "estante",
+    "balda",
+    "nivel",
+)
+_INICIO_NIVEL = re.compile(rf"\s(?=(?:{'|'.join(NIVELES)})\b)")
+
+
+def _sin_tildes(texto: str) -> str:
+    descompuesto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def segmentos_de_ubicacion(texto: Optional[str]) -> List[str]:
+    """Segmentos normalizados de una ubicación en texto libre o ya en ruta."""
+    limpio = _sin_tildes(texto or "").strip()
+    partes = [p for p in _SEPARADORES.split(limpio) if p.strip()]
+    if len(partes) == 1:
+        partes = _INICIO_NIVEL.split(partes[0])
+    segmentos = []
+    for parte in partes:
+        segmento = _NO_PERMITIDO.sub("-", parte).strip("-")
+        if segmento:
+            segmentos.append(segmento)
+    return segmentos
+
+
+def ruta_de_ubicacion(texto: Optional[str]) -> Optional[str]:
+    """
+    Ruta normalizada de una ubicación, o None si no tiene contenido.
+
+    Es idempotente: aplicada a una ruta devuelve la misma ruta, de modo que
+    los prefijos de consulta pueden escribirse como texto libre ("piso 2")
+    o como ruta ("edificio-central/piso-2").
+    """
+    segmentos = segmentos_de_ubicacion(texto)
+    if not segmentos:
+        return None
+    ruta = "/".join(segmentos) + "/"
+    if len(ruta) > MAX_LONGITUD_RUTA:
+        raise ValueError(
+            f"La ruta de ubicación no puede exceder {MAX_LONGITUD_RUTA} caracteres"
+        )
+    return ruta